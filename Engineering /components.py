@@ -0,0 +1,140 @@
+# Engineering/components.py
+
+class Components:
+    """
+    Étiquetage en composantes connexes d'un masque nx*ny (label_mask).
+    - labels[y*nx+x] : numéro de composante (1..count), 0 hors masque
+    - sizes[label]   : nombre de tuiles (sizes[0] = 0)
+    - bboxes[label]  : (x0, y0, x1, y1) inclusifs (bboxes[0] = None)
+    """
+    def __init__(self, nx, ny, labels, sizes, bboxes):
+        self.nx = nx
+        self.ny = ny
+        self.labels = labels
+        self.sizes = sizes
+        self.bboxes = bboxes
+
+    @property
+    def count(self):
+        return len(self.sizes) - 1
+
+    def label_at(self, x, y):
+        """Composante de la tuile (x, y), 0 si hors masque ou hors carte."""
+        if 0 <= x < self.nx and 0 <= y < self.ny:
+            return self.labels[y*self.nx + x]
+        return 0
+
+    def same(self, a, b):
+        """True si les tuiles a et b sont dans une même composante."""
+        la = self.label_at(a[0], a[1])
+        return la != 0 and la == self.label_at(b[0], b[1])
+
+    def tiles(self, label):
+        """Tuiles (x, y) de la composante 'label' (parcours de sa bbox)."""
+        if label <= 0 or label >= len(self.sizes):
+            return []
+        (x0, y0, x1, y1) = self.bboxes[label]
+        nx = self.nx
+        labels = self.labels
+        return [(x, y) for y in range(y0, y1+1) for x in range(x0, x1+1)
+                if labels[y*nx + x] == label]
+
+def _find(parent, a):
+    # Recherche de racine avec compression par halving
+    while parent[a] != a:
+        parent[a] = parent[parent[a]]
+        a = parent[a]
+    return a
+
+def label_mask(mask, nx, ny, connectivity=4):
+    """
+    Union-find en deux passes sur 'mask' (séquence plate nx*ny, vrai = dans
+    la classe): la 1re passe donne une étiquette provisoire par tuile en
+    regardant les voisins déjà vus (ouest, nord; + diagonales en 8-connexité)
+    et unit les étiquettes qui se touchent; la 2e passe remplace chaque
+    étiquette par sa racine, renumérotée 1..n, et calcule tailles et bbox.
+    """
+    labels = [0]*(nx*ny)
+    parent = [0]
+    diag = (connectivity == 8)
+    for y in range(ny):
+        row = y*nx
+        for x in range(nx):
+            i = row + x
+            if not mask[i]:
+                continue
+            # Voisins déjà étiquetés
+            near = []
+            if x > 0 and labels[i-1]:
+                near.append(labels[i-1])
+            if y > 0:
+                if labels[i-nx]:
+                    near.append(labels[i-nx])
+                if diag:
+                    if x > 0 and labels[i-nx-1]:
+                        near.append(labels[i-nx-1])
+                    if x < nx-1 and labels[i-nx+1]:
+                        near.append(labels[i-nx+1])
+            if not near:
+                lab = len(parent)
+                parent.append(lab)
+            else:
+                lab = _find(parent, near[0])
+                for other in near[1:]:
+                    r = _find(parent, other)
+                    if r != lab:
+                        # La plus petite racine gagne
+                        if r < lab:
+                            parent[lab] = r
+                            lab = r
+                        else:
+                            parent[r] = lab
+            labels[i] = lab
+
+    # Racines => étiquettes définitives 1..n
+    final = [0]*len(parent)
+    count = 0
+    for lab in range(1, len(parent)):
+        r = _find(parent, lab)
+        if r == lab:
+            count += 1
+            final[lab] = count
+    for lab in range(1, len(parent)):
+        final[lab] = final[_find(parent, lab)]
+
+    sizes = [0]*(count+1)
+    bboxes = [None]*(count+1)
+    for y in range(ny):
+        row = y*nx
+        for x in range(nx):
+            i = row + x
+            lab = labels[i]
+            if not lab:
+                continue
+            lab = final[lab]
+            labels[i] = lab
+            sizes[lab] += 1
+            box = bboxes[lab]
+            if box is None:
+                bboxes[lab] = (x, y, x, y)
+            else:
+                (x0, y0, x1, y1) = box
+                if x < x0 or x > x1 or y > y1:
+                    bboxes[lab] = (min(x0, x), y0, max(x1, x), max(y1, y))
+    return Components(nx, ny, labels, sizes, bboxes)
+
+def label_terrain(grid, include=None, exclude=None, connectivity=4):
+    """
+    Composantes d'une classe de terrain: tuiles dont le type est dans
+    'include' (ou, à défaut, n'est pas dans 'exclude').
+    Ex: label_terrain(grid, include=(T_LAKE,)) => lacs.
+    """
+    ny = len(grid)
+    nx = len(grid[0])
+    mask = bytearray(nx*ny)
+    for y, row in enumerate(grid):
+        base = y*nx
+        for x, t in enumerate(row):
+            if (t in include) if include is not None else (t not in exclude):
+                mask[base + x] = 1
+    return label_mask(mask, nx, ny, connectivity)
@@ -0,0 +1,157 @@
+# Engineering/flowfield.py
+
+import heapq
+import collections
+from .consts import TILE_SIZE, T_LAKE, T_MOUNTAIN
+from .pathfinding import TERRAIN_COST, SQRT2, DIRECTIONS_8, mountain_layer
+
+FLOW_CACHE_SIZE = 8
+
+class FlowField:
+    """
+    Champ d'intégration (Dijkstra depuis le but) sur la grille pondérée
+    par le terrain. Chaque unité de l'ordre échantillonne sa tuile courante
+    et suit la tuile voisine de plus faible coût: un seul calcul O(grille)
+    par ordre, quel que soit le nombre d'unités.
+
+    Infranchissable: montagnes + marge (mountain_layer) et lacs,
+    que move_direct_line refuse de traverser. Les empreintes d'unités
+    n'y figurent pas (contrairement aux chemins du PathService): le champ
+    est partagé par tout un groupe et gardé en cache d'un ordre à l'autre,
+    il ne doit donc dépendre que du terrain.
+    """
+    def __init__(self, grid, goal_tile, mountain_margin_px=16):
+        self.goal = goal_tile
+        self.ny = len(grid)
+        self.nx = len(grid[0])
+        self.free = passable_mask(grid, mountain_margin_px)
+        self.dist = integration_field(grid, goal_tile, self.free)
+        self._next = {}
+
+    def cost(self, tx, ty):
+        """Coût restant jusqu'au but depuis (tx, ty) (inf si inaccessible)."""
+        if not (0 <= tx < self.nx and 0 <= ty < self.ny):
+            return float('inf')
+        return self.dist[ty*self.nx + tx]
+
+    def next_tile(self, tx, ty):
+        """
+        Tuile voisine à viser depuis (tx, ty), ou None si (tx, ty) est le but
+        ou si aucun voisin ne rapproche du but.
+        """
+        key = (tx, ty)
+        if key in self._next:
+            return self._next[key]
+        best = None
+        best_d = self.cost(tx, ty)
+        for (dx, dy) in DIRECTIONS_8:
+            d = self.cost(tx+dx, ty+dy)
+            if d < best_d and (not (dx and dy) or self._corner_free(tx, ty, dx, dy)):
+                best_d = d
+                best = (tx+dx, ty+dy)
+        self._next[key] = best
+        return best
+
+    def _corner_free(self, tx, ty, dx, dy):
+        # Pas de diagonale qui rase un coin infranchissable
+        if not (0 <= tx+dx < self.nx and 0 <= ty+dy < self.ny):
+            return False
+        if not (0 <= tx < self.nx and 0 <= ty < self.ny):
+            return True
+        nx = self.nx
+        return bool(self.free[ty*nx + tx+dx] and self.free[(ty+dy)*nx + tx])
+
+def passable_mask(grid, mountain_margin_px=16):
+    """
+    free[y*nx+x] = 1 si la tuile est franchissable pour un champ de flux:
+    ni montagne (+ marge), ni lac (refusés par move_direct_line).
+    """
+    ny = len(grid)
+    nx = len(grid[0])
+    blocked = mountain_layer(grid, mountain_margin_px)
+    free = bytearray(nx*ny)
+    for y in range(ny):
+        row = grid[y]
+        brow = blocked[y]
+        for x in range(nx):
+            if not brow[x] and row[x] not in (T_LAKE, T_MOUNTAIN):
+                free[y*nx + x] = 1
+    return free
+
+def integration_field(grid, goal_tile, free):
+    """
+    Dijkstra inverse depuis 'goal_tile': dist[y*nx+x] = coût minimal pour
+    aller de (x, y) au but (pas de longueur 1 ou sqrt(2) * TERRAIN_COST
+    de la tuile d'arrivée, comme astar_search), sans couper de coin.
+    """
+    ny = len(grid)
+    nx = len(grid[0])
+    inf = float('inf')
+    dist = [inf]*(nx*ny)
+    (gx, gy) = goal_tile
+    if not (0 <= gx < nx and 0 <= gy < ny) or not free[gy*nx + gx]:
+        return dist
+
+    steps = [(dx, dy, SQRT2 if dx and dy else 1.0) for (dx, dy) in DIRECTIONS_8]
+    dist[gy*nx + gx] = 0.0
+    heap = [(0.0, gx, gy)]
+    while heap:
+        d, cx, cy = heapq.heappop(heap)
+        if d > dist[cy*nx + cx]:
+            continue
+        # Aller d'un voisin p vers (cx, cy) coûte l'entrée dans (cx, cy)
+        enter = TERRAIN_COST.get(grid[cy][cx], 1.0)
+        for (dx, dy, length) in steps:
+            px = cx+dx
+            py = cy+dy
+            if 0 <= px < nx and 0 <= py < ny:
+                i = py*nx + px
+                if not free[i]:
+                    continue
+                if dx and dy and not (free[cy*nx + px] and free[py*nx + cx]):
+                    continue
+                nd = d + length*enter
+                if nd < dist[i]:
+                    dist[i] = nd
+                    heapq.heappush(heap, (nd, px, py))
+    return dist
+
+class FlowFieldCache:
+    """
+    Champs de flux par tuile but, avec éviction LRU.
+    clear() à appeler si le terrain change.
+    """
+    def __init__(self, grid, capacity=FLOW_CACHE_SIZE, mountain_margin_px=16):
+        self.grid = grid
+        self.capacity = capacity
+        self.mountain_margin_px = mountain_margin_px
+        self.fields = collections.OrderedDict()
+
+    def get(self, goal_tile):
+        field = self.fields.get(goal_tile)
+        if field is not None:
+            self.fields.move_to_end(goal_tile)
+            return field
+        field = FlowField(self.grid, goal_tile, self.mountain_margin_px)
+        self.fields[goal_tile] = field
+        if len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
+
+    def clear(self):
+        self.fields.clear()
+
+def flow_waypoint(field, x, y):
+    """
+    Point (px, py) vers lequel une unité en (x, y) doit se diriger
+    pour suivre 'field', ou None si elle est arrivée / bloquée.
+    """
+    tx = int(x // TILE_SIZE)
+    ty = int(y // TILE_SIZE)
+    if (tx, ty) == field.goal:
+        return (field.goal[0]*TILE_SIZE + TILE_SIZE/2,
+                field.goal[1]*TILE_SIZE + TILE_SIZE/2)
+    nxt = field.next_tile(tx, ty)
+    if nxt is None:
+        return None
+    return (nxt[0]*TILE_SIZE + TILE_SIZE/2, nxt[1]*TILE_SIZE + TILE_SIZE/2)
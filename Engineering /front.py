@@ -1,9 +1,23 @@
 # Engineering/front.py
 
+import bisect
 import random
 import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel: repli sur les boucles Python
+    np = None
+
 from .consts import WIDTH, HEIGHT
 from .pathfinding import distance
+from .spline import catmull_rom_flat
+
+# Nombre max de points du front (au-delà: rééchantillonnage)
+FRONT_CAPACITY = 50
+# Côté des seaux de la recherche du point le plus proche (pixels)
+FRONT_BUCKET_PX = 40
 
 def generate_initial_front(num_points=25):
     """
@@ -18,10 +32,11 @@ def generate_initial_front(num_points=25):
         points.append((x, y))
     return points
 
-def add_front_points_on_cross(front_points, xC, yC):
+def add_front_points_on_cross(front_points, xC, yC, rng=random):
     """
     Ajoute localement 1 ou 2 points autour de (xC, yC)
     quand une unité traverse la ligne, pour courber la ligne de front.
+    Tirages par 'rng' (module random par défaut).
     """
     if len(front_points) < 2:
         return front_points
@@ -34,20 +49,20 @@ def add_front_points_on_cross(front_points, xC, yC):
             best_d = d
             best_i = i
 
-    dx = random.uniform(-20, 20)
-    dy = random.uniform(-20, 20)
+    dx = rng.uniform(-20, 20)
+    dy = rng.uniform(-20, 20)
     newp = (xC + dx, yC + dy)
     front_points.insert(best_i, newp)
 
     # Optionnel : on ajoute un second point pour plus de variété
-    if random.random() < 0.5:
-        dx2 = random.uniform(-20, 20)
-        dy2 = random.uniform(-20, 20)
+    if rng.random() < 0.5:
+        dx2 = rng.uniform(-20, 20)
+        dy2 = rng.uniform(-20, 20)
         front_points.insert(best_i, (xC + dx2, yC + dy2))
 
     # On limite la taille totale si la liste devient trop grande
     if len(front_points) > 50:
-        idx = random.randint(len(front_points)//2, len(front_points)-1)
+        idx = rng.randint(len(front_points)//2, len(front_points)-1)
         front_points.pop(idx)
 
     return front_points
@@ -57,7 +72,9 @@ def update_front_line(
     influence_radius=80,
     push_strength=0.1,
     smooth_passes=1,
-    beautify=False
+    beautify=False,
+    index=None,
+    positions=None
 ):
     """
     Fait évoluer la ligne de front dans le temps, en “poussant”
@@ -70,12 +87,31 @@ def update_front_line(
     - push_strength : intensité (ex: 0.1 => 10% du chemin en 1 update)
     - smooth_passes : nb de passes de lissage final
     - beautify : si True, applique un spline Catmull-Rom pour un rendu plus doux
+    - index : SpatialHash optionnel des unités => seules les unités proches
+      de chaque point sont parcourues (chemin sans NumPy)
+    - positions : (xs, ys) optionnels, tableaux NumPy des positions des
+      unités (ex: colonnes d'un UnitStore), évite de les relire une à une
 
+    Avec NumPy, tout le calcul passe par update_front_array.
     Aucune modification des autres scripts n’est requise.
     """
     if len(front_points) < 2 or not units:
         return
 
+    if np is not None:
+        if positions is None:
+            n = len(units)
+            positions = (np.fromiter((u.x for u in units), float, n),
+                         np.fromiter((u.y for u in units), float, n))
+        pts = update_front_array(
+            np.asarray(front_points, dtype=float), positions[0], positions[1],
+            dt, influence_radius, push_strength, smooth_passes)
+        new_front = list(map(tuple, pts.tolist()))
+        if beautify and len(new_front) >= 4:
+            new_front = catmull_rom_spline(new_front, steps=6)
+        front_points[:] = new_front
+        return
+
     rad2 = influence_radius**2
     new_front = []
 
@@ -85,7 +121,11 @@ def update_front_line(
         sum_yw = 0.0
 
         # Recherche d'unités dans un rayon influence_radius
-        for u in units:
+        if index is not None:
+            nearby = index.query_radius(fx, fy, influence_radius)
+        else:
+            nearby = units
+        for u in nearby:
             dx = (u.x - fx)
             dy = (u.y - fy)
             dist2 = dx*dx + dy*dy
@@ -121,6 +161,101 @@ def update_front_line(
 
     front_points[:] = new_front
 
+def influence_sums(pts, ux, uy, radius):
+    """
+    Pour chaque point de 'pts' (N,2), sommes pondérées des unités à moins de
+    'radius': (sum_w, sum_xw, sum_yw), poids 1/(dist² + 1).
+
+    Requête par seaux, sans boucle Python: les unités proches de la bbox
+    du front sont triées par
+    cellule (côté 'radius'), chaque point lit les plages de ses 3x3
+    cellules voisines (searchsorted), puis les paires (point, unité)
+    candidates sont filtrées et sommées par np.bincount.
+    """
+    n = len(pts)
+    zero = np.zeros(n)
+    if n == 0 or len(ux) == 0:
+        return zero, zero, zero
+
+    # Seules les unités dans la bbox du front (+ rayon) peuvent compter
+    (xmin, ymin) = pts.min(axis=0) - radius
+    (xmax, ymax) = pts.max(axis=0) + radius
+    inside = (ux > xmin) & (ux < xmax) & (uy > ymin) & (uy < ymax)
+    if not inside.all():
+        ux = ux[inside]
+        uy = uy[inside]
+        if len(ux) == 0:
+            return zero, zero, zero
+
+    cux = np.floor_divide(ux, radius).astype(np.int64)
+    cuy = np.floor_divide(uy, radius).astype(np.int64)
+    cpx = np.floor_divide(pts[:, 0], radius).astype(np.int64)
+    cpy = np.floor_divide(pts[:, 1], radius).astype(np.int64)
+    x0 = min(cux.min(), cpx.min()) - 1
+    y0 = min(cuy.min(), cpy.min()) - 1
+    width = max(cux.max(), cpx.max()) - x0 + 2
+
+    key = (cuy - y0)*width + (cux - x0)
+    order = np.argsort(key, kind="stable")
+    skey = key[order]
+
+    # Clés des 3x3 cellules autour de chaque point => (N, 9)
+    near = ((cpy - y0)*width + (cpx - x0))[:, None] + _neighbor_keys(width)
+    start = np.searchsorted(skey, near, "left").ravel()
+    count = np.searchsorted(skey, near, "right").ravel() - start
+    total = int(count.sum())
+    if total == 0:
+        return zero, zero, zero
+
+    # Paires (point, unité) candidates
+    pidx = np.repeat(np.repeat(np.arange(n), 9), count)
+    first = np.cumsum(count) - count
+    uidx = order[np.arange(total) - np.repeat(first - start, count)]
+
+    px = ux[uidx]
+    py = uy[uidx]
+    dx = px - pts[pidx, 0]
+    dy = py - pts[pidx, 1]
+    d2 = dx*dx + dy*dy
+    keep = d2 < radius*radius
+    pidx = pidx[keep]
+    w = 1.0 / (d2[keep] + 1.0)
+    return (np.bincount(pidx, w, n),
+            np.bincount(pidx, w*px[keep], n),
+            np.bincount(pidx, w*py[keep], n))
+
+def _neighbor_keys(width):
+    # Décalages de clé des 3x3 cellules voisines pour une largeur donnée
+    return np.array([dy*width + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1)])
+
+def update_front_array(pts, ux, uy, dt=1.0, influence_radius=80,
+                       push_strength=0.1, smooth_passes=1, out=None):
+    """
+    Version NumPy de update_front_line sur un tableau (N,2): pondération,
+    poussée et lissage en opérations vectorisées. Retourne le résultat
+    (N,2): 'out' s'il est fourni (peut être 'pts' lui-même), sinon un
+    nouveau tableau, 'pts' n'étant alors pas modifié.
+    """
+    sw, sxw, syw = influence_sums(pts, ux, uy, influence_radius)
+    moved = sw >= 1e-9
+    if out is None:
+        out = pts.copy()
+    elif out is not pts:
+        out[:] = pts
+    k = push_strength * dt
+    w = sw[moved]
+    out[moved, 0] += (sxw[moved]/w - pts[moved, 0]) * k
+    out[moved, 1] += (syw[moved]/w - pts[moved, 1]) * k
+    return smooth_front_array(out, smooth_passes)
+
+def smooth_front_array(pts, passes=1):
+    """smooth_front sur un tableau (N,2), en place (extrémités fixes)."""
+    if len(pts) < 3:
+        return pts
+    for _ in range(passes):
+        pts[1:-1] = (pts[:-2] + pts[1:-1] + pts[2:]) / 3
+    return pts
+
 def smooth_front(points, passes=1):
     """
     Lissage local par moyenne glissante: chaque point devient
@@ -144,22 +279,14 @@ def catmull_rom_spline(pts, steps=10):
     """
     Génère une liste de points en Catmull-Rom Spline, 
     subdivisant chaque segment 'steps' fois.
+    Table de base précalculée par 'steps', tous les segments évalués en
+    un seul calcul (Engineering/spline.py).
     """
     if len(pts) < 4:
         return pts
 
-    new_pts = []
-    for i in range(len(pts) - 1):
-        p0 = pts[max(i-1, 0)]
-        p1 = pts[i]
-        p2 = pts[i+1]
-        p3 = pts[min(i+2, len(pts)-1)]
-        for t in range(steps):
-            tau = t / float(steps)
-            x, y = catmull_rom_position(p0, p1, p2, p3, tau)
-            new_pts.append((x, y))
-    new_pts.append(pts[-1])
-    return new_pts
+    flat = catmull_rom_flat(pts, steps)
+    return list(zip(flat[0::2], flat[1::2]))
 
 def catmull_rom_position(p0, p1, p2, p3, t, alpha=0.5):
     """
@@ -213,3 +340,434 @@ def check_side(front_points, xU, yU):
         midx = pA[0] + t*(pB[0] - pA[0])
 
     return "left" if xU < midx else "right"
+
+class FrontIndex:
+    """
+    Index du front pour check_side, à reconstruire quand le front change
+    (au plus quelques fois par tick): points triés par y (tri stable),
+    puis une requête = un bisect, O(log n) au lieu d'un parcours complet.
+
+    Même résultat que check_side: pour yU tombant entre deux y triés,
+    pA = premier point (ordre du front) du y le plus grand < yU,
+    pB = premier point du y le plus petit >= yU.
+    """
+    def __init__(self, front_points):
+        pts = sorted(front_points, key=lambda pt: pt[1])
+        self.ys = [p[1] for p in pts]
+        ys = self.ys
+        # Intervalle i (1 <= i < n): entre pA = tête du groupe de ys[i-1]
+        # et pB = pts[i]
+        self.pa = [None]*len(pts)
+        head = None
+        for i in range(1, len(pts)):
+            if head is None or ys[i-1] != ys[i-2]:
+                head = pts[i-1]
+            self.pa[i] = head
+        self.pts = pts
+        self._arrays = None
+
+    def split_x(self, yU):
+        """
+        Abscisse du front à la hauteur yU (x < split_x => "left"),
+        ou None si yU est hors de l'étendue du front (tout est "left").
+        """
+        i = bisect.bisect_left(self.ys, yU)
+        if i == 0 or i == len(self.ys):
+            return None
+        pA = self.pa[i]
+        pB = self.pts[i]
+        dy = pB[1] - pA[1]
+        if abs(dy) < 1e-9:
+            return (pA[0] + pB[0]) / 2
+        t = (yU - pA[1]) / dy
+        return pA[0] + t*(pB[0] - pA[0])
+
+    def side(self, xU, yU):
+        """check_side(front_points, xU, yU) en O(log n)."""
+        midx = self.split_x(yU)
+        if midx is None:
+            return "left"
+        return "left" if xU < midx else "right"
+
+    def sides(self, units):
+        """Côté de chaque unité, en un appel (vectorisé si NumPy)."""
+        if np is None or len(units) < 2:
+            return [self.side(u.x, u.y) for u in units]
+        n = len(units)
+        xs = np.fromiter((u.x for u in units), float, n)
+        ys = np.fromiter((u.y for u in units), float, n)
+        return ["left" if left else "right" for left in self.left_mask(xs, ys).tolist()]
+
+    def left_mask(self, xs, ys):
+        """Tableau booléen: True si (xs[k], ys[k]) est à gauche du front."""
+        n = len(self.ys)
+        if n < 2:
+            return np.ones(len(xs), dtype=bool)
+        if self._arrays is None:
+            pa = self.pa[1:]
+            self._arrays = (
+                np.array(self.ys),
+                np.array([0.0] + [p[0] for p in pa]), np.array([0.0] + [p[1] for p in pa]),
+                np.array([p[0] for p in self.pts]), np.array([p[1] for p in self.pts]),
+            )
+        (fys, ax, ay, bx, by) = self._arrays
+        i = np.searchsorted(fys, ys, "left")
+        inside = (i > 0) & (i < n)
+        i = np.clip(i, 1, n-1)
+        ax = ax[i]
+        ay = ay[i]
+        bx = bx[i]
+        dy = by[i] - ay
+        flat = np.abs(dy) < 1e-9
+        with np.errstate(divide="ignore", invalid="ignore"):
+            midx = np.where(flat, (ax + bx) / 2, ax + (ys - ay) / dy * (bx - ax))
+        return ~inside | (xs < midx)
+
+class FrontLine:
+    """
+    Ligne de front à capacité fixe, stockée dans deux tampons de
+    coordonnées préalloués (x0, y0, x1, y1, ...) utilisés en double
+    tampon: chaque passe (insertions, lissage, rééchantillonnage) lit l'un
+    et écrit l'autre, puis on les échange. Rien n'est réalloué en jeu.
+
+    - add_crossings(points) : toutes les traversées d'un tick en une seule
+      passe de fusion (les traversées proches du même sommet sont moyennées)
+    - update(...)           : poussée vers les unités + lissage, en place
+    - resample(count)       : rééchantillonnage uniforme en abscisse
+      curviligne, extrémités conservées (remplace la suppression au hasard)
+    - nearest(x, y)         : sommet le plus proche, par seaux spatiaux
+    - points()              : liste de tuples, pour FrontIndex et le rendu
+    - bbox()                : boîte englobante (x0, y0, x1, y1), en cache
+
+    Avec NumPy, update() passe par update_front_array, écrit dans une vue
+    du tampon courant. Les points ajoutés aux traversées sont tirés par
+    'rng' (module random par défaut, Simulation.rng en jeu).
+    """
+    def __init__(self, points, capacity=FRONT_CAPACITY, bucket_px=FRONT_BUCKET_PX,
+                 rng=random):
+        self.capacity = capacity
+        self.rng = rng
+        # Place pour un tick d'insertions (au plus 2 par sommet) avant
+        # rééchantillonnage
+        self.size = 3*capacity
+        if len(points) > self.size:
+            raise ValueError("front de %d points pour une capacité de %d"
+                             % (len(points), capacity))
+        self._cur = array('d', bytes(16*self.size))
+        self._back = array('d', bytes(16*self.size))
+        self._views = None
+        if np is not None:
+            self._views = (np.frombuffer(self._cur).reshape(self.size, 2),
+                           np.frombuffer(self._back).reshape(self.size, 2))
+        self.n = len(points)
+        cur = self._cur
+        for i, (x, y) in enumerate(points):
+            cur[2*i] = x
+            cur[2*i+1] = y
+        self.bucket_px = bucket_px
+        self._buckets = None
+        self._bbox = None
+        if self.n > capacity:
+            self.resample(capacity)
+
+    def __len__(self):
+        return self.n
+
+    def _swap(self):
+        self._cur, self._back = self._back, self._cur
+        if self._views is not None:
+            self._views = (self._views[1], self._views[0])
+        self._buckets = None
+        self._bbox = None
+
+    def bbox(self):
+        """Boîte englobante (x0, y0, x1, y1) des sommets, None si vide."""
+        if self._bbox is None and self.n:
+            cur = self._cur
+            m = 2*self.n
+            xs = cur[0:m:2]
+            ys = cur[1:m:2]
+            self._bbox = (min(xs), min(ys), max(xs), max(ys))
+        return self._bbox
+
+    def points(self):
+        """Sommets du front, liste de tuples (x, y)."""
+        cur = self._cur
+        m = 2*self.n
+        return list(zip(cur[0:m:2], cur[1:m:2]))
+
+    def _build_buckets(self):
+        cs = self.bucket_px
+        cur = self._cur
+        buckets = {}
+        for i in range(self.n):
+            c = (int(cur[2*i] // cs), int(cur[2*i+1] // cs))
+            b = buckets.get(c)
+            if b is None:
+                buckets[c] = [i]
+            else:
+                b.append(i)
+        cells = list(buckets)
+        self._bounds = (min(c[0] for c in cells), min(c[1] for c in cells),
+                        max(c[0] for c in cells), max(c[1] for c in cells))
+        self._buckets = buckets
+
+    def nearest(self, x, y):
+        """
+        Indice du sommet le plus proche de (x, y) (le plus petit indice à
+        égalité, comme add_front_points_on_cross), ou -1 si le front est
+        vide. Anneaux de seaux de plus en plus larges autour de (x, y),
+        arrêt dès que l'anneau suivant ne peut plus être plus proche.
+        """
+        if self.n == 0:
+            return -1
+        if self._buckets is None:
+            self._build_buckets()
+        cs = self.bucket_px
+        cur = self._cur
+        buckets = self._buckets
+        (bx0, by0, bx1, by1) = self._bounds
+        cx = int(x // cs)
+        cy = int(y // cs)
+        rmax = max(abs(cx - bx0), abs(cx - bx1), abs(cy - by0), abs(cy - by1))
+        best = None
+        for r in range(rmax + 1):
+            # Tout point d'un anneau r est à plus de (r-1)*cs de (x, y)
+            if best is not None and ((r-1)*cs)**2 > best[0]:
+                break
+            for yy in range(cy - r, cy + r + 1):
+                step = 1 if r == 0 or yy in (cy - r, cy + r) else 2*r
+                for xx in range(cx - r, cx + r + 1, step):
+                    for i in buckets.get((xx, yy), ()):
+                        dx = cur[2*i] - x
+                        dy = cur[2*i+1] - y
+                        cand = (dx*dx + dy*dy, i)
+                        if best is None or cand < best:
+                            best = cand
+        return best[1]
+
+    def add_crossings(self, crossings):
+        """
+        Courbe le front autour des traversées (x, y) du tick, comme
+        add_front_points_on_cross mais en une seule passe: chaque traversée
+        est rattachée à son sommet le plus proche, les traversées d'un même
+        sommet sont moyennées, puis 1 ou 2 points sont insérés devant ce
+        sommet en recopiant le front dans l'autre tampon. Si la capacité
+        est dépassée, le front est rééchantillonné.
+        """
+        if self.n < 2 or not crossings:
+            return
+        groups = {}
+        for (x, y) in crossings:
+            i = self.nearest(x, y)
+            g = groups.get(i)
+            if g is None:
+                groups[i] = [x, y, 1]
+            else:
+                g[0] += x
+                g[1] += y
+                g[2] += 1
+
+        rng = self.rng
+        src = self._cur
+        dst = self._back
+        j = 0
+        for i in range(self.n):
+            g = groups.get(i)
+            if g is not None:
+                xC = g[0] / g[2]
+                yC = g[1] / g[2]
+                # Même tirage que add_front_points_on_cross: le second point
+                # éventuel est inséré devant le premier
+                p1 = (xC + rng.uniform(-20, 20), yC + rng.uniform(-20, 20))
+                if rng.random() < 0.5:
+                    p2 = (xC + rng.uniform(-20, 20), yC + rng.uniform(-20, 20))
+                    dst[2*j] = p2[0]
+                    dst[2*j+1] = p2[1]
+                    j += 1
+                dst[2*j] = p1[0]
+                dst[2*j+1] = p1[1]
+                j += 1
+            dst[2*j] = src[2*i]
+            dst[2*j+1] = src[2*i+1]
+            j += 1
+        self.n = j
+        self._swap()
+        if self.n > self.capacity:
+            self.resample(self.capacity)
+
+    def resample(self, count):
+        """
+        Remplace les sommets par 'count' points régulièrement espacés le
+        long de la polyligne (abscisse curviligne), extrémités conservées.
+        """
+        n = self.n
+        count = min(count, self.size)
+        if n < 2 or count < 2:
+            return
+        src = self._cur
+        dst = self._back
+        total = 0.0
+        seg = [0.0]*(n-1)
+        for i in range(n-1):
+            seg[i] = math.hypot(src[2*i+2] - src[2*i], src[2*i+3] - src[2*i+1])
+            total += seg[i]
+
+        i = 0
+        start = 0.0  # abscisse du sommet i
+        for k in range(count):
+            s = total * k / (count - 1)
+            while i < n-2 and start + seg[i] < s:
+                start += seg[i]
+                i += 1
+            t = (s - start) / seg[i] if seg[i] > 0 else 0.0
+            t = min(max(t, 0.0), 1.0)
+            dst[2*k] = src[2*i] + t*(src[2*i+2] - src[2*i])
+            dst[2*k+1] = src[2*i+1] + t*(src[2*i+3] - src[2*i+1])
+        # Extrémités exactes (pas d'erreur d'arrondi)
+        dst[0] = src[0]
+        dst[1] = src[1]
+        dst[2*count-2] = src[2*n-2]
+        dst[2*count-1] = src[2*n-1]
+        self.n = count
+        self._swap()
+
+    def update(self, units, dt=1.0, influence_radius=80, push_strength=0.1,
+               smooth_passes=1, index=None, positions=None):
+        """
+        Même évolution que update_front_line (poussée pondérée puis
+        lissage), écrite dans les tampons du front.
+        """
+        n = self.n
+        if n < 2 or not units:
+            return
+
+        if self._views is not None:
+            if positions is None:
+                m = len(units)
+                positions = (np.fromiter((u.x for u in units), float, m),
+                             np.fromiter((u.y for u in units), float, m))
+            pts = self._views[0][:n]
+            update_front_array(pts, positions[0], positions[1], dt,
+                               influence_radius, push_strength,
+                               smooth_passes, out=pts)
+            self._buckets = None
+            self._bbox = None
+            return
+
+        cur = self._cur
+        rad2 = influence_radius**2
+        k = push_strength * dt
+        for i in range(n):
+            fx = cur[2*i]
+            fy = cur[2*i+1]
+            if index is not None:
+                nearby = index.query_radius(fx, fy, influence_radius)
+            else:
+                nearby = units
+            sum_w = 0.0
+            sum_xw = 0.0
+            sum_yw = 0.0
+            for u in nearby:
+                dx = (u.x - fx)
+                dy = (u.y - fy)
+                dist2 = dx*dx + dy*dy
+                if dist2 < rad2:
+                    w = 1.0 / (dist2 + 1.0)
+                    sum_w += w
+                    sum_xw += w * u.x
+                    sum_yw += w * u.y
+            if sum_w >= 1e-9:
+                cur[2*i] = fx + (sum_xw/sum_w - fx) * k
+                cur[2*i+1] = fy + (sum_yw/sum_w - fy) * k
+        for _ in range(smooth_passes if n >= 3 else 0):
+            src = self._cur
+            dst = self._back
+            dst[0] = src[0]
+            dst[1] = src[1]
+            for i in range(1, n-1):
+                dst[2*i] = (src[2*i-2] + src[2*i] + src[2*i+2]) / 3
+                dst[2*i+1] = (src[2*i-1] + src[2*i+1] + src[2*i+3]) / 3
+            dst[2*n-2] = src[2*n-2]
+            dst[2*n-1] = src[2*n-1]
+            self._swap()
+        self._buckets = None
+        self._bbox = None
+
+
+class FrontSet:
+    """
+    Ensemble de fronts indépendants (îles, poches après encerclement),
+    chacun un FrontLine avec sa boîte englobante.
+
+    update() saute entièrement un front si aucune unité n'est à moins de
+    influence_radius de sa boîte: le coût d'un tick suit le nombre de
+    zones de contact, pas la longueur totale des fronts.
+    """
+    def __init__(self, fronts=()):
+        self.fronts = list(fronts)
+        # Fronts mis à jour / ignorés au dernier update()
+        self.updated = 0
+        self.skipped = 0
+
+    def __len__(self):
+        return len(self.fronts)
+
+    def __iter__(self):
+        return iter(self.fronts)
+
+    def __getitem__(self, i):
+        return self.fronts[i]
+
+    def add(self, front):
+        """Ajoute un front (FrontLine ou liste de points) et le retourne."""
+        if not isinstance(front, FrontLine):
+            front = FrontLine(front)
+        self.fronts.append(front)
+        return front
+
+    def remove(self, front):
+        self.fronts.remove(front)
+
+    def update(self, units, dt=1.0, influence_radius=80, push_strength=0.1,
+               smooth_passes=1, index=None, positions=None):
+        """
+        FrontLine.update sur chaque front proche d'au moins une unité.
+        Avec NumPy, seules les positions des unités dans la boîte
+        (élargie du rayon) sont transmises au front.
+        Retourne le nombre de fronts mis à jour.
+        """
+        self.updated = 0
+        self.skipped = 0
+        if not units:
+            self.skipped = len(self.fronts)
+            return 0
+        if np is not None and positions is None:
+            m = len(units)
+            positions = (np.fromiter((u.x for u in units), float, m),
+                         np.fromiter((u.y for u in units), float, m))
+        r = influence_radius
+        for front in self.fronts:
+            box = front.bbox()
+            if box is None or len(front) < 2:
+                self.skipped += 1
+                continue
+            (x0, y0, x1, y1) = (box[0] - r, box[1] - r, box[2] + r, box[3] + r)
+            near = positions
+            if positions is not None:
+                (ux, uy) = positions
+                inside = (ux > x0) & (ux < x1) & (uy > y0) & (uy < y1)
+                active = bool(inside.any())
+                if active and not inside.all():
+                    near = (ux[inside], uy[inside])
+            elif index is not None:
+                active = index.any_in_rect(x0, y0, x1, y1)
+            else:
+                active = any(x0 < u.x < x1 and y0 < u.y < y1 for u in units)
+            if not active:
+                self.skipped += 1
+                continue
+            front.update(units, dt, influence_radius, push_strength,
+                         smooth_passes, index=index, positions=near)
+            self.updated += 1
+        return self.updated
@@ -9,51 +9,77 @@ from Engineering.consts import (
     T_DEEP_WATER, T_RIVER, T_PLAIN, T_FOREST,
     T_MOUNTAIN, T_BRIDGE, T_LAKE
 )
-from Engineering.pathfinding import in_bounds
+from Engineering.components import label_terrain
 
-def generate_map(nx, ny):
+# À incrémenter si la génération change (invalide le cache de maps)
+GENERATOR_VERSION = "list-2"
+
+def in_grid(grid, x, y):
+    """
+    Vérifie si (x, y) est dans 'grid' (taille réelle de la grille, et non
+    NX/NY: generate_map accepte toutes les tailles).
+    """
+    return 0 <= y < len(grid) and 0 <= x < len(grid[0])
+
+def make_rng(seed=None, rng=None):
+    """
+    Générateur aléatoire de la génération: 'rng' s'il est fourni,
+    sinon random.Random(seed), ou le module random global si seed est None.
+    """
+    if rng is not None:
+        return rng
+    if seed is not None:
+        return random.Random(seed)
+    return random
+
+def generate_map(nx, ny, seed=None, rng=None):
+    """
+    Génère une map nx*ny. Toute l'aléa passe par 'rng' (cf. make_rng):
+    une même graine redonne toujours la même map.
+    """
+    rng = make_rng(seed, rng)
     grid = [[T_PLAIN for _ in range(nx)] for __ in range(ny)]
-    add_mountains_with_20pct_sin(grid, count=5)
-    ensure_at_least_one_mountain(grid)
-    ensure_scenic_mountain_border(grid)
-    add_lakes(grid, count=3)
-    ensure_at_least_one_large_lake(grid)
-    add_rivers_forked(grid, min_count=1, max_count=2)
-    add_forests_in_blobs(grid, ratio=0.20)
-    ensure_minimum_forest(grid, min_blobs=2)
+    add_mountains_with_20pct_sin(grid, count=5, rng=rng)
+    ensure_at_least_one_mountain(grid, rng=rng)
+    ensure_scenic_mountain_border(grid, rng=rng)
+    add_lakes(grid, count=3, rng=rng)
+    ensure_at_least_one_large_lake(grid, rng=rng)
+    add_rivers_forked(grid, min_count=1, max_count=2, rng=rng)
+    add_forests_in_blobs(grid, ratio=0.20, rng=rng)
+    ensure_minimum_forest(grid, min_blobs=2, rng=rng)
     return grid
 
-def add_mountains_with_20pct_sin(grid, count=5):
+def add_mountains_with_20pct_sin(grid, count=5, rng=random):
     for _ in range(count):
-        use_sin = (random.random() < 0.2)
-        place_mountain_blob(grid, size=random.randint(15,30), use_sin=use_sin)
+        use_sin = (rng.random() < 0.2)
+        place_mountain_blob(grid, size=rng.randint(15,30), use_sin=use_sin, rng=rng)
 
-def ensure_at_least_one_mountain(grid):
+def ensure_at_least_one_mountain(grid, rng=random):
     has_mountain = False
     for row in grid:
         if T_MOUNTAIN in row:
             has_mountain = True
             break
     if not has_mountain:
-        place_mountain_blob(grid, size=random.randint(15,30), use_sin=False)
+        place_mountain_blob(grid, size=rng.randint(15,30), use_sin=False, rng=rng)
 
-def ensure_scenic_mountain_border(grid):
+def ensure_scenic_mountain_border(grid, rng=random):
     nx = len(grid[0])
     ny = len(grid)
-    if random.random() < 0.5:
+    if rng.random() < 0.5:
         for x in range(nx):
-            if random.random() < 0.1:
-                place_mountain_blob(grid, size=random.randint(8,15), use_sin=True)
+            if rng.random() < 0.1:
+                place_mountain_blob(grid, size=rng.randint(8,15), use_sin=True, rng=rng)
     else:
         for y in range(ny):
-            if random.random() < 0.1:
-                place_mountain_blob(grid, size=random.randint(8,15), use_sin=True)
+            if rng.random() < 0.1:
+                place_mountain_blob(grid, size=rng.randint(8,15), use_sin=True, rng=rng)
 
-def place_mountain_blob(grid, size=10, use_sin=False):
+def place_mountain_blob(grid, size=10, use_sin=False, rng=random):
     nx = len(grid[0])
     ny = len(grid)
-    cx = random.randint(5, max(5, nx-5))
-    cy = random.randint(5, max(5, ny-5))
+    cx = rng.randint(5, max(5, nx-5))
+    cy = rng.randint(5, max(5, ny-5))
     frontier = [(cx, cy)]
     used = set()
     used.add((cx, cy))
@@ -63,18 +89,18 @@ def place_mountain_blob(grid, size=10, use_sin=False):
         x, y = frontier.pop()
         directions = [(1,0),(0,1),(-1,0),(0,-1)]
         if use_sin:
-            random.shuffle(directions)
+            rng.shuffle(directions)
         for (dx, dy) in directions:
             nx_ = x+dx
             ny_ = y+dy
-            if in_bounds(nx_, ny_):
+            if in_grid(grid, nx_, ny_):
                 if (nx_, ny_) not in used:
-                    if random.random() < 0.8:
+                    if rng.random() < 0.8:
                         used.add((nx_, ny_))
                         frontier.append((nx_, ny_))
                         grid[ny_][nx_] = T_MOUNTAIN
 
-def add_lakes(grid, count=3):
+def add_lakes(grid, count=3, rng=random):
     nx = len(grid[0])
     ny = len(grid)
     for _ in range(count):
@@ -84,10 +110,10 @@ def add_lakes(grid, count=3):
         right = max(10, nx-10)
         top = 10
         bottom = max(10, ny-10)
-        cx = random.randint(left, right)
-        cy = random.randint(top, bottom)
-        rx = random.randint(3,8)
-        ry = random.randint(3,8)
+        cx = rng.randint(left, right)
+        cy = rng.randint(top, bottom)
+        rx = rng.randint(3,8)
+        ry = rng.randint(3,8)
         for y in range(ny):
             for x in range(nx):
                 dx = x - cx
@@ -95,40 +121,16 @@ def add_lakes(grid, count=3):
                 if (dx*dx)/(rx*rx) + (dy*dy)/(ry*ry) <= 1.0:
                     grid[y][x] = T_LAKE
 
-def ensure_at_least_one_large_lake(grid):
-    nx = len(grid[0])
-    ny = len(grid)
-    has_big = False
-    for y in range(ny):
-        for x in range(nx):
-            if grid[y][x] == T_LAKE:
-                cnt = 0
-                frontier = [(x,y)]
-                used = {(x,y)}
-                while frontier:
-                    cx,cy = frontier.pop()
-                    cnt += 1
-                    for (dx,dy) in [(1,0),(0,1),(-1,0),(0,-1)]:
-                        nx_ = cx+dx
-                        ny_ = cy+dy
-                        if in_bounds(nx_, ny_):
-                            if (nx_,ny_) not in used:
-                                if grid[ny_][nx_] == T_LAKE:
-                                    used.add((nx_, ny_))
-                                    frontier.append((nx_, ny_))
-                if cnt > 25:
-                    has_big = True
-                    break
-        if has_big:
-            break
-    if not has_big:
-        place_lake_blob(grid, size=40)
+def ensure_at_least_one_large_lake(grid, rng=random):
+    lakes = label_terrain(grid, include=(T_LAKE,))
+    if not any(size > 25 for size in lakes.sizes):
+        place_lake_blob(grid, size=40, rng=rng)
 
-def place_lake_blob(grid, size=40):
+def place_lake_blob(grid, size=40, rng=random):
     nx = len(grid[0])
     ny = len(grid)
-    cx = random.randint(10, max(10,nx-10))
-    cy = random.randint(10, max(10,ny-10))
+    cx = rng.randint(10, max(10,nx-10))
+    cy = rng.randint(10, max(10,ny-10))
     frontier = [(cx,cy)]
     used = {(cx,cy)}
     grid[cy][cx] = T_LAKE
@@ -136,36 +138,36 @@ def place_lake_blob(grid, size=40):
     while frontier and len(used) < size:
         x,y = frontier.pop()
         directions = [(1,0),(-1,0),(0,1),(0,-1)]
-        random.shuffle(directions)
+        rng.shuffle(directions)
         for dx,dy in directions:
             nx_ = x+dx
             ny_ = y+dy
-            if in_bounds(nx_, ny_):
+            if in_grid(grid, nx_, ny_):
                 if (nx_,ny_) not in used:
                     if grid[ny_][nx_]==T_PLAIN:
                         used.add((nx_,ny_))
                         frontier.append((nx_,ny_))
                         grid[ny_][nx_] = T_LAKE
 
-def add_rivers_forked(grid, min_count=1, max_count=2):
-    nb = random.randint(min_count,max_count)
+def add_rivers_forked(grid, min_count=1, max_count=2, rng=random):
+    nb = rng.randint(min_count,max_count)
     for _ in range(nb):
-        create_river_fork(grid)
+        create_river_fork(grid, rng=rng)
 
-def create_river_fork(grid):
+def create_river_fork(grid, rng=random):
     nx = len(grid[0])
     ny = len(grid)
     path = []
-    start_x = random.randint(0, nx-1)
+    start_x = rng.randint(0, nx-1)
     x = start_x
     y = 0
     w = 1
     while y < ny:
         path.append((x,y))
-        if random.random()<0.7:
+        if rng.random()<0.7:
             y += 1
         else:
-            x += random.choice([-1,1])
+            x += rng.choice([-1,1])
             x = max(0, min(nx-1,x))
         if len(path)>100:
             break
@@ -174,7 +176,7 @@ def create_river_fork(grid):
             for dy in range(-w, w+1):
                 nx_ = rx+dx
                 ny_ = ry+dy
-                if in_bounds(nx_, ny_):
+                if in_grid(grid, nx_, ny_):
                     grid[ny_][nx_] = T_RIVER
     fork_points = []
     step = len(path)//3 + 1
@@ -182,35 +184,35 @@ def create_river_fork(grid):
         if i < len(path):
             fork_points.append(path[i])
     for fpt in fork_points:
-        if random.random()<0.5:
+        if rng.random()<0.5:
             fx,fy = fpt
-            create_small_river_branch(grid, fx, fy)
+            create_small_river_branch(grid, fx, fy, rng=rng)
 
     riv=[]
     for j in range(ny):
         for i in range(nx):
             if grid[j][i]==T_RIVER:
                 riv.append((i,j))
-    random.shuffle(riv)
+    rng.shuffle(riv)
     if riv:
         bx,by=riv.pop()
         grid[by][bx] = T_BRIDGE
 
-def create_small_river_branch(grid, sx, sy):
+def create_small_river_branch(grid, sx, sy, rng=random):
     nx = len(grid[0])
     ny = len(grid)
     x = sx
     y = sy
-    for _ in range(random.randint(5,30)):
+    for _ in range(rng.randint(5,30)):
         grid[y][x] = T_RIVER
         dirs = [(1,0),(0,1),(-1,0),(0,-1)]
-        d = random.choice(dirs)
+        d = rng.choice(dirs)
         x += d[0]
         y += d[1]
         x = max(0, min(nx-1,x))
         y = max(0, min(ny-1,y))
 
-def add_forests_in_blobs(grid, ratio=0.20):
+def add_forests_in_blobs(grid, ratio=0.20, rng=random):
     nx = len(grid[0])
     ny = len(grid)
     area = nx*ny
@@ -220,19 +222,19 @@ def add_forests_in_blobs(grid, ratio=0.20):
     if approx_count>25:
         approx_count=25
     for _ in range(approx_count):
-        place_forest_blob(grid)
+        place_forest_blob(grid, rng=rng)
 
-def place_forest_blob(grid):
+def place_forest_blob(grid, rng=random):
     nx = len(grid[0])
     ny = len(grid)
-    sizeW = random.randint(3,10)
-    sizeH = random.randint(5,15)
-    size = random.randint(sizeW, sizeW*sizeH)
+    sizeW = rng.randint(3,10)
+    sizeH = rng.randint(5,15)
+    size = rng.randint(sizeW, sizeW*sizeH)
     tries=0
     while tries<100:
         tries+=1
-        sx = random.randint(0, nx-1)
-        sy = random.randint(0, ny-1)
+        sx = rng.randint(0, nx-1)
+        sy = rng.randint(0, ny-1)
         if grid[sy][sx]==T_PLAIN:
             fill_forest_blob(grid, sx, sy, size)
             break
@@ -250,34 +252,15 @@ def fill_forest_blob(grid, sx, sy, max_size):
         for (dx,dy) in [(1,0),(-1,0),(0,1),(0,-1)]:
             nx_ = x+dx
             ny_ = y+dy
-            if in_bounds(nx_, ny_):
+            if in_grid(grid, nx_, ny_):
                 if (nx_,ny_) not in used:
                     if grid[ny_][nx_]==T_PLAIN:
                         used.add((nx_, ny_))
                         grid[ny_][nx_] = T_FOREST
                         frontier.append((nx_, ny_))
 
-def ensure_minimum_forest(grid, min_blobs=2):
-    nx=len(grid[0])
-    ny=len(grid)
-    count_forest = 0
-    visited=set()
-    for y in range(ny):
-        for x in range(nx):
-            if grid[y][x]==T_FOREST and (x,y) not in visited:
-                count_forest+=1
-                stack=[(x,y)]
-                visited.add((x,y))
-                while stack:
-                    cx,cy=stack.pop()
-                    for (dx,dy) in [(1,0),(-1,0),(0,1),(0,-1)]:
-                        nx_=cx+dx
-                        ny_=cy+dy
-                        if in_bounds(nx_, ny_):
-                            if (nx_,ny_) not in visited:
-                                if grid[ny_][nx_]==T_FOREST:
-                                    visited.add((nx_,ny_))
-                                    stack.append((nx_,ny_))
+def ensure_minimum_forest(grid, min_blobs=2, rng=random):
+    count_forest = label_terrain(grid, include=(T_FOREST,)).count
     if count_forest<min_blobs:
         for _ in range(min_blobs-count_forest):
-            place_forest_blob(grid)
+            place_forest_blob(grid, rng=rng)
@@ -0,0 +1,269 @@
+# Engineering/generation_np.py
+
+import random
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel: seul ce module en a besoin
+    np = None
+
+from .consts import (
+    T_RIVER, T_PLAIN, T_FOREST,
+    T_MOUNTAIN, T_BRIDGE, T_LAKE
+)
+from .generation import make_rng
+
+# À incrémenter si la génération change (invalide le cache de maps)
+GENERATOR_VERSION = "numpy-1"
+
+DIRS_4 = [(1,0),(0,1),(-1,0),(0,-1)]
+
+def generate_map_np(nx, ny, seed=None, rng=None):
+    """
+    Même génération que generation.generate_map (mêmes étapes, mêmes
+    paramètres, même distribution), mais sur un tableau NumPy uint8 (ny, nx):
+    - lacs : masques d'ellipse par broadcasting sur leur seul rectangle
+    - rivières : tracé creusé par tableaux d'indices
+    - tests "grand lac" / "nb de forêts" : composantes étiquetées sur les
+      seules tuiles concernées, sans parcourir la grille en Python
+    Les blobs (montagnes, forêts, petits lacs) restent une croissance
+    tuile par tuile: ils font au plus quelques centaines de tuiles.
+
+    Contrairement à generate_map, les bornes sont celles de la grille
+    (et non NX/NY globaux): les reliefs couvrent toute la carte.
+    grid.tolist() redonne une grille liste de listes.
+    'seed' / 'rng' : comme generate_map (même graine => même map, mais pas
+    la même que celle de generate_map).
+    """
+    if np is None:
+        raise ImportError("generate_map_np nécessite NumPy (pip install numpy)")
+    rng = make_rng(seed, rng)
+    grid = np.full((ny, nx), T_PLAIN, dtype=np.uint8)
+    add_mountains_with_20pct_sin(grid, count=5, rng=rng)
+    if not (grid == T_MOUNTAIN).any():
+        place_mountain_blob(grid, size=rng.randint(15,30), use_sin=False, rng=rng)
+    ensure_scenic_mountain_border(grid, rng=rng)
+    add_lakes(grid, count=3, rng=rng)
+    ensure_at_least_one_large_lake(grid, rng=rng)
+    add_rivers_forked(grid, min_count=1, max_count=2, rng=rng)
+    add_forests_in_blobs(grid, ratio=0.20, rng=rng)
+    ensure_minimum_forest(grid, min_blobs=2, rng=rng)
+    return grid
+
+def component_sizes(mask):
+    """
+    Tailles des composantes 4-connexes de 'mask' (booléen 2D), sans boucle
+    Python par tuile et sans repasser sur toute la grille après np.flatnonzero:
+    1) segments horizontaux (runs) de tuiles vraies consécutives
+    2) paires de runs qui se touchent verticalement (np.searchsorted de
+       la tuile du dessous parmi les tuiles vraies)
+    3) union-find vectorisé sur ces paires: accrochage à la plus petite
+       racine (np.minimum.at) + compression de chemins, jusqu'à stabilité
+    4) tailles = nombre de tuiles par racine (np.bincount)
+    """
+    nx = mask.shape[1]
+    flat = np.flatnonzero(mask)
+    if len(flat) == 0:
+        return []
+    new_run = np.ones(len(flat), dtype=bool)
+    new_run[1:] = (flat[1:] != flat[:-1] + 1) | (flat[1:] % nx == 0)
+    run = np.cumsum(new_run) - 1
+    n = int(run[-1]) + 1
+
+    below = flat + nx
+    j = np.minimum(np.searchsorted(flat, below), len(flat) - 1)
+    hit = flat[j] == below
+    a = run[hit]
+    b = run[j[hit]]
+
+    parent = np.arange(n)
+    while len(a):
+        pa = parent[a]
+        pb = parent[b]
+        low = np.minimum(pa, pb)
+        np.minimum.at(parent, pa, low)
+        np.minimum.at(parent, pb, low)
+        while True:
+            up = parent[parent]
+            if np.array_equal(up, parent):
+                break
+            parent = up
+        keep = parent[a] != parent[b]
+        a = a[keep]
+        b = b[keep]
+    sizes = np.bincount(parent[run], minlength=n)
+    return sizes[parent == np.arange(n)].tolist()
+
+def add_mountains_with_20pct_sin(grid, count=5, rng=random):
+    for _ in range(count):
+        use_sin = (rng.random() < 0.2)
+        place_mountain_blob(grid, size=rng.randint(15,30), use_sin=use_sin, rng=rng)
+
+def ensure_scenic_mountain_border(grid, rng=random):
+    ny, nx = grid.shape
+    if rng.random() < 0.5:
+        n = nx
+    else:
+        n = ny
+    for _ in range(n):
+        if rng.random() < 0.1:
+            place_mountain_blob(grid, size=rng.randint(8,15), use_sin=True, rng=rng)
+
+def place_mountain_blob(grid, size=10, use_sin=False, rng=random):
+    ny, nx = grid.shape
+    cx = min(nx-1, rng.randint(5, max(5, nx-5)))
+    cy = min(ny-1, rng.randint(5, max(5, ny-5)))
+    frontier = [(cx, cy)]
+    used = {(cx, cy)}
+    grid[cy, cx] = T_MOUNTAIN
+
+    while frontier and len(used) < size:
+        x, y = frontier.pop()
+        directions = list(DIRS_4)
+        if use_sin:
+            rng.shuffle(directions)
+        for (dx, dy) in directions:
+            nx_ = x+dx
+            ny_ = y+dy
+            if 0 <= nx_ < nx and 0 <= ny_ < ny and (nx_, ny_) not in used:
+                if rng.random() < 0.8:
+                    used.add((nx_, ny_))
+                    frontier.append((nx_, ny_))
+                    grid[ny_, nx_] = T_MOUNTAIN
+
+def add_lakes(grid, count=3, rng=random):
+    ny, nx = grid.shape
+    for _ in range(count):
+        if nx < 20 or ny < 20:
+            return
+        cx = rng.randint(10, max(10, nx-10))
+        cy = rng.randint(10, max(10, ny-10))
+        rx = rng.randint(3,8)
+        ry = rng.randint(3,8)
+        # L'ellipse tient dans [cx-rx, cx+rx] x [cy-ry, cy+ry]
+        x0 = max(0, cx-rx)
+        x1 = min(nx, cx+rx+1)
+        y0 = max(0, cy-ry)
+        y1 = min(ny, cy+ry+1)
+        dx = np.arange(x0, x1) - cx
+        dy = np.arange(y0, y1) - cy
+        inside = (dx*dx)[None, :]/(rx*rx) + (dy*dy)[:, None]/(ry*ry) <= 1.0
+        grid[y0:y1, x0:x1][inside] = T_LAKE
+
+def ensure_at_least_one_large_lake(grid, rng=random):
+    if not any(s > 25 for s in component_sizes(grid == T_LAKE)):
+        place_lake_blob(grid, size=40, rng=rng)
+
+def place_lake_blob(grid, size=40, rng=random):
+    ny, nx = grid.shape
+    cx = min(nx-1, rng.randint(10, max(10, nx-10)))
+    cy = min(ny-1, rng.randint(10, max(10, ny-10)))
+    frontier = [(cx, cy)]
+    used = {(cx, cy)}
+    grid[cy, cx] = T_LAKE
+
+    while frontier and len(used) < size:
+        x, y = frontier.pop()
+        directions = [(1,0),(-1,0),(0,1),(0,-1)]
+        rng.shuffle(directions)
+        for dx, dy in directions:
+            nx_ = x+dx
+            ny_ = y+dy
+            if 0 <= nx_ < nx and 0 <= ny_ < ny and (nx_, ny_) not in used:
+                if grid[ny_, nx_] == T_PLAIN:
+                    used.add((nx_, ny_))
+                    frontier.append((nx_, ny_))
+                    grid[ny_, nx_] = T_LAKE
+
+def add_rivers_forked(grid, min_count=1, max_count=2, rng=random):
+    nb = rng.randint(min_count, max_count)
+    for _ in range(nb):
+        create_river_fork(grid, rng=rng)
+
+def create_river_fork(grid, rng=random):
+    ny, nx = grid.shape
+    path = []
+    x = rng.randint(0, nx-1)
+    y = 0
+    w = 1
+    while y < ny:
+        path.append((x, y))
+        if rng.random() < 0.7:
+            y += 1
+        else:
+            x += rng.choice([-1,1])
+            x = max(0, min(nx-1, x))
+        if len(path) > 100:
+            break
+
+    # Lit de largeur 2w+1: tracé + décalages, creusés en une affectation
+    off = np.arange(-w, w+1)
+    px = np.array([p[0] for p in path])
+    py = np.array([p[1] for p in path])
+    xs = (px[:, None, None] + off[None, :, None]).repeat(len(off), axis=2).ravel()
+    ys = (py[:, None, None] + off[None, None, :]).repeat(len(off), axis=1).ravel()
+    ok = (xs >= 0) & (xs < nx) & (ys >= 0) & (ys < ny)
+    grid[ys[ok], xs[ok]] = T_RIVER
+
+    step = len(path)//3 + 1
+    for i in range(len(path)//3, len(path), step):
+        if rng.random() < 0.5:
+            fx, fy = path[i]
+            create_small_river_branch(grid, fx, fy, rng=rng)
+
+    # Pont sur une tuile de rivière tirée uniformément
+    riv = np.flatnonzero(grid == T_RIVER)
+    if riv.size:
+        grid.flat[riv[rng.randrange(riv.size)]] = T_BRIDGE
+
+def create_small_river_branch(grid, sx, sy, rng=random):
+    ny, nx = grid.shape
+    x = sx
+    y = sy
+    for _ in range(rng.randint(5,30)):
+        grid[y, x] = T_RIVER
+        d = rng.choice(DIRS_4)
+        x = max(0, min(nx-1, x+d[0]))
+        y = max(0, min(ny-1, y+d[1]))
+
+def add_forests_in_blobs(grid, ratio=0.20, rng=random):
+    ny, nx = grid.shape
+    approx_count = int(nx*ny*ratio/50)
+    approx_count = max(2, min(25, approx_count))
+    for _ in range(approx_count):
+        place_forest_blob(grid, rng=rng)
+
+def place_forest_blob(grid, rng=random):
+    ny, nx = grid.shape
+    sizeW = rng.randint(3,10)
+    sizeH = rng.randint(5,15)
+    size = rng.randint(sizeW, sizeW*sizeH)
+    for _ in range(100):
+        sx = rng.randint(0, nx-1)
+        sy = rng.randint(0, ny-1)
+        if grid[sy, sx] == T_PLAIN:
+            fill_forest_blob(grid, sx, sy, size)
+            break
+
+def fill_forest_blob(grid, sx, sy, max_size):
+    ny, nx = grid.shape
+    frontier = deque([(sx, sy)])
+    used = {(sx, sy)}
+    grid[sy, sx] = T_FOREST
+
+    while frontier and len(used) < max_size:
+        x, y = frontier.popleft()
+        for (dx, dy) in [(1,0),(-1,0),(0,1),(0,-1)]:
+            nx_ = x+dx
+            ny_ = y+dy
+            if 0 <= nx_ < nx and 0 <= ny_ < ny and (nx_, ny_) not in used:
+                if grid[ny_, nx_] == T_PLAIN:
+                    used.add((nx_, ny_))
+                    grid[ny_, nx_] = T_FOREST
+                    frontier.append((nx_, ny_))
+
+def ensure_minimum_forest(grid, min_blobs=2, rng=random):
+    count_forest = len(component_sizes(grid == T_FOREST))
+    for _ in range(min_blobs - count_forest):
+        place_forest_blob(grid, rng=rng)
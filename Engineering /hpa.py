@@ -0,0 +1,360 @@
+# Engineering/hpa.py
+
+import heapq
+from .consts import TILE_SIZE, T_MOUNTAIN
+from .pathfinding import (
+    TERRAIN_COST, SQRT2, DIRECTIONS_8,
+    mountain_layer, invalidate_mountain_cache, free_components,
+    clearance_offsets,
+    astar_search, octile, simplify_path
+)
+
+CLUSTER_SIZE = 16
+# Au-delà de cette longueur, un segment d'entrée donne 2 transitions (aux bouts)
+ENTRANCE_SPLIT = 6
+
+class ClusterGraph:
+    """
+    Pathfinding hiérarchique (HPA*) au-dessus de Engineering/pathfinding.py.
+
+    La grille est découpée en clusters carrés de 'cluster_size' tuiles.
+    Une fois (après generate_map) on calcule:
+      - les entrées sur chaque frontière entre clusters voisins
+      - les distances intra-cluster entre entrées (Dijkstra local)
+    Une requête longue se résout sur ce graphe abstrait, puis chaque arête
+    est raffinée par un A* restreint au cluster concerné.
+
+    Seuls les obstacles statiques (montagnes + marge) sont pris en compte;
+    update_tile() n'invalide que les clusters autour de la tuile modifiée.
+    """
+    def __init__(self, grid, cluster_size=CLUSTER_SIZE, mountain_margin_px=16):
+        self.grid = grid
+        self.cs = cluster_size
+        self.mountain_margin_px = mountain_margin_px
+        self.mountain_offsets = clearance_offsets(mountain_margin_px)
+        self.tile_margin = max(abs(dx) for (dx, _) in self.mountain_offsets)
+        self.ny = len(grid)
+        self.nx = len(grid[0])
+        self.ncx = (self.nx + self.cs - 1) // self.cs
+        self.ncy = (self.ny + self.cs - 1) // self.cs
+
+        # Copie privée: update_tile() la modifie localement
+        self.blocked = [list(row) for row in mountain_layer(grid, mountain_margin_px)]
+        # Composantes des tuiles libres (recalculées après update_tile)
+        self.reach = None
+
+        self.borders = {}      # (cidA, cidB) -> [(tuile_A, tuile_B), ...]
+        self.transitions = {}  # tuile -> {tuile voisine dans l'autre cluster}
+        self.nodes = {}        # cid -> {tuiles d'entrée}
+        self.intra = {}        # cid -> {tuile: [(tuile2, coût), ...]}
+
+        for cy in range(self.ncy):
+            for cx in range(self.ncx):
+                if cx+1 < self.ncx:
+                    self._build_border((cx, cy), (cx+1, cy))
+                if cy+1 < self.ncy:
+                    self._build_border((cx, cy), (cx, cy+1))
+        for cy in range(self.ncy):
+            for cx in range(self.ncx):
+                self._rebuild_cluster((cx, cy))
+
+    # --- géométrie --------------------------------------------------------
+
+    def cluster_of(self, x, y):
+        return (x // self.cs, y // self.cs)
+
+    def cluster_bounds(self, cid):
+        x0 = cid[0]*self.cs
+        y0 = cid[1]*self.cs
+        return (x0, y0, min(self.nx, x0+self.cs) - 1, min(self.ny, y0+self.cs) - 1)
+
+    def neighbours(self, cid):
+        (cx, cy) = cid
+        for (dx, dy) in [(1,0),(-1,0),(0,1),(0,-1)]:
+            if 0 <= cx+dx < self.ncx and 0 <= cy+dy < self.ncy:
+                yield (cx+dx, cy+dy)
+
+    def step_cost(self, x, y):
+        return TERRAIN_COST.get(self.grid[y][x], 1.0)
+
+    # --- construction -----------------------------------------------------
+
+    def _build_border(self, a, b):
+        """
+        Entrées entre les clusters adjacents a (gauche/haut) et b.
+        Un segment libre des deux côtés => 1 transition au milieu,
+        ou 2 (aux extrémités) s'il est long.
+        """
+        key = (a, b)
+        for (ta, tb) in self.borders.get(key, []):
+            self.transitions.get(ta, set()).discard(tb)
+            self.transitions.get(tb, set()).discard(ta)
+
+        (ax0, ay0, ax1, ay1) = self.cluster_bounds(a)
+        if b[0] != a[0]:
+            # Frontière verticale: colonne ax1 | ax1+1
+            pairs = [((ax1, y), (ax1+1, y)) for y in range(ay0, ay1+1)]
+        else:
+            # Frontière horizontale: ligne ay1 / ay1+1
+            pairs = [((x, ay1), (x, ay1+1)) for x in range(ax0, ax1+1)]
+
+        trans = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None:
+                (ta, tb) = pair
+                if not self.blocked[ta[1]][ta[0]] and not self.blocked[tb[1]][tb[0]]:
+                    run.append(pair)
+                    continue
+            if run:
+                if len(run) < ENTRANCE_SPLIT:
+                    trans.append(run[len(run)//2])
+                else:
+                    trans.append(run[0])
+                    trans.append(run[-1])
+                run = []
+
+        self.borders[key] = trans
+        for (ta, tb) in trans:
+            self.transitions.setdefault(ta, set()).add(tb)
+            self.transitions.setdefault(tb, set()).add(ta)
+
+    def _rebuild_cluster(self, cid):
+        """Recalcule les entrées du cluster et leurs distances internes."""
+        (cx, cy) = cid
+        nodes = set()
+        for key in [((cx-1, cy), cid), (cid, (cx+1, cy)),
+                    ((cx, cy-1), cid), (cid, (cx, cy+1))]:
+            for (ta, tb) in self.borders.get(key, []):
+                nodes.add(ta if key[0] == cid else tb)
+        self.nodes[cid] = nodes
+
+        bounds = self.cluster_bounds(cid)
+        edges = {}
+        for n in nodes:
+            dist = self._dijkstra(n, bounds, nodes)
+            edges[n] = [(m, c) for (m, c) in dist.items() if m != n]
+        self.intra[cid] = edges
+
+    def _dijkstra(self, src, bounds, targets, reverse=False):
+        """
+        Dijkstra 8 directions limité à 'bounds', pondéré comme astar_search.
+        Retourne {cible: coût} pour les cibles atteintes.
+        reverse=True => coûts des chemins cible -> src.
+        """
+        (bx0, by0, bx1, by1) = bounds
+        blocked = self.blocked
+        grid = self.grid
+        steps = [(dx, dy, SQRT2 if dx and dy else 1.0) for (dx, dy) in DIRECTIONS_8]
+        dist = {src: 0.0}
+        done = set()
+        found = {}
+        remaining = len(targets)
+        heap = [(0.0, src)]
+        while heap and remaining:
+            d, cur = heapq.heappop(heap)
+            if cur in done:
+                continue
+            done.add(cur)
+            if cur in targets:
+                found[cur] = d
+                remaining -= 1
+            (cx, cy) = cur
+            # Coût du pas = entrée dans la tuile d'arrivée (cur en sens inverse)
+            rev_cost = TERRAIN_COST.get(grid[cy][cx], 1.0)
+            for (dx, dy, length) in steps:
+                nx_ = cx+dx
+                ny_ = cy+dy
+                if bx0 <= nx_ <= bx1 and by0 <= ny_ <= by1:
+                    if blocked[ny_][nx_] or (nx_, ny_) in done:
+                        continue
+                    if reverse:
+                        nd = d + length*rev_cost
+                    else:
+                        nd = d + length*TERRAIN_COST.get(grid[ny_][nx_], 1.0)
+                    if nd < dist.get((nx_, ny_), float('inf')):
+                        dist[(nx_, ny_)] = nd
+                        heapq.heappush(heap, (nd, (nx_, ny_)))
+        return found
+
+    # --- invalidation locale ----------------------------------------------
+
+    def update_tile(self, x, y, terrain=None):
+        """
+        Signale la modification de la tuile (x, y) (ex: pont détruit).
+        Si 'terrain' est fourni, la grille est mise à jour.
+        Seuls les clusters touchés par la marge autour de la tuile sont recalculés.
+        """
+        if terrain is not None:
+            self.grid[y][x] = terrain
+        invalidate_mountain_cache(self.grid)
+
+        # Recalcule localement la couche montagnes dilatées
+        m = self.tile_margin
+        x0, x1 = max(0, x-m), min(self.nx-1, x+m)
+        y0, y1 = max(0, y-m), min(self.ny-1, y+m)
+        for yy in range(y0, y1+1):
+            for xx in range(x0, x1+1):
+                self.blocked[yy][xx] = self._has_mountain_near(xx, yy)
+        self.reach = None
+
+        # Clusters touchés (+1 tuile pour les frontières)
+        dirty = set()
+        for yy in (max(0, y0-1), min(self.ny-1, y1+1)):
+            for xx in (max(0, x0-1), min(self.nx-1, x1+1)):
+                dirty.add(self.cluster_of(xx, yy))
+        cx0 = min(c[0] for c in dirty)
+        cx1 = max(c[0] for c in dirty)
+        cy0 = min(c[1] for c in dirty)
+        cy1 = max(c[1] for c in dirty)
+        dirty = {(cx, cy) for cx in range(cx0, cx1+1) for cy in range(cy0, cy1+1)}
+
+        for cid in dirty:
+            for nb in self.neighbours(cid):
+                key = (cid, nb) if (nb[0] > cid[0] or nb[1] > cid[1]) else (nb, cid)
+                self._build_border(key[0], key[1])
+        rebuild = set(dirty)
+        for cid in dirty:
+            rebuild.update(self.neighbours(cid))
+        for cid in rebuild:
+            self._rebuild_cluster(cid)
+
+    def _has_mountain_near(self, x, y):
+        # Même disque de dégagement que mountain_layer
+        for (dx, dy) in self.mountain_offsets:
+            xx = x+dx
+            yy = y+dy
+            if 0 <= xx < self.nx and 0 <= yy < self.ny and self.grid[yy][xx] == T_MOUNTAIN:
+                return True
+        return False
+
+    # --- requêtes ---------------------------------------------------------
+
+    def abstract_edges(self, tile):
+        cid = self.cluster_of(tile[0], tile[1])
+        edges = list(self.intra[cid].get(tile, []))
+        for other in self.transitions.get(tile, ()):
+            edges.append((other, self.step_cost(other[0], other[1])))
+        return edges
+
+    def find_path(self, start_tile, goal_tile, stats=None):
+        """
+        Chemin any-angle de start_tile à goal_tile, même format que
+        find_path_any_angle (tuiles simplifiées, sans la tuile de départ).
+        """
+        (sx, sy) = start_tile
+        (gx, gy) = goal_tile
+        if not (0 <= sx < self.nx and 0 <= sy < self.ny):
+            return []
+        if not (0 <= gx < self.nx and 0 <= gy < self.ny):
+            return []
+        if start_tile == goal_tile:
+            return []
+        if self.blocked[sy][sx] or self.blocked[gy][gx]:
+            return []
+        if self.reach is None:
+            self.reach = free_components(self.blocked)
+        if not self.reach.same(start_tile, goal_tile):
+            return []
+
+        local_stats = {}
+        expanded = 0
+        scid = self.cluster_of(sx, sy)
+        gcid = self.cluster_of(gx, gy)
+
+        tiles = []
+        if scid == gcid:
+            tiles = astar_search(self.grid, self.blocked, start_tile, goal_tile,
+                                 local_stats, bounds=self.cluster_bounds(scid))
+            expanded += local_stats.get("expanded", 0)
+
+        if not tiles:
+            abstract = self._abstract_search(start_tile, goal_tile, scid, gcid)
+            if abstract is None:
+                if stats is not None:
+                    stats["expanded"] = expanded
+                return []
+            (nodes, exp) = abstract
+            (tiles, exp_local) = self._refine(nodes)
+            expanded += exp + exp_local
+
+        if stats is not None:
+            stats["expanded"] = expanded
+
+        px_path = [
+            (tx*TILE_SIZE + TILE_SIZE/2, ty*TILE_SIZE + TILE_SIZE/2)
+            for (tx, ty) in tiles
+        ]
+        px_path = simplify_path(px_path, self.blocked)
+        return [(int(px//TILE_SIZE), int(py//TILE_SIZE)) for (px, py) in px_path]
+
+    def _abstract_search(self, start_tile, goal_tile, scid, gcid):
+        """
+        A* sur le graphe abstrait, start et goal étant reliés temporairement
+        aux entrées de leur cluster. Retourne (noeuds, nb_développés) ou None.
+        """
+        start_edges = self._dijkstra(
+            start_tile, self.cluster_bounds(scid), self.nodes[scid])
+        goal_edges = self._dijkstra(
+            goal_tile, self.cluster_bounds(gcid), self.nodes[gcid], reverse=True)
+        if not start_edges or not goal_edges:
+            return None
+
+        (gx, gy) = goal_tile
+        g_score = {start_tile: 0.0}
+        parent = {start_tile: None}
+        closed = set()
+        heap = [(octile(start_tile[0], start_tile[1], gx, gy), start_tile)]
+        expanded = 0
+        while heap:
+            _, cur = heapq.heappop(heap)
+            if cur in closed:
+                continue
+            closed.add(cur)
+            expanded += 1
+            if cur == goal_tile:
+                nodes = []
+                while cur is not None:
+                    nodes.append(cur)
+                    cur = parent[cur]
+                nodes.reverse()
+                return (nodes, expanded)
+            if cur == start_tile:
+                edges = list(start_edges.items())
+            else:
+                edges = self.abstract_edges(cur)
+            if cur in goal_edges:
+                edges.append((goal_tile, goal_edges[cur]))
+            g_cur = g_score[cur]
+            for (nxt, c) in edges:
+                if nxt in closed:
+                    continue
+                g_new = g_cur + c
+                if g_new < g_score.get(nxt, float('inf')):
+                    g_score[nxt] = g_new
+                    parent[nxt] = cur
+                    heapq.heappush(heap, (g_new + octile(nxt[0], nxt[1], gx, gy), nxt))
+        return None
+
+    def _refine(self, nodes):
+        """
+        Raffine la suite de noeuds abstraits en tuiles: A* local dans le
+        cluster pour une arête intra, pas direct pour une transition.
+        Retourne (tuiles, nb_développés).
+        """
+        tiles = []
+        total = 0
+        for (a, b) in zip(nodes, nodes[1:]):
+            if a == b:
+                continue
+            ca = self.cluster_of(a[0], a[1])
+            cb = self.cluster_of(b[0], b[1])
+            if ca != cb:
+                tiles.append(b)
+                continue
+            seg_stats = {}
+            seg = astar_search(self.grid, self.blocked, a, b, seg_stats,
+                               bounds=self.cluster_bounds(ca))
+            total += seg_stats.get("expanded", 0)
+            tiles.extend(seg)
+        return (tiles, total)
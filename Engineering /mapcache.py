@@ -0,0 +1,53 @@
+# Engineering/mapcache.py
+
+import os
+
+from .generation import generate_map, GENERATOR_VERSION
+from .mapfile import load_map, save_map
+
+# Dossier du cache: variable d'environnement HOI4_MAP_CACHE, sinon ~/.cache
+MAP_CACHE_DIR = os.environ.get("HOI4_MAP_CACHE") or os.path.join(
+    os.path.expanduser("~"), ".cache", "hoi4_at_home", "maps")
+
+def _generator(name):
+    if name == "list":
+        return generate_map, GENERATOR_VERSION
+    if name == "numpy":
+        from . import generation_np
+        return generation_np.generate_map_np, generation_np.GENERATOR_VERSION
+    raise ValueError("générateur inconnu: %r (attendu 'list' ou 'numpy')" % (name,))
+
+def map_cache_path(seed, nx, ny, version, cache_dir=None):
+    """Fichier du cache pour la clé (seed, nx, ny, version)."""
+    name = "%s_%d_%dx%d.map" % (version, seed, nx, ny)
+    return os.path.join(cache_dir or MAP_CACHE_DIR, name)
+
+def cached_map(seed, nx, ny, generator="list", cache_dir=None):
+    """
+    Map de graine 'seed' (entier), lue depuis le cache disque si elle y est,
+    sinon générée puis enregistrée (format compact d'Engineering.mapfile).
+    La clé inclut la version du générateur: changer la génération invalide
+    le cache. Retourne le même type que le générateur ('list' => listes,
+    'numpy' => tableau uint8), modifiable sans toucher au cache.
+    """
+    gen, version = _generator(generator)
+    path = map_cache_path(seed, nx, ny, version, cache_dir)
+    try:
+        mf = load_map(path)
+    except (OSError, ValueError):
+        mf = None
+
+    if mf is not None:
+        with mf:
+            if (mf.nx, mf.ny, mf.seed) == (nx, ny, seed):
+                if generator == "numpy":
+                    return mf.array().copy()
+                return [list(row) for row in mf.grid]
+
+    grid = gen(nx, ny, seed=seed)
+    # Écriture atomique: un autre processus ne lit jamais un fichier partiel
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    save_map(tmp, grid, seed=seed)
+    os.replace(tmp, path)
+    return grid
@@ -0,0 +1,127 @@
+# Engineering/mapfile.py
+
+import mmap
+import re
+import struct
+
+# En-tête (little-endian, 40 octets):
+#   magic "H4MP", version, flags, réservé, nx, ny, seed,
+#   blue_cap (x, y), red_cap (x, y)
+MAGIC = b"H4MP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sBBHIIqIIII")
+
+FLAG_RLE = 1       # données compressées en (longueur, valeur)
+FLAG_SEED = 2      # champ seed renseigné
+
+_RUN = re.compile(rb"(.)\1{0,254}", re.S)
+
+class MapFile:
+    """
+    Map chargée par load_map.
+    - grid : lignes [y][x] (une memoryview par ligne, sans copie), utilisable
+      telle quelle par le pathfinding, la simulation et le rendu
+    - nx, ny, seed (None si inconnue), blue_cap, red_cap
+    """
+    def __init__(self, grid, nx, ny, seed, blue_cap, red_cap, buf, mm=None):
+        self.grid = grid
+        self.nx = nx
+        self.ny = ny
+        self.seed = seed
+        self.blue_cap = blue_cap
+        self.red_cap = red_cap
+        self._buf = buf
+        self._mmap = mm
+
+    def array(self):
+        """Vue NumPy uint8 (ny, nx) sur les mêmes octets (sans copie)."""
+        import numpy as np
+        return np.frombuffer(self._buf, dtype=np.uint8).reshape(self.ny, self.nx)
+
+    def close(self):
+        # Les lignes (memoryview) doivent être libérées avant le mmap
+        self.grid = None
+        self._buf = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # lignes encore référencées ailleurs: libéré par le GC
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def rle_encode(data):
+    """(longueur, valeur) par plage de tuiles identiques, longueur <= 255."""
+    return b"".join(bytes((len(m.group()), m.group()[0])) for m in _RUN.finditer(data))
+
+def rle_decode(data, size):
+    out = b"".join(data[i+1:i+2]*data[i] for i in range(0, len(data), 2))
+    if len(out) != size:
+        raise ValueError("données RLE corrompues (%d octets au lieu de %d)" % (len(out), size))
+    return bytearray(out)
+
+def save_map(path, grid, seed=None, blue_cap=(0, 0), red_cap=(0, 0), rle=False):
+    """
+    Écrit 'grid' (liste de listes, lignes d'octets ou tableau NumPy) au
+    format compact: un octet par tuile, éventuellement compressé en RLE.
+    """
+    ny = len(grid)
+    nx = len(grid[0])
+    data = b"".join(bytes(row) for row in grid)
+    flags = 0
+    if rle:
+        data = rle_encode(data)
+        flags |= FLAG_RLE
+    if seed is not None:
+        flags |= FLAG_SEED
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, flags, 0, nx, ny,
+        seed if seed is not None else 0,
+        blue_cap[0], blue_cap[1], red_cap[0], red_cap[1]
+    )
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(data)
+
+def load_map(path):
+    """
+    Charge une map écrite par save_map.
+
+    Format brut: le fichier est projeté en mémoire (mmap copy-on-write);
+    la grille est une vue sur ces pages, sans copie. Les processus qui
+    chargent le même fichier partagent ses pages tant qu'ils ne les
+    modifient pas (une écriture ne touche jamais le fichier).
+    Format RLE: décompressé en mémoire.
+    """
+    with open(path, "rb") as f:
+        head = f.read(HEADER.size)
+        if len(head) < HEADER.size:
+            raise ValueError("%s: fichier de map tronqué" % path)
+        (magic, version, flags, _, nx, ny, seed,
+         bx, by, rx, ry) = HEADER.unpack(head)
+        if magic != MAGIC:
+            raise ValueError("%s: pas un fichier de map (magic %r)" % (path, magic))
+        if version != FORMAT_VERSION:
+            raise ValueError("%s: version de format %d non supportée" % (path, version))
+        size = nx*ny
+        mm = None
+        if flags & FLAG_RLE:
+            buf = memoryview(rle_decode(f.read(), size))
+        else:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            if len(mm) - HEADER.size != size:
+                mm.close()
+                raise ValueError("%s: taille des données incohérente" % path)
+            buf = memoryview(mm)[HEADER.size:]
+
+    grid = [buf[y*nx:(y+1)*nx] for y in range(ny)]
+    return MapFile(
+        grid, nx, ny,
+        seed if flags & FLAG_SEED else None,
+        (bx, by), (rx, ry), buf, mm
+    )
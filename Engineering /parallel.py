@@ -0,0 +1,144 @@
+# Engineering/parallel.py
+
+import os
+import multiprocessing
+from multiprocessing import shared_memory, TimeoutError
+
+from .pathfinding import find_path_any_angle
+
+# État des processus workers (attaché une fois par worker, cf. _init_worker)
+_worker = {}
+
+def _shared_rows(shm, nx, ny, offset=0):
+    """
+    Lignes [y][x] sans copie: une tranche de memoryview par ligne,
+    directement sur les pages de la mémoire partagée.
+    """
+    buf = shm.buf
+    return [buf[offset + y*nx: offset + (y+1)*nx] for y in range(ny)]
+
+def _init_worker(shm_name, nx, ny, algorithm, exact_los):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker["shm"] = shm
+    _worker["grid"] = _shared_rows(shm, nx, ny)
+    _worker["blocked"] = _shared_rows(shm, nx, ny, offset=nx*ny)
+    _worker["algorithm"] = algorithm
+    _worker["exact_los"] = exact_los
+
+def _solve_chunk(job):
+    (first, queries) = job
+    grid = _worker["grid"]
+    blocked = _worker["blocked"]
+    return (first, [
+        find_path_any_angle(
+            grid, start, goal,
+            blocked_map=blocked,
+            algorithm=_worker["algorithm"],
+            exact_los=_worker["exact_los"]
+        )
+        for (start, goal) in queries
+    ])
+
+class PathBatch:
+    """
+    Lot de requêtes soumis au pool (ParallelPathSolver.submit).
+    Les tranches reviennent dans l'ordre où elles se terminent;
+    next_chunk() en lit une sans bloquer l'appelant (timeout=0).
+    """
+    def __init__(self, results, chunks):
+        self._results = results
+        self.remaining = chunks
+
+    @property
+    def done(self):
+        return self.remaining == 0
+
+    def next_chunk(self, timeout=0):
+        """
+        Prochaine tranche terminée: liste de (indice de la requête, chemin),
+        ou None si aucune ne l'est dans le délai ('timeout' en secondes,
+        None => attendre).
+        """
+        if self.remaining == 0:
+            return None
+        try:
+            (first, paths) = self._results.next(timeout)
+        except TimeoutError:
+            return None
+        self.remaining -= 1
+        return [(first + k, path) for (k, path) in enumerate(paths)]
+
+class ParallelPathSolver:
+    """
+    Résolution de lots de requêtes de chemin sur un pool de processus.
+
+    La grille et la blocked map (statiques) sont copiées une seule fois
+    dans un segment de mémoire partagée (1 octet par tuile chacune);
+    chaque worker s'y attache au démarrage et lit les tuiles sans copie.
+    Seules les requêtes (start, goal) et les chemins transitent par pickle.
+    Les résultats sont identiques à find_path_any_angle en série sur cette
+    blocked map statique.
+
+    - submit(queries) : envoie un lot sans attendre (PathBatch)
+    - solve(queries)  : envoie un lot et attend tous ses chemins
+
+    À fermer avec close() (ou via 'with').
+    """
+    def __init__(self, grid, blocked_map, workers=None,
+                 algorithm="astar", exact_los=False, chunk_size=16):
+        self.ny = len(grid)
+        self.nx = len(grid[0])
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+        n = self.nx*self.ny
+        self.shm = shared_memory.SharedMemory(create=True, size=2*n)
+        buf = self.shm.buf
+        for y in range(self.ny):
+            buf[y*self.nx:(y+1)*self.nx] = bytes(grid[y])
+            buf[n + y*self.nx: n + (y+1)*self.nx] = bytes(
+                1 if b else 0 for b in blocked_map[y])
+
+        self.pool = multiprocessing.Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(self.shm.name, self.nx, self.ny, algorithm, exact_los)
+        )
+
+    def submit(self, queries):
+        """
+        Envoie une liste de (start_tile, goal_tile) au pool par tranches de
+        'chunk_size' et retourne aussitôt un PathBatch (imap_unordered).
+        """
+        queries = [(tuple(s), tuple(g)) for (s, g) in queries]
+        jobs = [(i, queries[i:i+self.chunk_size])
+                for i in range(0, len(queries), self.chunk_size)]
+        return PathBatch(self.pool.imap_unordered(_solve_chunk, jobs), len(jobs))
+
+    def solve(self, queries):
+        """
+        Résout une liste de (start_tile, goal_tile); retourne les chemins
+        dans le même ordre.
+        """
+        results = [None]*len(queries)
+        batch = self.submit(queries)
+        while not batch.done:
+            for (i, path) in batch.next_chunk(timeout=None):
+                results[i] = path
+        return results
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
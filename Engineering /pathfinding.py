@@ -1,8 +1,20 @@
 # Engineering/pathfinding.py
 
 import math
+import heapq
 import collections
-from .consts import NX, NY, T_MOUNTAIN, TILE_SIZE
+from .consts import (
+    NX, NY, T_MOUNTAIN, TILE_SIZE,
+    T_DEEP_WATER, T_RIVER, T_LAKE, WATER_SLOW_FACTOR
+)
+from .components import label_mask
+
+# Coût d'entrée dans une tuile, inverse de la vitesse (cf. Unit.move_direct_line)
+TERRAIN_COST = {
+    T_DEEP_WATER: 1.0 / WATER_SLOW_FACTOR,
+    T_RIVER:      1.0 / WATER_SLOW_FACTOR,
+}
+SQRT2 = math.sqrt(2)
 
 def in_bounds(tx, ty):
     """
@@ -16,6 +28,174 @@ def distance(x1, y1, x2, y2):
     """
     return math.hypot(x2 - x1, y2 - y1)
 
+# Cache des couches "montagnes dilatées": le terrain est statique après
+# generate_map, on ne les calcule qu'une fois par (grille, marge).
+MOUNTAIN_CACHE_SIZE = 8
+_mountain_cache = collections.OrderedDict()
+_field_cache = collections.OrderedDict()
+INF = float('inf')
+
+def clearance_radius2(margin_px):
+    """
+    Rayon² (en tuiles², centre à centre) sous lequel une tuile est bloquée
+    par un obstacle: marge en pixels + demi-tuile (bord de l'obstacle).
+    """
+    r = margin_px / TILE_SIZE + 0.5
+    return r*r
+
+def clearance_offsets(margin_px):
+    """Décalages (dx, dy) du disque de dégagement de 'margin_px' pixels."""
+    r2 = clearance_radius2(margin_px)
+    m = int(math.sqrt(r2))
+    return [(dx, dy) for dy in range(-m, m+1) for dx in range(-m, m+1)
+            if dx*dx + dy*dy <= r2]
+
+def _edt_1d(f, n):
+    # Enveloppe inférieure des paraboles (Felzenszwalb & Huttenlocher):
+    # d[x] = min_q (x-q)² + f[q], en O(n). None si aucun f[q] fini.
+    sites = [q for q in range(n) if f[q] != INF]
+    if not sites:
+        return None
+    v = [sites[0]]
+    z = [-INF]
+    for q in sites[1:]:
+        fq = f[q] + q*q
+        while True:
+            p = v[-1]
+            s = (fq - (f[p] + p*p)) / (2*q - 2*p)
+            if s <= z[-1]:
+                v.pop()
+                z.pop()
+            else:
+                break
+        v.append(q)
+        z.append(s)
+    # Remplissage segment par segment: la parabole v[k] couvre z[k] < x <= z[k+1]
+    d = []
+    z.append(INF)
+    for k, p in enumerate(v):
+        lo = max(0, int(math.floor(z[k])) + 1) if k else 0
+        hi = min(n, int(math.floor(z[k+1])) + 1) if k+1 < len(v) else n
+        fp = f[p]
+        d += [(x-p)*(x-p) + fp for x in range(lo, hi)]
+    return d
+
+def mountain_distance_field(grid):
+    """
+    Transformée de distance euclidienne exacte aux montagnes, en cache par
+    grille: d2[y*nx+x] = distance² (en tuiles, centre à centre) à la tuile
+    montagne la plus proche (inf s'il n'y en a pas). Deux passes séparables
+    (colonnes puis lignes), O(nx*ny) quel que soit le nombre de montagnes.
+    """
+    key = id(grid)
+    entry = _field_cache.get(key)
+    if entry is not None and entry[0] is grid:
+        _field_cache.move_to_end(key)
+        return entry[1]
+
+    ny = len(grid)
+    nx = len(grid[0])
+    # Passe 1: distance verticale à la montagne la plus proche de la colonne,
+    # balayages haut->bas puis bas->haut (ligne par ligne)
+    g = [None]*ny
+    prev = [INF]*nx
+    for y in range(ny):
+        prev = g[y] = [0 if t == T_MOUNTAIN else p+1 for (t, p) in zip(grid[y], prev)]
+    prev = [INF]*nx
+    for y in range(ny-1, -1, -1):
+        prev = g[y] = [min(a, p+1) for (a, p) in zip(g[y], prev)]
+    # Passe 2: par ligne, enveloppe des paraboles (x-q)² + g[q]²
+    d2 = [INF]*(nx*ny)
+    for y in range(ny):
+        row = _edt_1d([v*v for v in g[y]], nx)
+        if row is not None:
+            d2[y*nx:(y+1)*nx] = row
+
+    _field_cache[key] = (grid, d2)
+    if len(_field_cache) > MOUNTAIN_CACHE_SIZE:
+        _field_cache.popitem(last=False)
+    return d2
+
+def mountain_layer(grid, mountain_margin_px=16):
+    """
+    Retourne la couche blocked[y][x] des tuiles à moins de la marge d'une
+    montagne (disque de dégagement, cf. clearance_radius2): simple seuil
+    sur mountain_distance_field, calculé une seule fois par grille, quelle
+    que soit la marge demandée. Mise en cache par (grille, marge).
+    Partagée: ne pas la modifier.
+    Appeler invalidate_mountain_cache(grid) si le terrain change.
+    """
+    key = (id(grid), mountain_margin_px)
+    entry = _mountain_cache.get(key)
+    if entry is not None and entry[0] is grid:
+        _mountain_cache.move_to_end(key)
+        return entry[1]
+
+    ny = len(grid)
+    nx = len(grid[0])
+    d2 = mountain_distance_field(grid)
+    r2 = clearance_radius2(mountain_margin_px)
+    layer = [[d <= r2 for d in d2[y*nx:(y+1)*nx]] for y in range(ny)]
+
+    # On garde une référence à la grille: l'id ne peut pas être réutilisé
+    _mountain_cache[key] = (grid, layer)
+    if len(_mountain_cache) > MOUNTAIN_CACHE_SIZE:
+        _mountain_cache.popitem(last=False)
+    return layer
+
+def invalidate_mountain_cache(grid=None):
+    """
+    Oublie les couches et index d'accessibilité en cache de 'grid'
+    (ou tous si grid est None).
+    """
+    for cache in (_mountain_cache, _field_cache, _reach_cache):
+        for key in list(cache):
+            if grid is None or cache[key][0] is grid:
+                del cache[key]
+
+def free_components(blocked_map, connectivity=8):
+    """Composantes connexes des tuiles libres d'une blocked map."""
+    ny = len(blocked_map)
+    nx = len(blocked_map[0])
+    mask = bytearray(nx*ny)
+    for y, row in enumerate(blocked_map):
+        base = y*nx
+        for x, b in enumerate(row):
+            if not b:
+                mask[base + x] = 1
+    return label_mask(mask, nx, ny, connectivity)
+
+# Index d'accessibilité (composantes des tuiles libres), même cache que
+# les couches montagnes: calculé une fois par (grille, marge, variante).
+_reach_cache = collections.OrderedDict()
+
+def reachability_index(grid, mountain_margin_px=16, lakes=False, connectivity=8):
+    """
+    Composantes (Engineering.components) des tuiles hors mountain_layer
+    (et hors lacs si 'lakes'). Deux tuiles de composantes différentes
+    n'ont aucun chemin: index.same(a, b) est faux => inutile de chercher.
+    - connectivity=8 : recherches 8 directions (A*, BFS, JPS, HPA*)
+    - connectivity=4 : champs de flux (pas de coin coupé)
+    Les unités ne sont pas prises en compte: elles ne font qu'ajouter des
+    obstacles, un "inaccessible" reste donc toujours vrai.
+    """
+    key = (id(grid), mountain_margin_px, lakes, connectivity)
+    entry = _reach_cache.get(key)
+    if entry is not None and entry[0] is grid:
+        _reach_cache.move_to_end(key)
+        return entry[1]
+
+    layer = mountain_layer(grid, mountain_margin_px)
+    if lakes:
+        layer = [[b or t == T_LAKE for (b, t) in zip(lrow, grow)]
+                 for (lrow, grow) in zip(layer, grid)]
+    index = free_components(layer, connectivity)
+
+    _reach_cache[key] = (grid, index)
+    if len(_reach_cache) > MOUNTAIN_CACHE_SIZE:
+        _reach_cache.popitem(last=False)
+    return index
+
 def build_blocked_map(grid, other_units, mountain_margin_px=16, unit_margin_px=16):
     """
     Construit une map 'blocked[y][x]' tenant compte d'une marge autour des montagnes
@@ -23,36 +203,119 @@ def build_blocked_map(grid, other_units, mountain_margin_px=16, unit_margin_px=1
 
     - mountain_margin_px : rayon en pixels à bloquer autour des montagnes.
     - unit_margin_px : rayon en pixels à bloquer autour des unités.
-    - Ne requiert aucune modification dans les autres scripts.
+    - La couche montagnes vient du cache (mountain_layer, seuil sur la
+      transformée de distance), seules les unités sont tamponnées à chaque
+      appel, avec le même disque de dégagement (clearance_offsets).
     """
     ny = len(grid)
     nx = len(grid[0])
-    blocked = [[False]*nx for _ in range(ny)]
-
-    tile_margin_mtn = int(math.ceil(mountain_margin_px / TILE_SIZE))
-    for ty in range(ny):
-        for tx in range(nx):
-            if grid[ty][tx] == T_MOUNTAIN:
-                for dy in range(-tile_margin_mtn, tile_margin_mtn+1):
-                    for dx in range(-tile_margin_mtn, tile_margin_mtn+1):
-                        xx = tx+dx
-                        yy = ty+dy
-                        if in_bounds(xx, yy):
-                            blocked[yy][xx] = True
-
-    tile_margin_unit = int(math.ceil(unit_margin_px / TILE_SIZE))
+    blocked = [list(row) for row in mountain_layer(grid, mountain_margin_px)]
+
+    offsets = clearance_offsets(unit_margin_px)
     for u in other_units:
         ux = int(u.x // TILE_SIZE)
         uy = int(u.y // TILE_SIZE)
-        for dy in range(-tile_margin_unit, tile_margin_unit+1):
-            for dx in range(-tile_margin_unit, tile_margin_unit+1):
-                xx = ux+dx
-                yy = uy+dy
-                if in_bounds(xx, yy):
-                    blocked[yy][xx] = True
+        for (dx, dy) in offsets:
+            xx = ux+dx
+            yy = uy+dy
+            if 0 <= xx < nx and 0 <= yy < ny:
+                blocked[yy][xx] = True
 
     return blocked
 
+class BlockedMap:
+    """
+    blocked[y][x] maintenu incrémentalement pour un même tick et de nombreuses
+    requêtes: couche montagnes en cache + empreintes d'unités en surcouche.
+
+    - update_units(units) : ne retamponne que les unités qui ont changé de tuile
+    - find_path(...)      : find_path_any_angle sur cette map, en retirant
+      temporairement l'empreinte des unités qui demandent le chemin
+
+    'static' : couche fixe sous les empreintes (non modifiée), par défaut
+    mountain_layer(grid, mountain_margin_px); la simulation y passe la map
+    de mouvement du PathService (montagnes + marge et lacs).
+    """
+    def __init__(self, grid, mountain_margin_px=16, unit_margin_px=16, static=None):
+        self.grid = grid
+        self.mountain_margin_px = mountain_margin_px
+        self.unit_margin_px = unit_margin_px
+        self.unit_offsets = clearance_offsets(unit_margin_px)
+        if static is None:
+            static = mountain_layer(grid, mountain_margin_px)
+        self.static = static
+        self.cells = [list(row) for row in self.static]
+        # Nb d'empreintes d'unités couvrant chaque tuile (creux)
+        self.counts = {}
+        self.footprint_of = {}
+
+    def _stamp(self, ux, uy, delta):
+        ny = len(self.cells)
+        nx = len(self.cells[0])
+        counts = self.counts
+        for (dx, dy) in self.unit_offsets:
+            xx = ux+dx
+            yy = uy+dy
+            if not (0 <= xx < nx and 0 <= yy < ny):
+                continue
+            c = counts.get((xx, yy), 0) + delta
+            if c > 0:
+                counts[(xx, yy)] = c
+                self.cells[yy][xx] = True
+            else:
+                counts.pop((xx, yy), None)
+                self.cells[yy][xx] = self.static[yy][xx]
+
+    def add_unit(self, unit):
+        tile = (int(unit.x // TILE_SIZE), int(unit.y // TILE_SIZE))
+        self.footprint_of[unit] = tile
+        self._stamp(tile[0], tile[1], +1)
+
+    def remove_unit(self, unit):
+        tile = self.footprint_of.pop(unit, None)
+        if tile is not None:
+            self._stamp(tile[0], tile[1], -1)
+
+    def update_units(self, units):
+        """
+        Met à jour la surcouche: seules les unités ayant changé de tuile
+        (ou apparues/disparues) sont retamponnées.
+        """
+        present = set()
+        for u in units:
+            present.add(u)
+            tile = (int(u.x // TILE_SIZE), int(u.y // TILE_SIZE))
+            old = self.footprint_of.get(u)
+            if old == tile:
+                continue
+            if old is not None:
+                self._stamp(old[0], old[1], -1)
+            self.footprint_of[u] = tile
+            self._stamp(tile[0], tile[1], +1)
+        for u in [u for u in self.footprint_of if u not in present]:
+            self.remove_unit(u)
+
+    def find_path(self, start_tile, goal_tile, unit=None,
+                  algorithm="astar", stats=None, units=(), exact_los=False):
+        """
+        Chemin any-angle sur cette map. 'unit' (ou toutes celles de 'units',
+        ex: les unités servies par une même requête) ne se bloque pas
+        elle-même: son empreinte est retirée le temps de la recherche.
+        """
+        own = [self.footprint_of[u] for u in ((unit,) if unit is not None else ()) + tuple(units)
+               if u in self.footprint_of]
+        for tile in own:
+            self._stamp(tile[0], tile[1], -1)
+        try:
+            return find_path_any_angle(
+                self.grid, start_tile, goal_tile,
+                algorithm=algorithm, stats=stats,
+                blocked_map=self.cells, exact_los=exact_los
+            )
+        finally:
+            for tile in own:
+                self._stamp(tile[0], tile[1], +1)
+
 def find_path_bfs(grid, start_tile, goal_tile):
     """
     BFS classique en 4 directions, sans marge supplémentaire.
@@ -103,94 +366,350 @@ def find_path_any_angle(
     grid, start_tile, goal_tile,
     other_units=None,
     mountain_margin_px=16,
-    unit_margin_px=16
+    unit_margin_px=16,
+    algorithm="astar",
+    stats=None,
+    blocked_map=None,
+    exact_los=False,
+    reach=None
 ):
     """
-    BFS en 8 directions (any-angle) + simplification du chemin:
+    Recherche en 8 directions (any-angle) + simplification du chemin:
       1) On construit un blocked_map tenant compte des marges (montagnes+units)
-      2) BFS en 8 directions sur tuiles
+      2) Recherche en 8 directions sur tuiles ('algorithm'):
+         - "astar" : A* pondéré par le terrain (TERRAIN_COST), heuristique octile
+         - "bfs"   : BFS non pondéré (ancien comportement)
+         - "jps"   : Jump Point Search, coût uniforme (ignore TERRAIN_COST)
       3) Reconstitution du chemin tuiles => pixels
       4) Simplification (line_of_sight)
       5) Retour au format tuiles (sans exiger de modif externe).
+
+    - stats : dict optionnel, reçoit "expanded" (nb de noeuds développés).
+    - blocked_map : map déjà construite (ex: BlockedMap.cells); si fournie,
+      other_units et les marges sont ignorés.
+    - exact_los : simplification avec une ligne de vue exacte (toutes les
+      tuiles traversées par le segment), pour des unités qui suivent
+      réellement les segments sans couper de coin.
+    - reach : index d'accessibilité (reachability_index) cohérent avec
+      blocked_map; sans blocked_map, celui de la marge montagnes est pris.
+      Start et goal dans des composantes différentes => [] sans recherche.
     """
     (sx, sy) = start_tile
     (gx, gy) = goal_tile
 
-    if not in_bounds(sx, sy) or not in_bounds(gx, gy):
+    ny = len(grid)
+    nx = len(grid[0])
+    if not (0 <= sx < nx and 0 <= sy < ny) or not (0 <= gx < nx and 0 <= gy < ny):
         return []
     if (sx, sy) == (gx, gy):
         return []
 
-    if other_units is None:
-        other_units = []
+    if reach is None and blocked_map is None:
+        reach = reachability_index(grid, mountain_margin_px)
+    if reach is not None and not reach.same(start_tile, goal_tile):
+        return []
 
-    blocked_map = build_blocked_map(
-        grid, other_units,
-        mountain_margin_px=mountain_margin_px,
-        unit_margin_px=unit_margin_px
-    )
+    if blocked_map is None:
+        if other_units is None:
+            other_units = []
+        blocked_map = build_blocked_map(
+            grid, other_units,
+            mountain_margin_px=mountain_margin_px,
+            unit_margin_px=unit_margin_px
+        )
     if blocked_map[sy][sx] or blocked_map[gy][gx]:
         return []
 
-    visited = [[False]*len(grid[0]) for _ in range(len(grid))]
+    if algorithm == "astar":
+        path = astar_search(grid, blocked_map, start_tile, goal_tile, stats)
+    elif algorithm == "bfs":
+        path = bfs8_search(blocked_map, start_tile, goal_tile, stats)
+    elif algorithm == "jps":
+        path = jps_search(blocked_map, start_tile, goal_tile, stats)
+    else:
+        raise ValueError("algorithme de recherche inconnu: %r" % (algorithm,))
+
+    if not path:
+        return []
+
+    # Convertit en px
+    px_path = [
+        (tx*TILE_SIZE + TILE_SIZE/2, ty*TILE_SIZE + TILE_SIZE/2)
+        for (tx, ty) in path
+    ]
+
+    # Simplification any-angle
+    px_path = simplify_path(px_path, blocked_map, exact=exact_los)
+
+    # Convertit de nouveau en tuiles
+    tile_path=[]
+    for (px,py) in px_path:
+        tx=int(px//TILE_SIZE)
+        ty=int(py//TILE_SIZE)
+        tile_path.append((tx,ty))
+
+    return tile_path
+
+# 8 directions
+DIRECTIONS_8 = [(1,0),(-1,0),(0,1),(0,-1),
+                (1,1),(1,-1),(-1,1),(-1,-1)]
+
+def reconstruct_path(parent, goal_tile):
+    """
+    Remonte 'parent' depuis goal_tile; retire la tuile de départ (pour compat).
+    """
+    path=[]
+    cur=goal_tile
+    while cur is not None:
+        path.append(cur)
+        cur=parent[cur]
+    path.reverse()
+    return path[1:]
+
+def bfs8_search(blocked_map, start_tile, goal_tile, stats=None):
+    """
+    BFS non pondéré en 8 directions sur blocked_map.
+    Renvoie le chemin tuiles (sans la tuile de départ), ou [] si introuvable.
+    """
+    (sx, sy) = start_tile
+    (gx, gy) = goal_tile
+    ny = len(blocked_map)
+    nx = len(blocked_map[0])
+
+    visited = [[False]*nx for _ in range(ny)]
     visited[sy][sx] = True
     parent = {}
     parent[(sx, sy)] = None
     queue = collections.deque()
     queue.append((sx, sy))
 
-    # 8 directions
-    directions_8 = [(1,0),(-1,0),(0,1),(0,-1),
-                    (1,1),(1,-1),(-1,1),(-1,-1)]
-
+    expanded = 0
     found=False
     while queue:
         cx, cy = queue.popleft()
+        expanded += 1
         if (cx,cy)==(gx,gy):
             found=True
             break
-        for (dx,dy) in directions_8:
+        for (dx,dy) in DIRECTIONS_8:
             nx_ = cx+dx
             ny_ = cy+dy
-            if in_bounds(nx_, ny_):
+            if 0 <= nx_ < nx and 0 <= ny_ < ny:
                 if not blocked_map[ny_][nx_]:
                     if not visited[ny_][nx_]:
                         visited[ny_][nx_] = True
                         parent[(nx_,ny_)] = (cx,cy)
                         queue.append((nx_,ny_))
 
+    if stats is not None:
+        stats["expanded"] = expanded
     if not found:
         return []
+    return reconstruct_path(parent, (gx, gy))
 
-    # On récupère le chemin "tuiles"
-    path=[]
-    cur=(gx,gy)
-    while cur is not None:
-        path.append(cur)
-        cur=parent[cur]
-    path.reverse()
-    # retire la tuile de départ (pour compat)
-    path = path[1:]
-
-    # Convertit en px
-    px_path = [
-        (tx*TILE_SIZE + TILE_SIZE/2, ty*TILE_SIZE + TILE_SIZE/2)
-        for (tx, ty) in path
-    ]
-
-    # Simplification any-angle
-    px_path = simplify_path(px_path, blocked_map)
+def octile(x1, y1, x2, y2):
+    """
+    Heuristique octile: distance exacte en 8 directions sans obstacle,
+    admissible car TERRAIN_COST >= 1.
+    """
+    dx = abs(x1 - x2)
+    dy = abs(y1 - y2)
+    return (dx + dy) + (SQRT2 - 2) * min(dx, dy)
 
-    # Convertit de nouveau en tuiles
-    tile_path=[]
-    for (px,py) in px_path:
-        tx=int(px//TILE_SIZE)
-        ty=int(py//TILE_SIZE)
-        tile_path.append((tx,ty))
+def astar_search(grid, blocked_map, start_tile, goal_tile, stats=None, bounds=None):
+    """
+    A* en 8 directions sur blocked_map, avec tas binaire (heapq).
+    Coût d'un pas = longueur (1 ou sqrt(2)) * TERRAIN_COST de la tuile d'arrivée.
+    - bounds : (x0, y0, x1, y1) inclusifs pour restreindre la recherche
+      à une zone (ex: un cluster HPA*); par défaut toute la grille.
+    Renvoie le chemin tuiles (sans la tuile de départ), ou [] si introuvable.
+    """
+    (sx, sy) = start_tile
+    (gx, gy) = goal_tile
+    if bounds is None:
+        bx0, by0 = 0, 0
+        bx1, by1 = len(grid[0]) - 1, len(grid) - 1
+    else:
+        (bx0, by0, bx1, by1) = bounds
+
+    steps = [(dx, dy, SQRT2 if dx and dy else 1.0) for (dx, dy) in DIRECTIONS_8]
+    cost_of = TERRAIN_COST
+
+    g_score = {(sx, sy): 0.0}
+    parent = {(sx, sy): None}
+    closed = set()
+    # (f, h, x, y): à f égal, on préfère le noeud le plus proche du but
+    h0 = octile(sx, sy, gx, gy)
+    heap = [(h0, h0, sx, sy)]
+
+    expanded = 0
+    found = False
+    while heap:
+        _, _, cx, cy = heapq.heappop(heap)
+        if (cx, cy) in closed:
+            continue
+        closed.add((cx, cy))
+        expanded += 1
+        if cx == gx and cy == gy:
+            found = True
+            break
+        g_cur = g_score[(cx, cy)]
+        for (dx, dy, length) in steps:
+            nx_ = cx+dx
+            ny_ = cy+dy
+            if bx0 <= nx_ <= bx1 and by0 <= ny_ <= by1:
+                if blocked_map[ny_][nx_] or (nx_, ny_) in closed:
+                    continue
+                g_new = g_cur + length * cost_of.get(grid[ny_][nx_], 1.0)
+                old = g_score.get((nx_, ny_))
+                if old is None or g_new < old:
+                    g_score[(nx_, ny_)] = g_new
+                    parent[(nx_, ny_)] = (cx, cy)
+                    h = octile(nx_, ny_, gx, gy)
+                    heapq.heappush(heap, (g_new + h, h, nx_, ny_))
+
+    if stats is not None:
+        stats["expanded"] = expanded
+    if not found:
+        return []
+    return reconstruct_path(parent, (gx, gy))
 
-    return tile_path
+def jps_search(blocked_map, start_tile, goal_tile, stats=None):
+    """
+    Jump Point Search (Harabor & Grastien 2011) en 8 directions sur
+    blocked_map, à coût uniforme (1 / sqrt(2)), mêmes règles de passage
+    que bfs8_search (diagonales autorisées le long des coins).
+    Les longues zones libres (T_PLAIN) sont sautées sans être développées.
+    Renvoie le chemin tuiles (sans la tuile de départ), ou [] si introuvable.
+    """
+    (sx, sy) = start_tile
+    (gx, gy) = goal_tile
+    ny = len(blocked_map)
+    nx = len(blocked_map[0])
+
+    def free(x, y):
+        return 0 <= x < nx and 0 <= y < ny and not blocked_map[y][x]
+
+    def jump_straight(x, y, dx, dy):
+        # Avance en ligne droite jusqu'au but, un voisin forcé ou un mur
+        while True:
+            x += dx
+            y += dy
+            if not free(x, y):
+                return None
+            if x == gx and y == gy:
+                return (x, y)
+            if dx:
+                if (not free(x, y+1) and free(x+dx, y+1)) or \
+                   (not free(x, y-1) and free(x+dx, y-1)):
+                    return (x, y)
+            else:
+                if (not free(x+1, y) and free(x+1, y+dy)) or \
+                   (not free(x-1, y) and free(x-1, y+dy)):
+                    return (x, y)
+
+    def jump(x, y, dx, dy):
+        if not (dx and dy):
+            return jump_straight(x, y, dx, dy)
+        while True:
+            x += dx
+            y += dy
+            if not free(x, y):
+                return None
+            if x == gx and y == gy:
+                return (x, y)
+            if (not free(x-dx, y) and free(x-dx, y+dy)) or \
+               (not free(x, y-dy) and free(x+dx, y-dy)):
+                return (x, y)
+            if jump_straight(x, y, dx, 0) or jump_straight(x, y, 0, dy):
+                return (x, y)
+
+    def successors_dirs(x, y, dx, dy):
+        # Voisins naturels + forcés selon la direction d'arrivée
+        if dx == 0 and dy == 0:
+            return DIRECTIONS_8
+        dirs = []
+        if dx and dy:
+            dirs.append((dx, 0))
+            dirs.append((0, dy))
+            dirs.append((dx, dy))
+            if not free(x-dx, y):
+                dirs.append((-dx, dy))
+            if not free(x, y-dy):
+                dirs.append((dx, -dy))
+        elif dx:
+            dirs.append((dx, 0))
+            if not free(x, y+1):
+                dirs.append((dx, 1))
+            if not free(x, y-1):
+                dirs.append((dx, -1))
+        else:
+            dirs.append((0, dy))
+            if not free(x+1, y):
+                dirs.append((1, dy))
+            if not free(x-1, y):
+                dirs.append((-1, dy))
+        return dirs
+
+    g_score = {(sx, sy): 0.0}
+    parent = {(sx, sy): None}
+    closed = set()
+    h0 = octile(sx, sy, gx, gy)
+    heap = [(h0, h0, sx, sy)]
+    expanded = 0
+    found = False
+    while heap:
+        _, _, cx, cy = heapq.heappop(heap)
+        if (cx, cy) in closed:
+            continue
+        closed.add((cx, cy))
+        expanded += 1
+        if cx == gx and cy == gy:
+            found = True
+            break
+        par = parent[(cx, cy)]
+        if par is None:
+            pdx = pdy = 0
+        else:
+            pdx = (cx > par[0]) - (cx < par[0])
+            pdy = (cy > par[1]) - (cy < par[1])
+        g_cur = g_score[(cx, cy)]
+        for (dx, dy) in successors_dirs(cx, cy, pdx, pdy):
+            jp = jump(cx, cy, dx, dy)
+            if jp is None or jp in closed:
+                continue
+            g_new = g_cur + octile(cx, cy, jp[0], jp[1])
+            old = g_score.get(jp)
+            if old is None or g_new < old:
+                g_score[jp] = g_new
+                parent[jp] = (cx, cy)
+                h = octile(jp[0], jp[1], gx, gy)
+                heapq.heappush(heap, (g_new + h, h, jp[0], jp[1]))
+
+    if stats is not None:
+        stats["expanded"] = expanded
+    if not found:
+        return []
 
-def simplify_path(px_path, blocked_map):
+    # Points de saut => tuiles intermédiaires (segments droits ou diagonaux)
+    jumps = []
+    cur = (gx, gy)
+    while cur is not None:
+        jumps.append(cur)
+        cur = parent[cur]
+    jumps.reverse()
+    path = []
+    for (a, b) in zip(jumps, jumps[1:]):
+        dx = (b[0] > a[0]) - (b[0] < a[0])
+        dy = (b[1] > a[1]) - (b[1] < a[1])
+        x, y = a
+        while (x, y) != b:
+            x += dx
+            y += dy
+            path.append((x, y))
+    return path
+
+def simplify_path(px_path, blocked_map, exact=False):
     """
     Simplifie le chemin en sautant des points si line_of_sight est valide.
     """
@@ -202,7 +721,7 @@ def simplify_path(px_path, blocked_map):
     while current < len(px_path)-1:
         best = current+1
         for nxt in range(current+2, len(px_path)):
-            if line_of_sight(px_path[current], px_path[nxt], blocked_map):
+            if line_of_sight(px_path[current], px_path[nxt], blocked_map, exact):
                 best = nxt
             else:
                 break
@@ -213,12 +732,75 @@ def simplify_path(px_path, blocked_map):
 
     return newpath
 
-def line_of_sight(p1, p2, blocked_map):
+def line_of_sight(p1, p2, blocked_map, exact=False):
     """
     Vérifie si le segment [p1..p2] intersecte blocked_map.
+    exact=True => toutes les tuiles touchées par le segment (supercover),
+    sinon approximation de Bresenham.
     """
+    if exact:
+        return not segment_blocked_supercover(p1, p2, blocked_map)
     return not segment_blocked_bresenham(p1, p2, blocked_map)
 
+def segment_blocked_supercover(p1, p2, blocked_map):
+    """
+    Parcourt toutes les tuiles traversées par le segment continu [p1..p2]
+    (traversée de grille d'Amanatides-Woo) et vérifie si l'une est 'blocked'.
+    Au passage exact par un coin, les deux voisines sont testées.
+    """
+    (x1, y1) = p1
+    (x2, y2) = p2
+    ny = len(blocked_map)
+    nx = len(blocked_map[0])
+
+    def blocked(tx, ty):
+        return 0 <= tx < nx and 0 <= ty < ny and blocked_map[ty][tx]
+
+    cx = int(x1 // TILE_SIZE)
+    cy = int(y1 // TILE_SIZE)
+    ex = int(x2 // TILE_SIZE)
+    ey = int(y2 // TILE_SIZE)
+    dx = x2 - x1
+    dy = y2 - y1
+    sx = 1 if dx > 0 else -1
+    sy = 1 if dy > 0 else -1
+    inf = float('inf')
+    if dx != 0:
+        bound_x = (cx + (1 if dx > 0 else 0)) * TILE_SIZE
+        t_max_x = (bound_x - x1) / dx
+        t_delta_x = TILE_SIZE / abs(dx)
+    else:
+        t_max_x = t_delta_x = inf
+    if dy != 0:
+        bound_y = (cy + (1 if dy > 0 else 0)) * TILE_SIZE
+        t_max_y = (bound_y - y1) / dy
+        t_delta_y = TILE_SIZE / abs(dy)
+    else:
+        t_max_y = t_delta_y = inf
+
+    if blocked(cx, cy):
+        return True
+    while (cx, cy) != (ex, ey):
+        if t_max_x > 1 and t_max_y > 1:
+            break
+        if t_max_x < t_max_y:
+            cx += sx
+            t_max_x += t_delta_x
+        elif t_max_y < t_max_x:
+            cy += sy
+            t_max_y += t_delta_y
+        else:
+            if blocked(cx+sx, cy) or blocked(cx, cy+sy):
+                return True
+            cx += sx
+            cy += sy
+            t_max_x += t_delta_x
+            t_max_y += t_delta_y
+        if blocked(cx, cy):
+            return True
+
+    return False
+
 def segment_blocked_bresenham(p1, p2, blocked_map):
     """
     Parcourt en mode Bresenham le segment [p1..p2]
@@ -238,9 +820,11 @@ def segment_blocked_bresenham(p1, p2, blocked_map):
     sy = 1 if ty1 < ty2 else -1
     err = dx + dy
 
+    ny = len(blocked_map)
+    nx = len(blocked_map[0])
     cx, cy = tx1, ty1
     while True:
-        if in_bounds(cx,cy):
+        if 0 <= cx < nx and 0 <= cy < ny:
             if blocked_map[cy][cx]:
                 return True
         if (cx, cy) == (tx2, ty2):
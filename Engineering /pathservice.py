@@ -0,0 +1,226 @@
+# Engineering/pathservice.py
+
+import time
+import collections
+from .consts import T_LAKE
+from .pathfinding import mountain_layer, find_path_any_angle, reachability_index
+
+PATH_BUDGET_MS = 4.0
+
+def movement_blocked_map(grid, mountain_margin_px=16):
+    """
+    blocked[y][x] pour les chemins d'unités: montagnes + marge (couche en
+    cache) et lacs, que move_direct_line refuse de traverser.
+    Les unités n'y figurent pas: un même résultat sert à toutes, et c'est
+    la couche fixe de la BlockedMap du tick (Simulation.blocked_map) qui y
+    ajoute les empreintes d'unités.
+    """
+    blocked = [list(row) for row in mountain_layer(grid, mountain_margin_px)]
+    for y, row in enumerate(grid):
+        brow = blocked[y]
+        for x, t in enumerate(row):
+            if t == T_LAKE:
+                brow[x] = True
+    return blocked
+
+class PathService:
+    """
+    File de requêtes de chemin, résolue par tranches à chaque tick.
+
+    - request() met en file une requête (start, goal, marge); une requête
+      identique déjà en attente est fusionnée (un seul calcul, tous servis)
+    - process() résout les requêtes dans l'ordre d'arrivée tant que le budget
+      'budget_ms' du tick n'est pas épuisé (au moins une par tick); le reste
+      est reporté au tick suivant. budget_ms=None => tout résoudre.
+
+    En attendant leur chemin, les unités gardent leur destination en ligne
+    droite (dest_px/dest_py); unit.path n'est rempli qu'à la livraison.
+    Une requête sans chemin possible (composantes différentes dans
+    reachability_index) est refusée tout de suite, sans entrer en file.
+
+    Map utilisée: process(units_map) résout sur la BlockedMap du tick
+    (cette map de mouvement + empreintes d'unités, celles des unités servies
+    retirées) quand sa marge est celle de la requête. Les unités ne sont que
+    des obstacles passagers: si leurs empreintes ne laissent aucun chemin
+    (but occupé, passage encombré), la requête est résolue sur la map de
+    mouvement seule, et resolve_collisions gère le contact local.
+
+    use_parallel() branche un ParallelPathSolver (Engineering/parallel.py):
+    les requêtes de sa marge partent par lots sur le pool sans bloquer le
+    tick (au plus 'max_batch' par tick); les chemins sont livrés aux ticks
+    suivants, au fil des tranches terminées, dans la limite du même budget.
+    Une requête identique à une requête déjà envoyée y est fusionnée.
+    Le pool partage la map de mouvement une fois pour toutes au démarrage:
+    il ignore les empreintes d'unités (units_map), qui changent à chaque
+    tick et seraient périmées à la livraison de toute façon.
+    """
+    def __init__(self, grid, budget_ms=PATH_BUDGET_MS, clock=time.perf_counter):
+        self.grid = grid
+        self.budget_ms = budget_ms
+        self.clock = clock
+        self.pending = collections.OrderedDict()
+        self._blocked = {}
+        self.solver = None
+        self.solver_margin = None
+        # Requêtes envoyées au pool: clé => unités servies, et lots en cours
+        self.in_flight = {}
+        self.batches = collections.deque()
+        self.solved = 0
+        self.merged = 0
+        self.rejected = 0
+
+    def use_parallel(self, workers=None, mountain_margin_px=16, max_batch=4096):
+        """
+        Démarre un pool de processus partageant grille et blocked map.
+        Chaque process() envoie jusqu'à 'max_batch' requêtes en un lot,
+        sans attendre ses résultats.
+        """
+        from .parallel import ParallelPathSolver
+        self.close()
+        self.solver = ParallelPathSolver(
+            self.grid, self.blocked_map(mountain_margin_px),
+            workers=workers, exact_los=True
+        )
+        self.solver_margin = mountain_margin_px
+        self.max_batch = max_batch
+
+    def close(self):
+        """
+        Arrête le pool éventuel (use_parallel). Les requêtes encore en
+        cours sur le pool reviennent en file.
+        """
+        for (key, waiters) in self.in_flight.items():
+            self.pending[key] = waiters
+        self.in_flight = {}
+        self.batches.clear()
+        if self.solver is not None:
+            self.solver.close()
+            self.solver = None
+
+    def blocked_map(self, mountain_margin_px):
+        blocked = self._blocked.get(mountain_margin_px)
+        if blocked is None:
+            blocked = movement_blocked_map(self.grid, mountain_margin_px)
+            self._blocked[mountain_margin_px] = blocked
+        return blocked
+
+    def invalidate(self):
+        """À appeler si le terrain change (le pool éventuel est arrêté)."""
+        self._blocked = {}
+        self.close()
+
+    def reachable(self, start_tile, goal_tile, mountain_margin_px=16):
+        """Test O(1): un chemin peut-il exister (montagnes + marge, lacs)?"""
+        index = reachability_index(self.grid, mountain_margin_px, lakes=True)
+        return index.same(start_tile, goal_tile)
+
+    def request(self, unit, start_tile, goal_tile, mountain_margin_px=16):
+        """
+        Demande un chemin pour 'unit'. Un nouvel ordre remplace le précédent:
+        seule la dernière requête de l'unité sera livrée.
+        Retourne la clé de la requête, ou None si elle est refusée
+        (aucun chemin possible).
+        """
+        key = (tuple(start_tile), tuple(goal_tile), mountain_margin_px)
+        unit.path = None
+        if not self.reachable(start_tile, goal_tile, mountain_margin_px):
+            unit.path_request = None
+            self.rejected += 1
+            return None
+        unit.path_request = key
+        waiters = self.pending.get(key)
+        if waiters is None:
+            waiters = self.in_flight.get(key)
+        if waiters is None:
+            self.pending[key] = [unit]
+        else:
+            waiters.append(unit)
+            self.merged += 1
+        return key
+
+    def process(self, units_map=None):
+        """
+        Résout des requêtes dans la limite du budget du tick.
+        'units_map' : BlockedMap du tick (optionnelle, voir la classe).
+        Avec un pool: envoie les nouvelles requêtes de sa marge, puis livre
+        les tranches déjà terminées, sans attendre les autres.
+        Retourne le nombre de requêtes livrées.
+        """
+        if not self.pending and not self.in_flight:
+            return 0
+        deadline = None
+        if self.budget_ms is not None:
+            deadline = self.clock() + self.budget_ms / 1000.0
+        done = 0
+        if self.solver is not None:
+            self._submit()
+            done += self._collect(deadline)
+        while True:
+            key = self._next_serial_key()
+            if key is None:
+                break
+            # Au moins une requête livrée par tick
+            if deadline is not None and done and self.clock() >= deadline:
+                break
+            waiters = self.pending.pop(key)
+            (start, goal, margin) = key
+            path = None
+            if units_map is not None and units_map.mountain_margin_px == margin:
+                path = units_map.find_path(start, goal, units=waiters, exact_los=True)
+            if not path:
+                path = find_path_any_angle(
+                    self.grid, start, goal,
+                    blocked_map=self.blocked_map(margin),
+                    exact_los=True
+                )
+            self._deliver(key, waiters, path)
+            done += 1
+        return done
+
+    def _next_serial_key(self):
+        # Avec un pool, seules les marges qu'il ne couvre pas sont en série
+        for key in self.pending:
+            if self.solver is None or key[2] != self.solver_margin:
+                return key
+        return None
+
+    def _submit(self):
+        keys = [k for k in self.pending if k[2] == self.solver_margin]
+        keys = keys[:self.max_batch]
+        if not keys:
+            return
+        for key in keys:
+            self.in_flight[key] = self.pending.pop(key)
+        batch = self.solver.submit([(k[0], k[1]) for k in keys])
+        self.batches.append((batch, keys))
+
+    def _collect(self, deadline):
+        # Sans budget (deadline None), on attend la fin de tous les lots
+        done = 0
+        while self.batches:
+            (batch, keys) = self.batches[0]
+            part = batch.next_chunk(timeout=None if deadline is None else 0)
+            if part is None:
+                break
+            for (i, path) in part:
+                key = keys[i]
+                self._deliver(key, self.in_flight.pop(key), path)
+                done += 1
+            if batch.done:
+                self.batches.popleft()
+            if deadline is not None and self.clock() >= deadline:
+                break
+        return done
+
+    def _deliver(self, key, waiters, path):
+        for u in waiters:
+            # Ordre remplacé entre-temps => résultat ignoré
+            if u.path_request != key:
+                continue
+            u.path_request = None
+            if path:
+                u.path = list(path)
+        self.solved += 1
+
+    def __len__(self):
+        return len(self.pending) + len(self.in_flight)
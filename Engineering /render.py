@@ -0,0 +1,244 @@
+# Engineering/render.py
+
+import math
+from .consts import (
+    WIDTH, HEIGHT, TILE_SIZE, UNIT_RADIUS, STAR_SIZE,
+    COLOR_BLUE, COLOR_RED, COLOR_HIGHLIGHT,
+    tile_color
+)
+from .victory import CAPTURE_TIME
+from .spline import catmull_rom_flat
+
+BAR_W = 30
+BAR_H = 4
+
+# Couleur RGB (3 octets) par type de tuile, indexée par les constantes T_*
+TERRAIN_RGB = [bytes.fromhex(tile_color(t)[1:]) for t in range(256)]
+
+def terrain_ppm(grid, tile_px=TILE_SIZE):
+    """
+    Image PPM binaire (P6) du terrain: 'tile_px' pixels par tuile.
+    Une ligne de pixels est construite une fois par ligne de tuiles à partir
+    de la table TERRAIN_RGB, puis répétée tile_px fois.
+    """
+    ny = len(grid)
+    nx = len(grid[0])
+    lut = [rgb*tile_px for rgb in TERRAIN_RGB]
+    rows = [b"".join([lut[t] for t in row])*tile_px for row in grid]
+    header = b"P6 %d %d 255\n" % (nx*tile_px, ny*tile_px)
+    return header + b"".join(rows)
+
+def tk_photo_image(canvas, data):
+    import tkinter as tk
+    return tk.PhotoImage(master=canvas, data=data, format="PPM")
+
+class CanvasRenderer:
+    """
+    Rendu "retenu" de la simulation sur un tk.Canvas.
+
+    Les objets canvas sont créés une seule fois (terrain, capitales, panneau)
+    ou à l'apparition d'une unité; à chaque frame on ne touche (coords /
+    itemconfig) que ceux dont l'état a changé: unité déplacée, sélection,
+    hp, front modifié, texte d'interface différent. Plus de delete("all").
+
+    Ordre d'affichage par tags: terrain < capital < front < unit < ui.
+
+    Le terrain est un seul objet image (terrain_ppm), même pour les grandes
+    cartes. 'photo_image(canvas, data)' fabrique l'image Tk à partir des
+    octets PPM (par défaut tkinter.PhotoImage).
+
+    'front_steps' > 0: le front est tracé en Catmull-Rom ('front_steps'
+    pas par segment, Engineering/spline.py) au lieu du lissage de Tk.
+
+    'tile_px' : pixels canvas par tuile (zoom). Les positions de la
+    simulation (TILE_SIZE pixels par tuile) sont mises à l'échelle
+    tile_px/TILE_SIZE; unités, étoiles et panneau gardent leur taille.
+    """
+    def __init__(self, canvas, sim, photo_image=tk_photo_image, front_steps=0,
+                 tile_px=TILE_SIZE):
+        self.canvas = canvas
+        self.sim = sim
+        self.photo_image = photo_image
+        self.front_steps = front_steps
+        self.tile_px = tile_px
+        self.scale = tile_px / TILE_SIZE
+        self.terrain_image = None
+        # unit -> [oval, anneau sélection, fond barre, barre hp, état]
+        self.unit_items = {}
+        self._front = None
+        self._texts = {}
+        self.build_static()
+
+    def build_static(self):
+        """(Re)crée les objets fixes: terrain, capitales, panneau et textes."""
+        c = self.canvas
+        c.delete("all")
+        self.unit_items = {}
+        self._front = None
+        self._texts = {}
+
+        self.draw_terrain()
+
+        for (cap, color) in ((self.sim.red_cap, COLOR_RED), (self.sim.blue_cap, COLOR_BLUE)):
+            cx = cap[0]*self.tile_px + self.tile_px/2
+            cy = cap[1]*self.tile_px + self.tile_px/2
+            self.draw_star(cx, cy, STAR_SIZE, color)
+
+        self.front_item = c.create_line(0, 0, 0, 0, fill="black", width=6,
+                                        smooth=(self.front_steps <= 0), state="hidden",
+                                        tags=("front",))
+
+        c.create_rectangle(0, 0, 190, 80, fill="#222222", outline="#666666",
+                           width=2, tags=("ui",))
+        self.text_items = {
+            "clock": c.create_text(10, 10, text="", anchor="nw", fill="white",
+                                   font=("Arial", 14, "bold"), tags=("ui",)),
+            "red_cap": c.create_text(10, 30, text="", anchor="nw", fill="red",
+                                     font=("Arial", 12, "bold"), tags=("ui",)),
+            "blue_cap": c.create_text(10, 50, text="", anchor="nw", fill="blue",
+                                      font=("Arial", 12, "bold"), tags=("ui",)),
+            "victory": c.create_text(WIDTH*self.scale//2, HEIGHT*self.scale//2,
+                                     text="", fill="yellow", font=("Arial", 24, "bold"),
+                                     anchor="center", tags=("ui",)),
+        }
+        self.drag_item = c.create_rectangle(0, 0, 0, 0, outline="yellow", width=2,
+                                            dash=(4, 4), state="hidden", tags=("ui",))
+        self._drag = None
+
+    def draw_terrain(self):
+        # Référence gardée: Tk efface une PhotoImage ramassée par le GC
+        self.terrain_image = self.photo_image(self.canvas, terrain_ppm(self.sim.grid, self.tile_px))
+        self.canvas.create_image(0, 0, image=self.terrain_image, anchor="nw",
+                                 tags=("terrain",))
+
+    def draw_star(self, cx, cy, size, color):
+        fl = []
+        nb = 5
+        for i in range(nb*2):
+            angle = i*math.pi/nb
+            r = size if i % 2 == 0 else size/2
+            fl.append(cx + math.cos(angle)*r)
+            fl.append(cy + math.sin(angle)*r)
+        self.canvas.create_rectangle(cx-size-5, cy-size-5, cx+size+5, cy+size+5,
+                                     outline="black", width=2, tags=("capital",))
+        self.canvas.create_polygon(fl, fill=color, outline=color, tags=("capital",))
+
+    def draw(self, clock_text, drag_rect=None):
+        """
+        Met à jour la frame. 'clock_text' : texte du chronomètre,
+        'drag_rect' : (x1, y1, x2, y2) du rectangle de sélection, ou None.
+        """
+        sim = self.sim
+        self.update_front(sim.front_points)
+        created = self.update_units(sim.all_units)
+
+        self.set_text("clock", clock_text)
+        self.set_text("red_cap", self.capture_text("RedCap", sim.cap_red_timer))
+        self.set_text("blue_cap", self.capture_text("BlueCap", sim.cap_blue_timer))
+        self.set_text("victory", sim.victory_label or "")
+        self.update_drag(drag_rect)
+
+        if created:
+            # Nouvelles unités créées au-dessus de tout => l'UI repasse devant
+            self.canvas.tag_raise("ui")
+
+    def capture_text(self, name, timer):
+        if timer <= 0:
+            return ""
+        left = CAPTURE_TIME - timer
+        if left < 0:
+            left = 0
+        return f"{name} => {int(left)}s"
+
+    def set_text(self, key, text):
+        if self._texts.get(key) != text:
+            self._texts[key] = text
+            self.canvas.itemconfig(self.text_items[key], text=text)
+
+    def update_front(self, front_points):
+        if front_points == self._front:
+            return
+        self._front = list(front_points)
+        if len(front_points) > 1:
+            if self.front_steps > 0:
+                coords = catmull_rom_flat(front_points, self.front_steps)
+            else:
+                coords = [c for p in front_points for c in p]
+            if self.scale != 1:
+                coords = [c*self.scale for c in coords]
+            self.canvas.coords(self.front_item, coords)
+            self.canvas.itemconfig(self.front_item, state="normal")
+        else:
+            self.canvas.itemconfig(self.front_item, state="hidden")
+
+    def update_drag(self, drag_rect):
+        if drag_rect == self._drag:
+            return
+        if drag_rect is None:
+            self.canvas.itemconfig(self.drag_item, state="hidden")
+        else:
+            self.canvas.coords(self.drag_item, *drag_rect)
+            if self._drag is None:
+                self.canvas.itemconfig(self.drag_item, state="normal")
+        self._drag = drag_rect
+
+    def update_units(self, units):
+        """
+        Synchronise les objets canvas des unités; retourne True si des objets
+        ont été créés. Les unités disparues de 'units' sont effacées.
+        """
+        c = self.canvas
+        items = self.unit_items
+        scale = self.scale
+        created = False
+        for u in units:
+            ratio = u.hp/100
+            if ratio < 0:
+                ratio = 0
+            state = (u.x*scale, u.y*scale, u.is_selected, ratio)
+            entry = items.get(u)
+            if entry is None:
+                entry = self.create_unit_items(u)
+                items[u] = entry
+                created = True
+            old = entry[4]
+            if old == state:
+                continue
+            (x, y, selected, _) = state
+            moved = old is None or old[0] != x or old[1] != y
+            if moved:
+                c.coords(entry[0], x-UNIT_RADIUS, y-UNIT_RADIUS, x+UNIT_RADIUS, y+UNIT_RADIUS)
+                leftx = x - BAR_W/2
+                topy = y - UNIT_RADIUS - 10
+                c.coords(entry[2], leftx, topy, leftx+BAR_W, topy+BAR_H)
+                c.coords(entry[3], leftx, topy, leftx+BAR_W*ratio, topy+BAR_H)
+            elif old[3] != ratio:
+                leftx = x - BAR_W/2
+                topy = y - UNIT_RADIUS - 10
+                c.coords(entry[3], leftx, topy, leftx+BAR_W*ratio, topy+BAR_H)
+            # Anneau de sélection: déplacé seulement s'il est visible
+            if selected and (moved or not old[2]):
+                c.coords(entry[1], x-(UNIT_RADIUS+2), y-(UNIT_RADIUS+2),
+                         x+(UNIT_RADIUS+2), y+(UNIT_RADIUS+2))
+            if old is None or old[2] != selected:
+                c.itemconfig(entry[1], state=("normal" if selected else "hidden"))
+            entry[4] = state
+
+        if created or len(items) != len(units):
+            alive = set(units)
+            for u in [u for u in items if u not in alive]:
+                for item in items.pop(u)[:4]:
+                    c.delete(item)
+        return created
+
+    def create_unit_items(self, u):
+        c = self.canvas
+        color = (COLOR_BLUE if u.team == "blue" else COLOR_RED)
+        return [
+            c.create_oval(0, 0, 0, 0, fill=color, outline="", tags=("unit",)),
+            c.create_oval(0, 0, 0, 0, outline=COLOR_HIGHLIGHT, width=2,
+                          state="hidden", tags=("unit",)),
+            c.create_rectangle(0, 0, 0, 0, fill="#444444", tags=("unit",)),
+            c.create_rectangle(0, 0, 0, 0, fill="green", tags=("unit",)),
+            None
+        ]
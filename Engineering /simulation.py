@@ -0,0 +1,400 @@
+# Engineering/simulation.py
+
+from .consts import (
+    NX, NY, TILE_SIZE, FPS, T_PLAIN,
+    ENCIRCLED_TICK_LIMIT
+)
+from .generation import generate_map, make_rng
+from .mapcache import cached_map
+from .mapfile import load_map, save_map
+from .front import (
+    generate_initial_front, FrontLine, FrontSet, FrontIndex
+)
+from .units import Unit, AI
+from .spatial import SpatialHash
+from .pathfinding import BlockedMap, reachability_index
+from .flowfield import FlowFieldCache
+from .pathservice import PathService
+from .territory import TerritoryMap, FrontOwnership, OWNER_LEFT, OWNER_RIGHT
+from .victory import update_capital_capture, check_victory
+
+INITIAL_DELAY = 30.0
+ATTACK_RANGE = 40
+# À partir de combien d'unités un ordre de déplacement utilise un champ de flux
+FLOW_FIELD_MIN_GROUP = 2
+
+class Simulation:
+    """
+    Moteur de simulation sans interface (aucune dépendance à tkinter).
+    Possède la grille, les unités, le front et les capitales, et avance
+    par pas fixes de 1/FPS seconde via step(n), aussi vite que le CPU le permet.
+
+    - placement_ticks : durée de la phase de placement en ticks.
+      None => la phase ne se termine que sur appel explicite à start_battle()
+      (utilisé par l'interface tkinter, qui la cadence en temps réel).
+    - units_per_team : nombre d'unités créées à chaque capitale.
+    - use_unit_store : si True, les unités vivent dans un UnitStore NumPy
+      (Engineering.unitstore): combat, collisions, mouvement, encerclement
+      et morale/fatigue sont vectorisés, par phases (voir UnitStore.update).
+    - seed : graine de la map (sans 'grid') et du générateur 'rng'.
+    - rng : générateur aléatoire de la partie (tirages du front); défaut
+      random.Random(seed), ou le module random global si seed est None.
+    - cache_dir : dossier du cache disque des maps (Engineering.mapcache),
+      avec 'seed' seulement; None => map générée, rien n'est écrit.
+      mapcache.MAP_CACHE_DIR pour le dossier par défaut.
+    - blue_cap / red_cap : tuiles des capitales (défaut: bords gauche/droit).
+    """
+    def __init__(self, grid=None, units_per_team=10,
+                 placement_ticks=int(INITIAL_DELAY*FPS),
+                 use_unit_store=False, seed=None,
+                 blue_cap=None, red_cap=None, cache_dir=None, rng=None):
+        # Génération de la map
+        self.seed = seed
+        self.rng = make_rng(seed, rng)
+        if grid is None:
+            if seed is not None and cache_dir is not None:
+                grid = cached_map(seed, NX, NY, cache_dir=cache_dir)
+            else:
+                grid = generate_map(NX, NY, seed=seed)
+        self.grid = grid
+
+        # Capitales
+        self.blue_cap = tuple(blue_cap) if blue_cap is not None else (3, NY//2)
+        self.red_cap  = tuple(red_cap) if red_cap is not None else (NX-4, NY//2)
+        self.grid[self.blue_cap[1]][self.blue_cap[0]] = T_PLAIN
+        self.grid[self.red_cap[1]][self.red_cap[0]]   = T_PLAIN
+
+        self.unit_store = None
+        self.terrain = None
+        if use_unit_store:
+            import numpy as np
+            from .unitstore import UnitStore
+            self.unit_store = UnitStore(capacity=2*units_per_team)
+            self.terrain = np.asarray(self.grid, dtype=np.int8)
+
+        # Création d'unités
+        self.blue_units = []
+        self.red_units  = []
+        self.create_initial_units("blue", units_per_team)
+        self.create_initial_units("red", units_per_team)
+        self.all_units = self.blue_units + self.red_units
+
+        self.ai_red = AI("red")
+
+        # Index spatial partagé (combat, collisions, IA, front), rebâti chaque tick
+        self.spatial = SpatialHash()
+
+        # Map bloquée pour le pathfinding, rafraîchie au plus une fois par tick
+        self._blocked = None
+        self._blocked_tick = -1
+
+        # Champs de flux des ordres de groupe, LRU par tuile but
+        self.flow_fields = FlowFieldCache(self.grid)
+
+        # File de requêtes de chemin, résolue avec un budget par tick
+        self.paths = PathService(self.grid)
+
+        # Index d'accessibilité calculés au chargement de la map: un ordre
+        # impossible (autre rive, autre côté d'une chaîne) est refusé en O(1)
+        self.reach = reachability_index(self.grid, lakes=True)
+        self.reach_flow = reachability_index(self.grid, lakes=True, connectivity=4)
+
+        self.tick = 0
+        self.victory_label = None
+
+        # Ligne de front
+        # Tampons de capacité fixe; front_points en est une copie (tuples)
+        # pour l'index, le rendu et les scripts. self.fronts peut recevoir
+        # d'autres fronts (poches, îles): seul le principal décide des côtés.
+        self.front = FrontLine(generate_initial_front(num_points=25), rng=self.rng)
+        self.fronts = FrontSet([self.front])
+        self.front_points = self.front.points()
+        # Index de côté du front, reconstruit à chaque modification du front
+        self.front_index = FrontIndex(self.front_points)
+        # Propriétaire de chaque tuile selon le front (raster mis à jour
+        # par bandes, surfaces par équipe en compteurs): l'encerclement le
+        # lit en O(1)
+        left = ("blue", "red") if self.blue_cap[0] <= self.red_cap[0] else ("red", "blue")
+        self.front_ownership = FrontOwnership(NX, NY, self.front_index, teams=left)
+
+        # Timers de capture
+        self.cap_red_timer  = 0.0
+        self.cap_blue_timer = 0.0
+
+        # Phase de placement initial
+        self.placement_ticks = placement_ticks
+        self.placement_phase = True
+        self.game_started = False
+        self.play_start_tick = 0
+
+        # Zones de placement: BFS multi-sources depuis les deux capitales
+        # (propriétaire + distance par tuile, hors montagne/lac/rivière)
+        self.territory = TerritoryMap(
+            self.grid, [("blue", self.blue_cap), ("red", self.red_cap)])
+
+        self.ai_place_red_units()
+
+        # --- Secret counters ---
+        self._blue_count = len(self.blue_units)
+        self._red_count  = len(self.red_units)
+        # -----------------------
+
+        # Hook optionnel appelé pour chaque unité retirée (ex: sélection UI)
+        self.on_unit_removed = None
+
+    @classmethod
+    def from_map_file(cls, path, **kwargs):
+        """
+        Simulation sur une map enregistrée (Engineering.mapfile): grille
+        projetée en mémoire, graine et capitales lues dans l'en-tête.
+        """
+        mf = load_map(path)
+        return cls(grid=mf.grid, seed=mf.seed,
+                   blue_cap=mf.blue_cap, red_cap=mf.red_cap, **kwargs)
+
+    def save_map(self, path, rle=False):
+        """Enregistre la map, sa graine et les capitales (format compact)."""
+        save_map(path, self.grid, seed=self.seed,
+                 blue_cap=self.blue_cap, red_cap=self.red_cap, rle=rle)
+
+    @property
+    def time(self):
+        """Temps simulé écoulé, en secondes."""
+        return self.tick / FPS
+
+    @property
+    def play_time(self):
+        """Temps simulé écoulé depuis la fin du placement, en secondes."""
+        if not self.game_started:
+            return 0.0
+        return (self.tick - self.play_start_tick) / FPS
+
+    @property
+    def is_over(self):
+        return self.victory_label is not None
+
+    def create_initial_units(self, team, number):
+        cx, cy = (self.blue_cap if team=="blue" else self.red_cap)
+        for _ in range(number):
+            px = cx*TILE_SIZE + TILE_SIZE/2
+            py = cy*TILE_SIZE + TILE_SIZE/2
+            if self.unit_store is not None:
+                u = self.unit_store.add(px,py,team)
+            else:
+                u = Unit(px,py,team)
+            if team=="blue":
+                self.blue_units.append(u)
+            else:
+                self.red_units.append(u)
+
+    def ai_place_red_units(self):
+        if not self.red_units or not self.blue_units:
+            return
+        bx = sum(u.x for u in self.blue_units)/len(self.blue_units)
+        tile_bx = int(bx//TILE_SIZE)
+        # Colonnes les plus éloignées des bleus d'abord, sans trier la zone
+        tiles = self.territory.tiles_by_column("red", reverse=(tile_bx<NX//2))
+        for u, (tx,ty) in zip(self.red_units, tiles):
+            u.x=tx*TILE_SIZE+TILE_SIZE/2
+            u.y=ty*TILE_SIZE+TILE_SIZE/2
+
+    def is_unit_in_enemy_zone(self, unit):
+        """
+        Appelée par units.py => if game.is_unit_in_enemy_zone(self):
+        """
+        side = self.front_ownership.side_at(unit.x, unit.y)
+        if unit.team=="blue":
+            return (side==OWNER_LEFT)
+        else:
+            return (side==OWNER_RIGHT)
+
+    def update_capital_capture(self, unit):
+        """
+        Appelée par units.py => game.update_capital_capture(self)
+        => on appelle la fonction victory.update_capital_capture
+        """
+        update_capital_capture(self, unit)
+
+    def blocked_map(self):
+        """
+        BlockedMap à jour pour le tick courant: map de mouvement du
+        PathService (montagnes + marge, lacs) + empreintes d'unités; seules
+        les unités qui ont bougé sont retamponnées.
+        """
+        if self._blocked is None:
+            self._blocked = BlockedMap(self.grid, static=self.paths.blocked_map(16))
+        if self._blocked_tick != self.tick:
+            self._blocked.update_units(self.all_units)
+            self._blocked_tick = self.tick
+        return self._blocked
+
+    def order_move(self, units, goal_tile):
+        """
+        Ordre de déplacement vers 'goal_tile'. Un groupe suit un champ de
+        flux unique (en cache). Une unité seule part en ligne droite et
+        demande un chemin au PathService, qu'elle suivra dès sa livraison.
+        Les unités qui ne peuvent pas atteindre le but (composante différente
+        dans l'index d'accessibilité) ignorent l'ordre.
+        Retourne la liste des unités qui ont reçu l'ordre.
+        """
+        px = goal_tile[0]*TILE_SIZE + TILE_SIZE/2
+        py = goal_tile[1]*TILE_SIZE + TILE_SIZE/2
+        group = len(units) >= FLOW_FIELD_MIN_GROUP
+        reach = self.reach_flow if group else self.reach
+        units = [u for u in units if self.can_reach(reach, u.get_tile_pos(), goal_tile)]
+        field = None
+        if group and units:
+            field = self.flow_fields.get(goal_tile)
+        for u in units:
+            u.target_enemy = None
+            u.flow_field = field
+            u.path = None
+            u.path_request = None
+            u.dest_px = px
+            u.dest_py = py
+            if field is None:
+                self.paths.request(u, u.get_tile_pos(), goal_tile)
+        return units
+
+    def can_reach(self, reach, start_tile, goal_tile):
+        """
+        Faux seulement si start et goal sont dans deux composantes différentes.
+        Une tuile hors composante (marge de montagne, lac) ne conclut rien:
+        l'unité garde le comportement habituel (ligne droite / champ de flux).
+        """
+        a = reach.label_at(start_tile[0], start_tile[1])
+        b = reach.label_at(goal_tile[0], goal_tile[1])
+        return a == 0 or b == 0 or a == b
+
+    def start_battle(self):
+        """Termine la phase de placement: les unités peuvent bouger."""
+        if not self.placement_phase:
+            return
+        self.placement_phase = False
+        self.game_started = True
+        self.play_start_tick = self.tick
+
+    def step(self, n=1):
+        """Avance la simulation de 'n' ticks fixes (1/FPS seconde chacun)."""
+        for _ in range(n):
+            self._tick()
+
+    def run(self, max_ticks):
+        """
+        Avance jusqu'à la victoire ou 'max_ticks' ticks.
+        Retourne le nombre de ticks effectués.
+        """
+        done = 0
+        while done < max_ticks and not self.is_over:
+            self._tick()
+            done += 1
+        return done
+
+    def _tick(self):
+        if (self.placement_phase and self.placement_ticks is not None
+                and self.tick >= self.placement_ticks):
+            self.start_battle()
+
+        movement_allowed = (not self.placement_phase)
+
+        self.spatial.rebuild(self.all_units)
+
+        # Chemins en attente, dans la limite du budget du tick, sur la map
+        # bloquée du tick (empreintes d'unités), mise à jour seulement s'il y en a
+        if self.paths:
+            self.paths.process(self.blocked_map())
+
+        if self.game_started:
+            self.ai_red.update(self, movement_allowed)
+
+        self.resolve_combat()
+
+        # check crossing => front (côtés de toutes les unités en un appel,
+        # toutes les traversées du tick insérées en une passe)
+        crossings = []
+        for u, new_side in zip(self.all_units, self.front_index.sides(self.all_units)):
+            old_side = getattr(u,'front_side',None)
+            if old_side and new_side!=old_side:
+                crossings.append((u.x, u.y))
+            u.front_side=new_side
+        self.front.add_crossings(crossings)
+
+        positions = None
+        if self.unit_store is not None:
+            # Colonnes du store: pas de relecture unité par unité
+            n = self.unit_store.n
+            positions = (self.unit_store.x[:n], self.unit_store.y[:n])
+        # Les fronts sans unité à portée sont ignorés
+        self.fronts.update(self.all_units, dt=1.0,
+                           influence_radius=80, push_strength=0.05,
+                           index=self.spatial, positions=positions)
+        # Index et raster de propriété seulement si le front a bougé
+        points = self.front.points()
+        if points != self.front_points:
+            self.front_points = points
+            self.front_index = FrontIndex(points)
+            self.front_ownership.mark(self.front_index)
+
+        self.update_units(movement_allowed)
+
+        self.remove_dead_units()
+
+        # check la victoire
+        check_victory(self)
+
+        self.tick += 1
+
+    def update_units(self, movement_allowed):
+        """
+        Tick des unités: unité par unité (Unit.update), ou par phases
+        vectorisées sur le UnitStore (UnitStore.update).
+        """
+        if self.unit_store is not None:
+            self.unit_store.update(self, self.terrain, movement_allowed)
+            return
+        for u in self.all_units:
+            u.update(self, self.all_units, self.grid, movement_allowed)
+            self.spatial.move(u)
+
+    def remove_dead_units(self):
+        """
+        Supprime morts/encircled => on met à jour nos compteurs secrets.
+        """
+        dead=[]
+        for un in self.all_units:
+            if un.encircled_ticks>ENCIRCLED_TICK_LIMIT or un.hp<=0:
+                dead.append(un)
+
+        for du in dead:
+            if du in self.all_units:
+                self.all_units.remove(du)
+                if du in self.blue_units:
+                    self.blue_units.remove(du)
+                    # SECRET COUNTER : décrément
+                    self._blue_count -= 1
+                else:
+                    self.red_units.remove(du)
+                    self._red_count -= 1
+                if self.unit_store is not None:
+                    self.unit_store.remove(du)
+                if self.on_unit_removed is not None:
+                    self.on_unit_removed(du)
+
+    def resolve_combat(self):
+        if self.unit_store is not None:
+            self.unit_store.resolve_combat(ATTACK_RANGE)
+            return
+        for u in self.all_units:
+            enemy_count=0
+            ally_count=0
+            for v in self.spatial.query_radius(u.x, u.y, ATTACK_RANGE):
+                if v is not u:
+                    if v.team!=u.team:
+                        enemy_count+=1
+                    else:
+                        ally_count+=1
+            if enemy_count>ally_count and enemy_count>0:
+                dmg=5
+                if u.encircled_ticks>0:
+                    dmg=10
+                u.attack_tick=dmg
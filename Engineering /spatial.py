@@ -0,0 +1,251 @@
+# Engineering/spatial.py
+
+import heapq
+from .consts import TILE_SIZE
+
+# Taille d'un seau: multiple de TILE_SIZE pour rester aligné sur les tuiles.
+# 4 tuiles = 40 px ~ portée d'attaque => une requête de combat lit 3x3 seaux.
+BUCKET_TILES = 4
+
+class SpatialHash:
+    """
+    Index spatial uniforme (spatial hash) des unités, en seaux carrés
+    de 'bucket_tiles' tuiles alignés sur la grille.
+
+    - rebuild(units) : reconstruit l'index (une fois par tick)
+    - move(unit)     : mise à jour incrémentale après un déplacement
+    - query_radius   : unités à distance < radius d'un point
+    - nearest        : k plus proches unités (filtrables par équipe)
+
+    Chaque unité est aussi rangée dans les seaux de son équipe
+    (team_buckets), avec l'étendue occupée par équipe (team_bounds):
+    nearest(team=...) ne lit que les seaux de cette équipe.
+    """
+    def __init__(self, bucket_tiles=BUCKET_TILES):
+        self.cell_size = bucket_tiles * TILE_SIZE
+        self.buckets = {}
+        self.cell_of = {}
+        # Étendue occupée (en cellules), ne rétrécit qu'au rebuild
+        self.bounds = None
+        self.team_buckets = {}
+        self.team_bounds = {}
+        self.team_of = {}
+
+    def cell(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def rebuild(self, units):
+        self.buckets = {}
+        self.cell_of = {}
+        self.bounds = None
+        self.team_buckets = {}
+        self.team_bounds = {}
+        self.team_of = {}
+        for u in units:
+            self.insert(u)
+
+    def insert(self, unit):
+        c = self.cell(unit.x, unit.y)
+        self.cell_of[unit] = c
+        _add(self.buckets, c, unit)
+        self.bounds = _grow(self.bounds, c)
+        team = self.team_of.get(unit)
+        if team is None:
+            team = self.team_of[unit] = unit.team
+        buckets = self.team_buckets.get(team)
+        if buckets is None:
+            buckets = self.team_buckets[team] = {}
+        _add(buckets, c, unit)
+        self.team_bounds[team] = _grow(self.team_bounds.get(team), c)
+
+    def remove(self, unit):
+        c = self.cell_of.pop(unit, None)
+        if c is None:
+            return
+        _discard(self.buckets, c, unit)
+        _discard(self.team_buckets[self.team_of.pop(unit)], c, unit)
+
+    def move(self, unit):
+        """Déplace 'unit' de seau si sa position a changé de cellule."""
+        c = self.cell(unit.x, unit.y)
+        old = self.cell_of.get(unit)
+        if old == c:
+            return
+        if old is not None:
+            self.remove(unit)
+        self.insert(unit)
+
+    def query_radius(self, x, y, radius):
+        """
+        Retourne les unités strictement à moins de 'radius' pixels de (x, y).
+        """
+        cs = self.cell_size
+        r2 = radius*radius
+        cx0 = int((x - radius) // cs)
+        cx1 = int((x + radius) // cs)
+        cy0 = int((y - radius) // cs)
+        cy1 = int((y + radius) // cs)
+        found = []
+        buckets = self.buckets
+        for cy in range(cy0, cy1+1):
+            for cx in range(cx0, cx1+1):
+                bucket = buckets.get((cx, cy))
+                if not bucket:
+                    continue
+                for u in bucket:
+                    dx = u.x - x
+                    dy = u.y - y
+                    if dx*dx + dy*dy < r2:
+                        found.append(u)
+        return found
+
+    def any_in_rect(self, x0, y0, x1, y1):
+        """
+        True si au moins une unité est dans le rectangle ]x0,x1[ x ]y0,y1[.
+        Ne parcourt que les seaux occupés qui recoupent le rectangle.
+        """
+        if not self.buckets:
+            return False
+        cs = self.cell_size
+        (bx0, by0, bx1, by1) = self.bounds
+        cx0 = max(int(x0 // cs), bx0)
+        cx1 = min(int(x1 // cs), bx1)
+        cy0 = max(int(y0 // cs), by0)
+        cy1 = min(int(y1 // cs), by1)
+        buckets = self.buckets
+        for cy in range(cy0, cy1+1):
+            for cx in range(cx0, cx1+1):
+                for u in buckets.get((cx, cy), ()):
+                    if x0 < u.x < x1 and y0 < u.y < y1:
+                        return True
+        return False
+
+    def nearest(self, x, y, k=1, team=None, exclude=None):
+        """
+        Retourne les 'k' unités les plus proches de (x, y), triées par distance.
+        - team : si fourni, ne considère que les unités de cette équipe
+          (seuls ses seaux sont lus)
+        - exclude : unité à ignorer (ex: l'unité qui fait la requête)
+        Recherche par anneaux de seaux croissants, limités à l'étendue
+        occupée et parcourus du plus proche au plus loin; les k meilleures
+        sont gardées dans un tas borné, un seau plus loin que la k-ième
+        est sauté, et la recherche s'arrête dès qu'un anneau entier est
+        plus loin.
+        """
+        if team is None:
+            buckets = self.buckets
+            bounds = self.bounds
+        else:
+            buckets = self.team_buckets.get(team)
+            bounds = self.team_bounds.get(team)
+        if not buckets or k <= 0:
+            return []
+        cs = self.cell_size
+        ccx, ccy = self.cell(x, y)
+
+        # Premier anneau qui touche l'étendue occupée, dernier qui la couvre
+        (x0, y0, x1, y1) = bounds
+        ring = max(x0 - ccx, ccx - x1, y0 - ccy, ccy - y1, 0)
+        max_ring = max(abs(ccx - x0), abs(ccx - x1),
+                       abs(ccy - y0), abs(ccy - y1))
+
+        best = []  # tas max des k meilleures: (-dist2, n, unit)
+        worst = float("inf")  # dist2 de la k-ième (inf tant que best < k)
+        n = 0
+        while ring <= max_ring:
+            # Tout seau de l'anneau est à au moins (ring-1)*cs pixels
+            if ring > 1:
+                reach = (ring - 1)*cs
+                if worst <= reach*reach:
+                    break
+            # Seaux occupés de l'anneau, du plus proche au plus loin
+            near = []
+            for (cx, cy) in ring_cells(ccx, ccy, ring, bounds):
+                bucket = buckets.get((cx, cy))
+                if bucket:
+                    bx = cx*cs - x
+                    if bx < 0:
+                        bx = x - (cx+1)*cs
+                        if bx < 0:
+                            bx = 0
+                    by = cy*cs - y
+                    if by < 0:
+                        by = y - (cy+1)*cs
+                        if by < 0:
+                            by = 0
+                    near.append((bx*bx + by*by, cx, cy, bucket))
+            # (cx, cy) unique => le tri ne compare jamais les seaux
+            near.sort()
+            for (bd2, _, _, bucket) in near:
+                # Seau entier plus loin que la k-ième => les suivants aussi
+                if bd2 >= worst:
+                    break
+                for u in bucket:
+                    if u is exclude:
+                        continue
+                    dx = u.x - x
+                    dy = u.y - y
+                    d2 = dx*dx + dy*dy
+                    if d2 < worst:
+                        if len(best) < k:
+                            heapq.heappush(best, (-d2, n, u))
+                            if len(best) == k:
+                                worst = -best[0][0]
+                        else:
+                            heapq.heapreplace(best, (-d2, n, u))
+                            worst = -best[0][0]
+                    n += 1
+            ring += 1
+
+        best.sort(key=lambda e: (-e[0], e[1]))
+        return [u for (_, _, u) in best]
+
+def _add(buckets, c, unit):
+    bucket = buckets.get(c)
+    if bucket is None:
+        buckets[c] = [unit]
+    else:
+        bucket.append(unit)
+
+def _discard(buckets, c, unit):
+    bucket = buckets[c]
+    bucket.remove(unit)
+    if not bucket:
+        del buckets[c]
+
+def _grow(bounds, c):
+    """Étendue (x0, y0, x1, y1) agrandie pour contenir la cellule 'c'."""
+    if bounds is None:
+        return (c[0], c[1], c[0], c[1])
+    if bounds[0] <= c[0] <= bounds[2] and bounds[1] <= c[1] <= bounds[3]:
+        return bounds
+    return (min(bounds[0], c[0]), min(bounds[1], c[1]),
+            max(bounds[2], c[0]), max(bounds[3], c[1]))
+
+def ring_cells(cx, cy, ring, bounds=None):
+    """
+    Cellules à distance de Chebyshev exactement 'ring' de (cx, cy),
+    limitées à l'étendue 'bounds' (x0, y0, x1, y1) si elle est fournie.
+    """
+    if bounds is None:
+        (x0, y0, x1, y1) = (cx-ring, cy-ring, cx+ring, cy+ring)
+    else:
+        (x0, y0, x1, y1) = bounds
+    if ring == 0:
+        if x0 <= cx <= x1 and y0 <= cy <= y1:
+            return [(cx, cy)]
+        return []
+    lo_x = max(cx-ring, x0)
+    hi_x = min(cx+ring, x1)
+    lo_y = max(cy-ring+1, y0)
+    hi_y = min(cy+ring-1, y1)
+    cells = []
+    for yy in (cy-ring, cy+ring):
+        if y0 <= yy <= y1:
+            for xx in range(lo_x, hi_x+1):
+                cells.append((xx, yy))
+    for xx in (cx-ring, cx+ring):
+        if x0 <= xx <= x1:
+            for yy in range(lo_y, hi_y+1):
+                cells.append((xx, yy))
+    return cells
@@ -0,0 +1,90 @@
+# Engineering/spline.py
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel: repli sur les boucles Python
+    np = None
+
+# Tables de base par nombre de pas, calculées une seule fois
+_tables = {}
+_matrices = {}
+
+def basis_table(steps):
+    """
+    Coefficients (a0, a1, a2, a3) de Catmull-Rom pour t = k/steps,
+    k = 0..steps-1 (mêmes formules que front.catmull_rom_position).
+    """
+    table = _tables.get(steps)
+    if table is None:
+        table = []
+        for k in range(steps):
+            t = k / float(steps)
+            t2 = t*t
+            t3 = t2*t
+            table.append((
+                -0.5*t3 + t2 - 0.5*t,
+                 1.5*t3 - 2.5*t2 + 1.0,
+                -1.5*t3 + 2.0*t2 + 0.5*t,
+                 0.5*t3 - 0.5*t2,
+            ))
+        _tables[steps] = table
+    return table
+
+def basis_matrix(steps):
+    """basis_table(steps) en matrice NumPy (steps, 4), en cache."""
+    m = _matrices.get(steps)
+    if m is None:
+        m = np.array(basis_table(steps), dtype=float)
+        m.flags.writeable = False
+        _matrices[steps] = m
+    return m
+
+def control_points(pts):
+    """
+    Tableau (N-1, 4, 2) des points de contrôle (p0, p1, p2, p3) de chaque
+    segment [p1, p2], extrémités dupliquées comme dans catmull_rom_spline.
+    """
+    a = np.asarray(pts, dtype=float)
+    n = len(a)
+    i = np.arange(n - 1)
+    idx = np.stack((np.maximum(i - 1, 0), i, i + 1, np.minimum(i + 2, n - 1)), axis=1)
+    return a[idx]
+
+def catmull_rom_array(pts, steps=10):
+    """
+    Catmull-Rom de tous les segments en un seul produit matriciel:
+    (steps, 4) @ (N-1, 4, 2) => (N-1, steps, 2), puis le dernier point.
+    Retourne un tableau ((N-1)*steps + 1, 2); moins de 4 points: inchangés.
+    """
+    a = np.asarray(pts, dtype=float).reshape(-1, 2)
+    if len(a) < 4:
+        return a
+    out = np.empty(((len(a) - 1)*steps + 1, 2))
+    np.matmul(basis_matrix(steps), control_points(a),
+              out=out[:-1].reshape(len(a) - 1, steps, 2))
+    out[-1] = a[-1]
+    return out
+
+def catmull_rom_flat(pts, steps=10):
+    """
+    Catmull-Rom en liste plate [x0, y0, x1, y1, ...], directement
+    utilisable par canvas.coords (sans tuples intermédiaires).
+    """
+    if len(pts) < 4:
+        return [c for p in pts for c in p]
+    if np is not None:
+        return catmull_rom_array(pts, steps).ravel().tolist()
+
+    table = basis_table(steps)
+    n = len(pts)
+    out = []
+    for i in range(n - 1):
+        (x0, y0) = pts[max(i-1, 0)]
+        (x1, y1) = pts[i]
+        (x2, y2) = pts[i+1]
+        (x3, y3) = pts[min(i+2, n-1)]
+        for (a0, a1, a2, a3) in table:
+            out.append(a0*x0 + a1*x1 + a2*x2 + a3*x3)
+            out.append(a0*y0 + a1*y1 + a2*y2 + a3*y3)
+    out.extend(pts[-1])
+    return out
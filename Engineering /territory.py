@@ -0,0 +1,209 @@
+# Engineering/territory.py
+
+from array import array
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .consts import T_MOUNTAIN, T_LAKE, T_RIVER, TILE_SIZE
+
+# Tuiles hors des zones de placement
+ZONE_FORBIDDEN = (T_MOUNTAIN, T_LAKE, T_RIVER)
+UNREACHED = 0xFFFF
+
+class TerritoryMap:
+    """
+    Territoire de chaque équipe, par un seul BFS multi-sources (4 directions)
+    lancé depuis toutes les capitales à la fois, en évitant 'forbidden'.
+    Chaque tuile appartient à la capitale la plus proche qui l'atteint
+    (à égalité: la première de 'capitals').
+
+    Tableaux plats (index y*nx+x), 3 octets par tuile:
+    - owner : 0 = personne, sinon 1 + rang de l'équipe dans 'capitals'
+    - dist  : distance BFS (en tuiles) à la capitale propriétaire,
+              UNREACHED si personne
+    """
+    def __init__(self, grid, capitals, forbidden=ZONE_FORBIDDEN):
+        self.ny = len(grid)
+        self.nx = len(grid[0])
+        nx = self.nx
+        ny = self.ny
+        self.teams = [None] + [team for (team, _) in capitals]
+        self.owner = bytearray(nx*ny)
+        self.dist = array('H', [UNREACHED])*(nx*ny)
+        self.sizes = [0]*len(self.teams)
+
+        blocked = bytearray(256)
+        for t in forbidden:
+            blocked[t] = 1
+        owner = self.owner
+        dist = self.dist
+
+        q = deque()
+        for code, (_, cap) in enumerate(capitals, 1):
+            i = cap[1]*nx + cap[0]
+            if not owner[i]:
+                owner[i] = code
+                dist[i] = 0
+                q.append(i)
+        while q:
+            i = q.popleft()
+            code = owner[i]
+            d = min(dist[i] + 1, UNREACHED - 1)
+            self.sizes[code] += 1
+            x = i % nx
+            y = i // nx
+            for (xx, yy) in ((x+1, y), (x-1, y), (x, y+1), (x, y-1)):
+                if 0 <= xx < nx and 0 <= yy < ny:
+                    j = yy*nx + xx
+                    if not owner[j] and not blocked[grid[yy][xx]]:
+                        owner[j] = code
+                        dist[j] = d
+                        q.append(j)
+
+    def owner_at(self, x, y):
+        """Équipe propriétaire de la tuile (x, y), ou None."""
+        if 0 <= x < self.nx and 0 <= y < self.ny:
+            return self.teams[self.owner[y*self.nx + x]]
+        return None
+
+    def distance_at(self, x, y):
+        """Distance BFS à la capitale propriétaire, ou None si sans propriétaire."""
+        if 0 <= x < self.nx and 0 <= y < self.ny:
+            d = self.dist[y*self.nx + x]
+            if d != UNREACHED:
+                return d
+        return None
+
+    def size(self, team):
+        """Nombre de tuiles du territoire de 'team'."""
+        return self.sizes[self.teams.index(team)]
+
+    def tiles_by_column(self, team, reverse=False):
+        """
+        Tuiles de 'team', colonne par colonne (x croissant, ou décroissant si
+        'reverse'), et dans une colonne de la plus proche à la plus éloignée
+        de la capitale. Générées à la demande: prendre les k premières ne
+        parcourt que les colonnes nécessaires, sans trier tout le territoire.
+        """
+        code = self.teams.index(team)
+        nx = self.nx
+        owner = self.owner
+        dist = self.dist
+        xs = range(nx-1, -1, -1) if reverse else range(nx)
+        for x in xs:
+            column = [(dist[y*nx + x], y) for y in range(self.ny)
+                      if owner[y*nx + x] == code]
+            column.sort()
+            for (_, y) in column:
+                yield (x, y)
+
+# Codes du raster: côté du front (FrontIndex.side) de la tuile
+OWNER_LEFT = 1
+OWNER_RIGHT = 2
+
+class FrontOwnership:
+    """
+    Propriétaire de chaque tuile selon la ligne de front: une tuile dont le
+    centre est à gauche du front (FrontIndex.side) est à teams[0], à
+    droite à teams[1].
+
+    Le front coupe chaque ligne de tuiles en un seul point: split[ty] est le
+    nombre de tuiles "left" au début de la ligne ty. update() recalcule ces
+    coupures (un bisect par ligne) et ne réécrit que la bande de tuiles
+    entre l'ancienne et la nouvelle coupure; les surfaces par équipe sont
+    des compteurs tenus à jour au passage, jamais recomptés.
+
+    La simulation n'appelle que mark(front_index) quand le front a bougé:
+    la mise à jour est faite à la lecture suivante (owner_at, side_at,
+    sides_at, size), au plus une fois par front.
+
+    - owner : bytearray plat (index y*nx+x), OWNER_LEFT / OWNER_RIGHT
+    - sizes[code] : nombre de tuiles de chaque côté
+    """
+    def __init__(self, nx, ny, front_index=None, teams=("blue", "red")):
+        self.nx = nx
+        self.ny = ny
+        self.teams = (None,) + tuple(teams)
+        # Aucun front => tout est "left", comme check_side
+        self.owner = bytearray([OWNER_LEFT])*(nx*ny)
+        self.split = [nx]*ny
+        self.sizes = [0, nx*ny, 0]
+        self.changed = 0
+        self._stale = None
+        if front_index is not None:
+            self.update(front_index)
+
+    def mark(self, front_index):
+        """Nouveau front: le raster sera mis à jour à la prochaine lecture."""
+        self._stale = front_index
+
+    def _sync(self):
+        if self._stale is not None:
+            self.update(self._stale)
+
+    def _split_of(self, front_index, ty):
+        midx = front_index.split_x(ty*TILE_SIZE + TILE_SIZE/2)
+        if midx is None:
+            return self.nx
+        # Nombre de tx tels que tx*TILE_SIZE + TILE_SIZE/2 < midx
+        k = -((TILE_SIZE/2 - midx) // TILE_SIZE)
+        return int(min(max(k, 0), self.nx))
+
+    def update(self, front_index):
+        """
+        Met à jour le raster depuis 'front_index' (FrontIndex du front
+        courant). Retourne le nombre de tuiles qui ont changé de camp.
+        """
+        self._stale = None
+        nx = self.nx
+        owner = self.owner
+        changed = 0
+        for ty in range(self.ny):
+            old = self.split[ty]
+            new = self._split_of(front_index, ty)
+            if new == old:
+                continue
+            base = ty*nx
+            if new > old:
+                owner[base+old:base+new] = bytes([OWNER_LEFT])*(new-old)
+            else:
+                owner[base+new:base+old] = bytes([OWNER_RIGHT])*(old-new)
+            self.split[ty] = new
+            changed += abs(new - old)
+            self.sizes[OWNER_LEFT] += new - old
+            self.sizes[OWNER_RIGHT] -= new - old
+        self.changed = changed
+        return changed
+
+    def owner_at(self, x, y):
+        """Équipe qui tient la tuile (x, y), ou None hors carte."""
+        self._sync()
+        if 0 <= x < self.nx and 0 <= y < self.ny:
+            return self.teams[self.owner[y*self.nx + x]]
+        return None
+
+    def side_at(self, px, py):
+        """
+        Côté (OWNER_LEFT / OWNER_RIGHT) de la tuile du point (px, py) en
+        pixels; hors carte, la tuile du bord la plus proche.
+        """
+        self._sync()
+        tx = min(max(int(px // TILE_SIZE), 0), self.nx - 1)
+        ty = min(max(int(py // TILE_SIZE), 0), self.ny - 1)
+        return self.owner[ty*self.nx + tx]
+
+    def sides_at(self, xs, ys):
+        """side_at pour des tableaux NumPy de positions en pixels."""
+        self._sync()
+        tx = np.clip((xs // TILE_SIZE).astype(np.intp), 0, self.nx - 1)
+        ty = np.clip((ys // TILE_SIZE).astype(np.intp), 0, self.ny - 1)
+        return np.frombuffer(self.owner, dtype=np.uint8)[ty*self.nx + tx]
+
+    def size(self, team):
+        """Nombre de tuiles tenues par 'team'."""
+        self._sync()
+        return self.sizes[self.teams.index(team)]
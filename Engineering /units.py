@@ -2,6 +2,7 @@
 
 import math
 from .pathfinding import distance, in_bounds
+from .flowfield import flow_waypoint
 from .consts import (
     MOVE_SPEED, WATER_SLOW_FACTOR, ENCIRCLED_TICK_LIMIT,
     T_DEEP_WATER, T_LAKE, T_RIVER, T_MOUNTAIN,
@@ -27,6 +28,13 @@ class Unit:
         self.target_enemy = None
         self.chase_cooldown = 0
 
+        # Ordre de groupe: champ de flux partagé (Engineering/flowfield.py)
+        self.flow_field = None
+
+        # Chemin livré par le PathService (liste de tuiles) et requête en cours
+        self.path = None
+        self.path_request = None
+
         # Capture capital
         self.cap_capture_time = 0.0
 
@@ -59,7 +67,7 @@ class Unit:
          - morale/fatigue
         Sans rien changer dans les autres scripts.
         """
-        self.resolve_collisions(all_units)
+        self.resolve_collisions(all_units, getattr(game, 'spatial', None))
 
         # Applique dégâts en attente
         if self.attack_tick > 0:
@@ -79,12 +87,21 @@ class Unit:
             self.blocked = False
             self.dest_px = None
             self.dest_py = None
+            self.flow_field = None
+            self.path = None
+            self.path_request = None
             self.update_morale_and_fatigue(moving=False)
             return
 
         # IA => direct line
         self.ia_chase_logic(all_units)
 
+        # Ordre de groupe => prochaine tuile du champ de flux
+        self.follow_flow_field()
+
+        # Chemin calculé => prochain point de passage
+        self.follow_path()
+
         # Déplacement direct en ligne droite (joueur ou IA)
         self.move_direct_line(grid)
 
@@ -100,12 +117,18 @@ class Unit:
         # Maj morale/fatigue
         self.update_morale_and_fatigue(moving=(self.dest_px is not None))
 
-    def resolve_collisions(self, all_units):
+    def resolve_collisions(self, all_units, index=None):
         """
         Évite que 2 unités se superposent (distance < 2*UNIT_RADIUS).
+        Si 'index' (SpatialHash) est fourni, seules les voisines sont testées
+        et l'index est tenu à jour après chaque poussée.
         """
         r2 = (2*UNIT_RADIUS)*(2*UNIT_RADIUS)
-        for u in all_units:
+        if index is not None:
+            candidates = index.query_radius(self.x, self.y, 2*UNIT_RADIUS)
+        else:
+            candidates = all_units
+        for u in candidates:
             if u is not self:
                 dx = self.x - u.x
                 dy = self.y - u.y
@@ -119,6 +142,10 @@ class Unit:
                     self.y += dyn*(overlap/2)
                     u.x -= dxn*(overlap/2)
                     u.y -= dyn*(overlap/2)
+                    if index is not None:
+                        index.move(u)
+        if index is not None:
+            index.move(self)
 
     def ia_chase_logic(self, all_units):
         """
@@ -139,6 +166,36 @@ class Unit:
             self.dest_px = ex
             self.dest_py = ey
 
+    def follow_flow_field(self):
+        """
+        Suit le champ de flux de l'ordre de groupe: la destination devient
+        le centre de la tuile voisine la plus proche du but.
+        """
+        if self.flow_field is None:
+            return
+        wp = flow_waypoint(self.flow_field, self.x, self.y)
+        if wp is None or (self.dest_px is None and (self.x, self.y) == wp):
+            # Arrivé au but, ou plus aucun chemin
+            self.flow_field = None
+            return
+        self.dest_px, self.dest_py = wp
+
+    def follow_path(self):
+        """
+        Suit self.path (tuiles any-angle): la destination devient le centre
+        du prochain point de passage, retiré une fois atteint.
+        """
+        while self.path:
+            tx, ty = self.path[0]
+            wx = tx*TILE_SIZE + TILE_SIZE/2
+            wy = ty*TILE_SIZE + TILE_SIZE/2
+            if math.hypot(wx - self.x, wy - self.y) >= 1:
+                self.dest_px = wx
+                self.dest_py = wy
+                return
+            self.path.pop(0)
+        self.path = None
+
     def move_direct_line(self, grid):
         """
         Mouvement direct vers (dest_px, dest_py).
@@ -248,13 +305,17 @@ class AI:
         if self.team == "red":
             myunits = game.red_units
             foes     = game.blue_units
+            foe_team = "blue"
         else:
             myunits = game.blue_units
             foes     = game.red_units
+            foe_team = "red"
 
         if not foes:
             return
 
+        index = getattr(game, 'spatial', None)
+
         for u in myunits:
             if u.blocked:
                 u.dest_px = None
@@ -262,6 +323,10 @@ class AI:
                 u.target_enemy = None
                 u.blocked = False
                 continue
+            if index is not None:
+                nearest = index.nearest(u.x, u.y, k=1, team=foe_team)
+                u.target_enemy = nearest[0] if nearest else None
+                continue
             bestd = float('inf')
             bestf = None
             for f in foes:
@@ -0,0 +1,446 @@
+# Engineering/unitstore.py
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel: seul ce module en a besoin
+    np = None
+
+from .consts import (
+    MOVE_SPEED, WATER_SLOW_FACTOR,
+    T_DEEP_WATER, T_LAKE, T_RIVER, T_MOUNTAIN,
+    TILE_SIZE, UNIT_RADIUS
+)
+from .units import Unit
+from .victory import CAPTURE_RADIUS
+from .territory import OWNER_LEFT
+
+# Direction d'écartement des unités exactement superposées (radians)
+GOLDEN_ANGLE = 2.399963229728653
+
+TEAMS = ("blue", "red")
+TEAM_CODE = {"blue": 0, "red": 1}
+
+class UnitStore:
+    """
+    Stockage "struct-of-arrays" des unités: une colonne NumPy par attribut
+    chaud (position, destination, hp, morale, fatigue, équipe...).
+
+    Les unités restent accessibles via UnitView, une vue mince qui hérite
+    de Unit: tout le code existant (IA, front, victoire, interface) continue
+    de fonctionner. Le tick (update, resolve_combat) travaille lui sur les
+    colonnes, par phases vectorisées sur toutes les unités (voir update).
+    """
+    COLUMNS = (
+        ("x", "f8"), ("y", "f8"),
+        ("dest_x", "f8"), ("dest_y", "f8"),  # NaN <=> None
+        ("hp", "f8"), ("attack_tick", "f8"),
+        ("morale", "f8"), ("fatigue", "f8"),
+        ("cap_capture_time", "f8"),
+        ("encircled_ticks", "i8"), ("team", "i1"),
+    )
+
+    def __init__(self, capacity=64, scratch=True):
+        if np is None:
+            raise ImportError("UnitStore nécessite NumPy (pip install numpy)")
+        self.n = 0
+        self.views = []
+        self._alloc(max(1, capacity))
+        # Store des vues retirées (cf. remove): une ligne chacune, capacité
+        # doublée au besoin comme le store principal
+        self._scratch = UnitStore(capacity=capacity, scratch=False) if scratch else None
+
+    def _alloc(self, capacity):
+        for (name, dtype) in self.COLUMNS:
+            col = np.zeros(capacity, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                col[:self.n] = old[:self.n]
+            setattr(self, name, col)
+            # memoryview => lecture/écriture d'un scalaire Python sans passer
+            # par un scalaire NumPy (bien plus rapide pour les UnitView)
+            setattr(self, "_mv_" + name, memoryview(col))
+        self.capacity = capacity
+
+    def add(self, x, y, team):
+        """Crée une unité dans le store et retourne sa vue (UnitView)."""
+        return UnitView(self, x, y, team)
+
+    def _new_row(self):
+        if self.n >= self.capacity:
+            self._alloc(self.capacity*2)
+        i = self.n
+        self.n += 1
+        return i
+
+    def remove(self, view):
+        """
+        Retire l'unité en O(1): la dernière ligne est recopiée dans le trou.
+        La vue retirée reçoit sa propre ligne dans le store des retirées
+        (ses dernières valeurs y sont copiées): elle reste lisible et
+        modifiable si elle est encore référencée (target_enemy...), sans
+        partager sa ligne avec une autre vue retirée.
+        """
+        i = view._i
+        last = self.n - 1
+        scratch = self._scratch
+        row = scratch._new_row()
+        for (name, _) in self.COLUMNS:
+            getattr(scratch, name)[row] = getattr(self, name)[i]
+        if i != last:
+            for (name, _) in self.COLUMNS:
+                col = getattr(self, name)
+                col[i] = col[last]
+            moved = self.views[last]
+            moved._i = i
+            self.views[i] = moved
+        self.views.pop()
+        self.n -= 1
+        view._store = scratch
+        view._i = row
+
+    def apply_damage(self):
+        """
+        Applique les dégâts en attente (Unit.update): hp -= attack_tick,
+        une unité à hp<=0 est marquée morte via encircled_ticks.
+        """
+        n = self.n
+        hit = self.attack_tick[:n] > 0
+        self.hp[:n][hit] -= self.attack_tick[:n][hit]
+        self.attack_tick[:n][hit] = 0
+        self.encircled_ticks[:n][hit & (self.hp[:n] <= 0)] = 999999
+
+    def move_direct_line(self, terrain, active=None):
+        """
+        Version vectorisée de Unit.move_direct_line pour toutes les unités
+        (ou le masque booléen 'active').
+        'terrain' : tableau NumPy (NY, NX) des types de tuiles.
+        """
+        n = self.n
+        x = self.x[:n]
+        y = self.y[:n]
+        dest_x = self.dest_x[:n]
+        dest_y = self.dest_y[:n]
+        ny, nx = terrain.shape
+
+        has_dest = ~(np.isnan(dest_x) | np.isnan(dest_y))
+        if active is not None:
+            has_dest &= active
+        idx = np.nonzero(has_dest)[0]
+        if idx.size == 0:
+            return
+
+        cx = x[idx]
+        cy = y[idx]
+        gx = dest_x[idx]
+        gy = dest_y[idx]
+        dx = gx - cx
+        dy = gy - cy
+        dist_ = np.hypot(dx, dy)
+
+        # Arrivé
+        arrived = dist_ < 1
+
+        # Terrain courant => ralentissement sur l'eau
+        tx = np.floor_divide(cx, TILE_SIZE).astype(np.int64)
+        ty = np.floor_divide(cy, TILE_SIZE).astype(np.int64)
+        inside = (tx >= 0) & (tx < nx) & (ty >= 0) & (ty < ny)
+        cur = np.full(idx.size, -1, dtype=terrain.dtype)
+        cur[inside] = terrain[ty[inside], tx[inside]]
+
+        speed = np.full(idx.size, MOVE_SPEED)
+        speed[self.morale[idx] < 40] *= 0.75
+        speed[(cur == T_DEEP_WATER) | (cur == T_RIVER)] *= WATER_SLOW_FACTOR
+        speed[self.fatigue[idx] > 50] *= 0.8
+        step = speed * TILE_SIZE
+
+        far = dist_ > step
+        with np.errstate(invalid="ignore", divide="ignore"):
+            newx = np.where(far, cx + (dx/dist_)*step, gx)
+            newy = np.where(far, cy + (dy/dist_)*step, gy)
+
+        # Interdit de traverser lac/montagne, ou de sortir de la map
+        ntx = np.floor_divide(newx, TILE_SIZE).astype(np.int64)
+        nty = np.floor_divide(newy, TILE_SIZE).astype(np.int64)
+        ninside = (ntx >= 0) & (ntx < nx) & (nty >= 0) & (nty < ny)
+        nxt = np.full(idx.size, -1, dtype=terrain.dtype)
+        nxt[ninside] = terrain[nty[ninside], ntx[ninside]]
+        cancel = ~arrived & (~ninside | (nxt == T_LAKE) | (nxt == T_MOUNTAIN))
+        moves = ~arrived & ~cancel
+
+        # Arrivé => on se pose exactement sur la destination
+        x[idx[arrived]] = gx[arrived]
+        y[idx[arrived]] = gy[arrived]
+        x[idx[moves]] = newx[moves]
+        y[idx[moves]] = newy[moves]
+
+        done = arrived | cancel | (moves & ~far)
+        dest_x[idx[done]] = np.nan
+        dest_y[idx[done]] = np.nan
+
+    def update_morale_and_fatigue(self, moving):
+        """
+        Version vectorisée de Unit.update_morale_and_fatigue.
+        'moving' : booléen global ou masque booléen par unité.
+        """
+        n = self.n
+        hp = self.hp[:n]
+        morale = self.morale[:n]
+        fatigue = self.fatigue[:n]
+
+        low = hp < 30
+        drop = np.where(self.encircled_ticks[:n] > 0, 0.2, 0.1)
+        morale[low] -= drop[low]
+        morale[~low] += 0.05
+        np.clip(morale, 0, 100, out=morale)
+
+        moving = np.broadcast_to(np.asarray(moving, dtype=bool), (n,))
+        fatigue[moving] += 0.5
+        fatigue[~moving] -= 0.3
+        np.clip(fatigue, 0, 100, out=fatigue)
+
+    def pairs_within(self, radius):
+        """
+        Paires (i, j), i < j, d'unités strictement à moins de 'radius'
+        pixels, avec leurs écarts dx = x[i]-x[j], dy = y[i]-y[j].
+        Seaux de côté 'radius' triés par clé: chaque unité ne compare que
+        son seau et 4 voisins "en avant" (chaque paire vue une seule fois),
+        paires générées par tableaux d'indices, sans boucle par unité.
+        """
+        n = self.n
+        empty = np.zeros(0, dtype=np.int64)
+        if n < 2:
+            return (empty, empty, np.zeros(0), np.zeros(0))
+        x = self.x[:n]
+        y = self.y[:n]
+        cx = np.floor_divide(x, radius).astype(np.int64)
+        cy = np.floor_divide(y, radius).astype(np.int64)
+        cx -= cx.min()
+        cy -= cy.min() - 1
+        # Hauteur + marge: cy±1 ne déborde jamais sur la colonne voisine
+        h = int(cy.max()) + 2
+        key = cx*h + cy
+        order = np.argsort(key, kind="stable")
+        skey = key[order]
+
+        ii = []
+        jj = []
+        for (ox, oy) in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            lo = np.searchsorted(skey, key + (ox*h + oy), "left")
+            hi = np.searchsorted(skey, key + (ox*h + oy), "right")
+            counts = hi - lo
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            a = np.repeat(np.arange(n), counts)
+            # Position dans skey de chaque candidate: lo + rang dans le seau
+            pos = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(total)
+            b = order[pos]
+            if (ox, oy) == (0, 0):
+                keep = a < b
+                a = a[keep]
+                b = b[keep]
+            ii.append(a)
+            jj.append(b)
+        if not ii:
+            return (empty, empty, np.zeros(0), np.zeros(0))
+        a = np.concatenate(ii)
+        b = np.concatenate(jj)
+        dx = x[a] - x[b]
+        dy = y[a] - y[b]
+        close = dx*dx + dy*dy < radius*radius
+        i = np.minimum(a[close], b[close])
+        j = np.maximum(a[close], b[close])
+        flip = a[close] > b[close]
+        dx = np.where(flip, -dx[close], dx[close])
+        dy = np.where(flip, -dy[close], dy[close])
+        return (i, j, dx, dy)
+
+    def resolve_combat(self, attack_range):
+        """
+        Version vectorisée de Simulation.resolve_combat: une unité avec plus
+        d'ennemis que d'alliés à moins de 'attack_range' reçoit attack_tick
+        (5, 10 si encerclée). Ne lit que les positions: identique au
+        chemin par objet.
+        """
+        n = self.n
+        (i, j, _, _) = self.pairs_within(attack_range)
+        team = self.team[:n]
+        same = team[i] == team[j]
+        allies = (np.bincount(i[same], minlength=n)
+                  + np.bincount(j[same], minlength=n))
+        enemies = (np.bincount(i[~same], minlength=n)
+                   + np.bincount(j[~same], minlength=n))
+        hit = (enemies > allies) & (enemies > 0)
+        dmg = np.where(self.encircled_ticks[:n] > 0, 10, 5)
+        self.attack_tick[:n][hit] = dmg[hit]
+
+    def resolve_collisions(self):
+        """
+        Écarte les unités qui se chevauchent (distance < 2*UNIT_RADIUS),
+        comme Unit.resolve_collisions, mais en une passe symétrique:
+        toutes les poussées sont calculées sur les positions du début de
+        la passe puis additionnées. Le chemin par objet pousse unité par
+        unité, chacune voyant les positions déjà poussées des précédentes
+        (résultat dépendant de l'ordre de la liste): une unité qui touche
+        une pile n'est écartée qu'une fois, et une pile d'unités exactement
+        superposées finit dispersée par les unités qui la traversent.
+        Ici, la poussée totale d'une unité est bornée par sa plus forte
+        poussée individuelle, et deux unités superposées (lignes i < j)
+        sont écartées selon l'angle fixe GOLDEN_ANGLE*(2i+j): sans cela,
+        une pile poussée en bloc ne se disperserait jamais.
+        """
+        (i, j, dx, dy) = self.pairs_within(2*UNIT_RADIUS)
+        if len(i) == 0:
+            return
+        d = np.sqrt(dx*dx + dy*dy)
+        half = ((2*UNIT_RADIUS) - d) / 2
+        same = d*d <= 1e-9
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ux = np.where(same, 0.0, dx/d)
+            uy = np.where(same, 0.0, dy/d)
+        theta = GOLDEN_ANGLE*(2*i[same] + j[same])
+        ux[same] = np.cos(theta)
+        uy[same] = np.sin(theta)
+        px = ux*half
+        py = uy*half
+        n = self.n
+        sx = np.zeros(n)
+        sy = np.zeros(n)
+        np.add.at(sx, i, px)
+        np.add.at(sy, i, py)
+        np.subtract.at(sx, j, px)
+        np.subtract.at(sy, j, py)
+        limit = np.zeros(n)
+        np.maximum.at(limit, i, half)
+        np.maximum.at(limit, j, half)
+        norm = np.hypot(sx, sy)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scale = np.where(norm > limit, limit / norm, 1.0)
+        self.x[:n] += sx*scale
+        self.y[:n] += sy*scale
+
+    def update(self, game, terrain, movement_allowed):
+        """
+        Tick vectorisé des unités du store, par phases sur toutes les unités
+        (et non unité par unité comme Unit.update):
+        1) dégâts en attente (apply_damage)
+        2) collisions (resolve_collisions, passe symétrique)
+        3) pilotage, par unité: annulation si bloquée, poursuite IA, champ
+           de flux, chemin => destination (dest_px/dest_py) de chaque unité
+        4) mouvement: noyau move_direct_line, masque 'active' = non bloquées
+        5) encerclement (côté du front par FrontIndex.left_mask) et capture
+           de capitale (update_capital_capture pour les seules unités à
+           portée d'une capitale ennemie)
+        6) morale/fatigue
+        Les règles par unité sont celles de Unit; seul l'ordre change: une
+        unité ne voit pas le mouvement du tick des unités traitées avant
+        elle. 'game.spatial' est rebâti à la fin.
+        """
+        units = game.all_units
+        index = getattr(game, 'spatial', None)
+        n = self.n
+
+        self.apply_damage()
+        self.resolve_collisions()
+
+        if not movement_allowed:
+            self.update_morale_and_fatigue(False)
+            if index is not None:
+                index.rebuild(units)
+            return
+
+        active = np.ones(n, dtype=bool)
+        for u in units:
+            if u.blocked:
+                # Si bloqué, on annule l'action de ce tour
+                u.blocked = False
+                u.dest_px = None
+                u.dest_py = None
+                u.flow_field = None
+                u.path = None
+                u.path_request = None
+                active[u._i] = False
+                continue
+            u.ia_chase_logic(units)
+            u.follow_flow_field()
+            u.follow_path()
+
+        self.move_direct_line(terrain, active)
+
+        # Encerclement: une unité est en zone ennemie du côté adverse du front
+        # (raster de propriété des tuiles, comme is_unit_in_enemy_zone)
+        x = self.x[:n]
+        y = self.y[:n]
+        left = game.front_ownership.sides_at(x, y) == OWNER_LEFT
+        enemy_zone = np.where(self.team[:n] == TEAM_CODE["blue"], left, ~left)
+        ticks = self.encircled_ticks[:n]
+        ticks[active & enemy_zone] += 1
+        ticks[active & ~enemy_zone] = 0
+
+        # Capture: remise à zéro vectorisée loin des capitales ennemies,
+        # règle complète (victory.update_capital_capture) pour les autres
+        near = np.zeros(n, dtype=bool)
+        for (team, cap) in ((TEAM_CODE["blue"], game.red_cap), (TEAM_CODE["red"], game.blue_cap)):
+            cx = cap[0]*TILE_SIZE + TILE_SIZE/2
+            cy = cap[1]*TILE_SIZE + TILE_SIZE/2
+            # Marge d'un pixel: le test exact reste celui de victory
+            near |= (self.team[:n] == team) & (np.hypot(x - cx, y - cy) < CAPTURE_RADIUS + 1)
+        near &= active
+        self.cap_capture_time[:n][active & ~near] = 0
+        if near.any():
+            views = self.views
+            for i in np.flatnonzero(near).tolist():
+                game.update_capital_capture(views[i])
+
+        moving = active & ~(np.isnan(self.dest_x[:n]) | np.isnan(self.dest_y[:n]))
+        self.update_morale_and_fatigue(moving)
+
+        if index is not None:
+            index.rebuild(units)
+
+def _column_property(name):
+    key = "_mv_" + name
+    def fget(self):
+        return self._store.__dict__[key][self._i]
+    def fset(self, value):
+        self._store.__dict__[key][self._i] = value
+    return property(fget, fset)
+
+def _dest_property(name):
+    key = "_mv_" + name
+    def fget(self):
+        v = self._store.__dict__[key][self._i]
+        return None if v != v else v
+    def fset(self, value):
+        self._store.__dict__[key][self._i] = float("nan") if value is None else value
+    return property(fget, fset)
+
+class UnitView(Unit):
+    """
+    Vue mince sur une ligne de UnitStore: même API que Unit, mais les
+    attributs chauds sont lus/écrits directement dans les colonnes NumPy.
+    """
+    def __init__(self, store, x, y, team):
+        self._store = store
+        self._i = store._new_row()
+        store.views.append(self)
+        Unit.__init__(self, x, y, team)
+
+    x = _column_property("x")
+    y = _column_property("y")
+    hp = _column_property("hp")
+    attack_tick = _column_property("attack_tick")
+    morale = _column_property("morale")
+    fatigue = _column_property("fatigue")
+    encircled_ticks = _column_property("encircled_ticks")
+    cap_capture_time = _column_property("cap_capture_time")
+    dest_px = _dest_property("dest_x")
+    dest_py = _dest_property("dest_y")
+
+    @property
+    def team(self):
+        return TEAMS[self._store._mv_team[self._i]]
+
+    @team.setter
+    def team(self, value):
+        self._store._mv_team[self._i] = TEAM_CODE[value]
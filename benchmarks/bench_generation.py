@@ -0,0 +1,64 @@
+# benchmarks/bench_generation.py
+#
+# Génération de carte: generate_map (listes, boucles Python) contre
+# generate_map_np (NumPy). Affiche le temps par taille et, sur la carte par
+# défaut, la proportion moyenne de chaque terrain sur plusieurs graines
+# (les deux générateurs doivent avoir la même distribution).
+#
+#   python benchmarks/bench_generation.py [taille ...]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engineering.consts import NX, NY
+from Engineering.generation import generate_map
+from Engineering.generation_np import generate_map_np
+
+SIZES = [256, 1024, 4096]
+LIST_MAX = 1024     # au-delà, generate_map prend plusieurs minutes
+SEEDS = 200
+NAMES = ("deep", "river", "plain", "forest", "mount", "bridge", "lake")
+
+def fractions(grid):
+    counts = [0]*len(NAMES)
+    total = 0
+    for row in grid:
+        for t in row:
+            counts[t] += 1
+        total += len(row)
+    return [c/total for c in counts]
+
+def compare_distribution():
+    for (name, gen) in (("list", generate_map), ("numpy", generate_map_np)):
+        acc = [0.0]*len(NAMES)
+        for seed in range(SEEDS):
+            grid = gen(NX, NY, seed=seed)
+            if name == "numpy":
+                grid = grid.tolist()
+            for i, f in enumerate(fractions(grid)):
+                acc[i] += f/SEEDS
+        print("%dx%d %-6s " % (NX, NY, name)
+              + "  ".join("%s=%5.1f%%" % (n, 100*f) for (n, f) in zip(NAMES, acc)))
+
+def bench_size(n):
+    t0 = time.perf_counter()
+    generate_map_np(n, n, seed=0)
+    t_np = time.perf_counter() - t0
+    line = "%5dx%-5d numpy %8.1f ms" % (n, n, 1000*t_np)
+    if n <= LIST_MAX:
+        t0 = time.perf_counter()
+        generate_map(n, n, seed=0)
+        line += "   list %9.1f ms" % (1000*(time.perf_counter() - t0))
+    print(line)
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or SIZES
+    compare_distribution()
+    for n in sizes:
+        bench_size(n)
+
+if __name__ == "__main__":
+    main()
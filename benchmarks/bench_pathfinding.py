@@ -0,0 +1,116 @@
+# benchmarks/bench_pathfinding.py
+#
+# Compare le BFS 8 directions historique, A* (octile + tas binaire),
+# Jump Point Search et HPA* (Engineering.hpa) sur des cartes générées:
+# noeuds développés et temps de recherche (le précalcul HPA* est affiché
+# à part). JPS est aussi contrôlé: même blocked map, chemin contigu et
+# jamais plus long (en octile) que celui du BFS (tests complets:
+# tests/test_jps.py).
+#
+# generate_map place un nombre fixe de reliefs quelle que soit la taille:
+# une grande carte générée d'un bloc est presque entièrement en plaine.
+# Les cartes du benchmark sont donc un pavage de cartes NX x NY (graines
+# successives), avec la densité de terrain de la carte de jeu à toutes
+# les tailles.
+#
+#   python benchmarks/bench_pathfinding.py [taille ...]
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engineering.consts import NX, NY, T_PLAIN
+from Engineering.generation import generate_map
+from Engineering.pathfinding import (
+    build_blocked_map, bfs8_search, astar_search, jps_search, SQRT2
+)
+from Engineering.hpa import ClusterGraph
+
+SIZES = [80, 250, 500, 1000]
+QUERIES = 5
+
+def tiled_map(n, seed=0):
+    """Carte n x n pavée de cartes NX x NY générées (graines successives)."""
+    grid = [[T_PLAIN]*n for _ in range(n)]
+    k = 0
+    for y0 in range(0, n, NY):
+        for x0 in range(0, n, NX):
+            block = generate_map(NX, NY, seed=seed*100003 + k)
+            k += 1
+            for y in range(y0, min(n, y0 + NY)):
+                grid[y][x0:x0 + NX] = block[y - y0][:n - x0]
+    return grid
+
+def random_free_tile(rng, blocked, n):
+    while True:
+        x = rng.randrange(n)
+        y = rng.randrange(n)
+        if not blocked[y][x]:
+            return (x, y)
+
+def path_length(start, path):
+    # Longueur octile d'un chemin tuiles (contigu en 8 directions)
+    length = 0.0
+    (px, py) = start
+    for (x, y) in path:
+        assert max(abs(x - px), abs(y - py)) == 1, "chemin non contigu"
+        length += SQRT2 if (x != px and y != py) else 1.0
+        (px, py) = (x, y)
+    return length
+
+def bench_size(n, seed=0):
+    grid = tiled_map(n, seed)
+    blocked = build_blocked_map(grid, [])
+    rng = random.Random(seed)
+    plain = sum(row.count(T_PLAIN) for row in grid) / float(n*n)
+    free = 1.0 - sum(map(sum, blocked)) / float(n*n)
+    print("%5dx%-5d plaine %.0f%%, tuiles libres %.0f%%" % (n, n, 100*plain, 100*free))
+
+    t0 = time.perf_counter()
+    clusters = ClusterGraph(grid)
+    print("%5dx%-5d hpa precompute %.1f ms" % (n, n, 1000 * (time.perf_counter() - t0)))
+
+    names = ("bfs", "astar", "jps", "hpa")
+    totals = dict((name, [0, 0.0]) for name in names)
+    for _ in range(QUERIES):
+        # Requêtes longues: d'un bord à l'autre
+        start = random_free_tile(rng, blocked, n // 10 or 1)
+        goal = random_free_tile(rng, blocked, n)
+        goal = (n - 1 - goal[0] // 10, n - 1 - goal[1] // 10)
+        if blocked[goal[1]][goal[0]]:
+            continue
+        paths = {}
+        for name in names:
+            stats = {"expanded": 0}
+            t0 = time.perf_counter()
+            if name == "bfs":
+                paths[name] = bfs8_search(blocked, start, goal, stats)
+            elif name == "astar":
+                paths[name] = astar_search(grid, blocked, start, goal, stats)
+            elif name == "jps":
+                paths[name] = jps_search(blocked, start, goal, stats)
+            else:
+                clusters.find_path(start, goal, stats)
+            totals[name][0] += stats["expanded"]
+            totals[name][1] += time.perf_counter() - t0
+
+        jps = paths["jps"]
+        assert bool(jps) == bool(paths["bfs"]), "JPS et BFS en désaccord"
+        assert all(not blocked[y][x] for (x, y) in jps), "JPS traverse un obstacle"
+        assert path_length(start, jps) <= path_length(start, paths["bfs"]) + 1e-9
+
+    for name in names:
+        exp, secs = totals[name]
+        print("%5dx%-5d %-6s expanded=%9d  time=%8.1f ms/query"
+              % (n, n, name, exp // QUERIES, 1000 * secs / QUERIES))
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or SIZES
+    for n in sizes:
+        bench_size(n)
+
+if __name__ == "__main__":
+    main()
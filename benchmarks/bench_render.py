@@ -0,0 +1,129 @@
+# benchmarks/bench_render.py
+#
+# Temps de frame du rendu canvas: ancien rendu immédiat (delete("all") puis
+# recréation de chaque tuile / unité) contre CanvasRenderer (rendu retenu),
+# pour 20, 200 et 2000 unités en mouvement.
+#
+# Avec un affichage (DISPLAY), on mesure un vrai tk.Canvas (update_idletasks
+# inclus). Sans affichage, on compte les opérations canvas par frame
+# (create/coords/itemconfig/delete) et le temps Python passé à les émettre.
+#
+#   python benchmarks/bench_render.py [nb_unites ...]
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engineering.consts import (
+    WIDTH, HEIGHT, TILE_SIZE, UNIT_RADIUS, COLOR_BLUE, COLOR_RED, tile_color
+)
+from Engineering.simulation import Simulation
+from Engineering.render import CanvasRenderer
+
+UNIT_COUNTS = [20, 200, 2000]
+FRAMES = 30
+
+class CountingCanvas:
+    """Canvas sans affichage: compte les appels, renvoie des identifiants."""
+    def __init__(self):
+        self.ops = 0
+        self.next_id = 0
+
+    def _create(self, *args, **kw):
+        self.ops += 1
+        self.next_id += 1
+        return self.next_id
+
+    create_rectangle = create_oval = create_line = _create
+    create_polygon = create_text = create_image = _create
+
+    def _op(self, *args, **kw):
+        self.ops += 1
+
+    coords = itemconfig = delete = tag_raise = _op
+
+    def update_idletasks(self):
+        pass
+
+def legacy_draw(canvas, sim):
+    # Ancien HOI4FrontInvisibleGame.draw (sans capitales ni textes)
+    canvas.delete("all")
+    for y, row in enumerate(sim.grid):
+        for x, t in enumerate(row):
+            canvas.create_rectangle(x*TILE_SIZE, y*TILE_SIZE,
+                                    (x+1)*TILE_SIZE, (y+1)*TILE_SIZE,
+                                    fill=tile_color(t), outline="")
+    if len(sim.front_points) > 1:
+        coords = []
+        for p in sim.front_points:
+            coords.append(p[0])
+            coords.append(p[1])
+        canvas.create_line(coords, fill="black", width=6, smooth=True)
+    for u in sim.all_units:
+        color = (COLOR_BLUE if u.team == "blue" else COLOR_RED)
+        canvas.create_oval(u.x-UNIT_RADIUS, u.y-UNIT_RADIUS,
+                           u.x+UNIT_RADIUS, u.y+UNIT_RADIUS, fill=color, outline="")
+        leftx = u.x-15
+        topy = u.y-UNIT_RADIUS-10
+        ratio = max(0, u.hp/100)
+        canvas.create_rectangle(leftx, topy, leftx+30, topy+4, fill="#444444")
+        canvas.create_rectangle(leftx, topy, leftx+30*ratio, topy+4, fill="green")
+
+def make_canvas():
+    if not os.environ.get("DISPLAY"):
+        return None, CountingCanvas()
+    import tkinter as tk
+    root = tk.Tk()
+    canvas = tk.Canvas(root, width=WIDTH, height=HEIGHT, bg="white")
+    canvas.pack()
+    root.update()
+    return root, canvas
+
+def bench(n_units, seed=0):
+    random.seed(seed)
+    sim = Simulation(units_per_team=n_units//2)
+    sim.start_battle()
+    sim.order_move(sim.blue_units, (len(sim.grid[0])//2, len(sim.grid)//2))
+
+    results = {}
+    for name in ("legacy", "retained"):
+        root, canvas = make_canvas()
+        renderer = None
+        if name == "retained":
+            if root is None:
+                renderer = CanvasRenderer(canvas, sim, photo_image=lambda c, data: data)
+            else:
+                renderer = CanvasRenderer(canvas, sim)
+        secs = 0.0
+        ops0 = getattr(canvas, "ops", 0)
+        for _ in range(FRAMES):
+            sim.step(1)
+            t0 = time.perf_counter()
+            if renderer is None:
+                legacy_draw(canvas, sim)
+            else:
+                renderer.draw("Time : 0s")
+            canvas.update_idletasks()
+            secs += time.perf_counter() - t0
+        ops = (getattr(canvas, "ops", 0) - ops0) // FRAMES
+        results[name] = (1000*secs/FRAMES, ops)
+        if root is not None:
+            root.destroy()
+
+    for name in ("legacy", "retained"):
+        ms, ops = results[name]
+        extra = (" ops/frame=%6d" % ops) if ops else ""
+        print("%5d unités %-9s %8.2f ms/frame%s" % (len(sim.all_units), name, ms, extra))
+
+def main():
+    counts = [int(a) for a in sys.argv[1:]] or UNIT_COUNTS
+    if not os.environ.get("DISPLAY"):
+        print("(pas d'affichage: opérations canvas comptées, temps Python seul)")
+    for n in counts:
+        bench(n)
+
+if __name__ == "__main__":
+    main()
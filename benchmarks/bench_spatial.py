@@ -0,0 +1,70 @@
+# benchmarks/bench_spatial.py
+#
+# Recherche de l'ennemi le plus proche (AI.update): SpatialHash.nearest
+# contre le parcours linéaire de toutes les unités adverses, pour N unités
+# par camp réparties sur les deux bords de la carte (cas le plus défavorable
+# pour la recherche par anneaux: l'ennemi est loin).
+#
+#   python benchmarks/bench_spatial.py [unites_par_camp ...]
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engineering.consts import WIDTH, HEIGHT
+from Engineering.spatial import SpatialHash
+
+UNIT_COUNTS = [300, 1000, 5000]
+LINEAR_MAX = 1000   # au-delà, le parcours linéaire prend trop longtemps
+
+class Dummy:
+    def __init__(self, x, y, team):
+        self.x = x
+        self.y = y
+        self.team = team
+
+def armies(n, seed=0):
+    rng = random.Random(seed)
+    blue = [Dummy(rng.uniform(0, WIDTH/4), rng.uniform(0, HEIGHT), "blue") for _ in range(n)]
+    red = [Dummy(rng.uniform(3*WIDTH/4, WIDTH), rng.uniform(0, HEIGHT), "red") for _ in range(n)]
+    return blue, red
+
+def bench_index(blue, red):
+    index = SpatialHash()
+    t0 = time.perf_counter()
+    index.rebuild(blue + red)
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for (mine, foe_team) in ((blue, "red"), (red, "blue")):
+        for u in mine:
+            index.nearest(u.x, u.y, k=1, team=foe_team)
+    return t_build, time.perf_counter() - t0
+
+def bench_linear(blue, red):
+    t0 = time.perf_counter()
+    for (mine, foes) in ((blue, red), (red, blue)):
+        for u in mine:
+            bestd = float("inf")
+            for f in foes:
+                dx = u.x - f.x
+                dy = u.y - f.y
+                d2 = dx*dx + dy*dy
+                if d2 < bestd:
+                    bestd = d2
+    return time.perf_counter() - t0
+
+def main():
+    counts = [int(a) for a in sys.argv[1:]] or UNIT_COUNTS
+    for n in counts:
+        blue, red = armies(n)
+        t_build, t_index = bench_index(blue, red)
+        line = "%5d/camp  rebuild %7.1f ms  nearest %8.1f ms" % (n, 1000*t_build, 1000*t_index)
+        if n <= LINEAR_MAX:
+            line += "   linéaire %8.1f ms" % (1000*bench_linear(blue, red))
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# benchmarks/bench_units.py
+#
+# Tick complet de la simulation: unités objets (Unit.update unité par unité)
+# contre UnitStore (use_unit_store=True, phases vectorisées), pour N unités
+# par camp. La moitié des bleus reçoit un ordre de déplacement vers la
+# capitale rouge; le reste suit l'IA et le combat.
+#
+#   python benchmarks/bench_units.py [unites_par_camp ...]
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engineering.simulation import Simulation
+
+UNIT_COUNTS = [100, 300, 1000]
+TICKS = 60
+SEED = 5
+
+def bench(n, use_unit_store):
+    random.seed(SEED)
+    sim = Simulation(seed=SEED, units_per_team=n, placement_ticks=5,
+                     use_unit_store=use_unit_store)
+    sim.run(6)
+    sim.order_move(sim.blue_units[:n//2], sim.red_cap)
+    t0 = time.perf_counter()
+    ticks = sim.run(TICKS)
+    return (time.perf_counter() - t0) / max(1, ticks)
+
+def main():
+    counts = [int(a) for a in sys.argv[1:]] or UNIT_COUNTS
+    for n in counts:
+        t_obj = bench(n, False)
+        t_store = bench(n, True)
+        print("%5d/camp  objets %8.1f ms/tick   store %8.1f ms/tick   x%.2f"
+              % (n, 1000*t_obj, 1000*t_store, t_obj/t_store))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# tests/test_front.py
+#
+# FrontLine: update() passe par update_front_array (même résultat que la
+# version en tableau et que le chemin sans NumPy), et les traversées tirent
+# leurs points par le générateur de la simulation, pas par le module random.
+#
+#   python -m pytest tests
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from Engineering.consts import WIDTH, HEIGHT
+from Engineering.front import FrontLine, update_front_array, generate_initial_front
+from Engineering.simulation import Simulation
+
+class Dummy:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+def scene(seed):
+    rng = random.Random(seed)
+    front = [(WIDTH/2 + rng.uniform(-40, 40), HEIGHT*i/29) for i in range(30)]
+    units = [Dummy(WIDTH/2 + rng.uniform(-150, 150), rng.uniform(0, HEIGHT))
+             for _ in range(200)]
+    return front, units
+
+@pytest.mark.parametrize("seed", range(5))
+def test_update_matches_update_front_array(seed):
+    points, units = scene(seed)
+    line = FrontLine(points)
+    plain = FrontLine(points)
+    plain._views = None
+    pts = np.array(points)
+    ux = np.array([u.x for u in units])
+    uy = np.array([u.y for u in units])
+    for _ in range(5):
+        line.update(units, push_strength=0.3, smooth_passes=2)
+        plain.update(units, push_strength=0.3, smooth_passes=2)
+        pts = update_front_array(pts, ux, uy, push_strength=0.3, smooth_passes=2)
+        assert line.points() == list(map(tuple, pts.tolist()))
+        assert np.allclose(line.points(), plain.points(), rtol=0, atol=1e-9)
+
+def test_update_front_array_out_buffer():
+    points, units = scene(0)
+    pts = np.array(points)
+    ux = np.array([u.x for u in units])
+    uy = np.array([u.y for u in units])
+    fresh = update_front_array(pts, ux, uy)
+    assert not np.array_equal(fresh, pts)
+    out = np.empty_like(pts)
+    assert update_front_array(pts, ux, uy, out=out) is out
+    assert np.array_equal(out, fresh)
+    assert update_front_array(pts, ux, uy, out=pts) is pts
+    assert np.array_equal(pts, fresh)
+
+def test_crossings_use_the_given_rng():
+    crossings = [(WIDTH/2 + 5, 100.0), (WIDTH/2 - 5, 300.0), (WIDTH/2, 301.0)]
+    a = FrontLine(generate_initial_front(), rng=random.Random(4))
+    b = FrontLine(generate_initial_front(), rng=random.Random(4))
+    state = random.getstate()
+    a.add_crossings(crossings)
+    random.seed(99)
+    b.add_crossings(crossings)
+    random.setstate(state)
+    assert a.points() == b.points()
+    assert len(a) > 25
+
+def test_simulation_front_rng_is_seeded():
+    sims = []
+    for salt in (1, 2):
+        random.seed(salt)
+        sim = Simulation(seed=8, units_per_team=1)
+        sim.front.add_crossings([(WIDTH/2 + 3, HEIGHT/2)])
+        sims.append(sim.front.points())
+    assert sims[0] == sims[1]
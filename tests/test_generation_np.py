@@ -0,0 +1,63 @@
+# tests/test_generation_np.py
+#
+# Générateur NumPy: component_sizes doit donner les mêmes composantes que
+# l'union-find de référence (components.label_mask), et une carte 4096x4096
+# doit rester sous la seconde (objectif du générateur vectorisé).
+#
+#   python -m pytest tests
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from Engineering.consts import T_LAKE, T_FOREST
+from Engineering.components import label_mask
+from Engineering.generation_np import generate_map_np, component_sizes
+
+BIG = 4096
+BIG_MAX_S = 1.0
+
+def reference_sizes(mask):
+    ny, nx = mask.shape
+    return sorted(label_mask(mask.astype(np.uint8).tobytes(), nx, ny).sizes[1:])
+
+@pytest.mark.parametrize("seed", range(60))
+def test_component_sizes_random_masks(seed):
+    rng = np.random.default_rng(seed)
+    shape = (int(rng.integers(1, 70)), int(rng.integers(1, 70)))
+    mask = rng.random(shape) < rng.uniform(0.0, 0.9)
+    assert sorted(component_sizes(mask)) == reference_sizes(mask)
+
+def test_component_sizes_snake():
+    # Une seule composante en serpentin: beaucoup d'unions en chaîne
+    mask = np.zeros((101, 101), dtype=bool)
+    mask[::2, :] = True
+    for y in range(1, 101, 2):
+        mask[y, 100 if (y//2) % 2 == 0 else 0] = True
+    assert component_sizes(mask) == [int(mask.sum())]
+
+def test_component_sizes_runs_do_not_wrap_rows():
+    mask = np.zeros((3, 4), dtype=bool)
+    mask[0, 3] = True
+    mask[1, 0] = True
+    assert sorted(component_sizes(mask)) == [1, 1]
+    assert component_sizes(np.zeros((5, 5), dtype=bool)) == []
+
+@pytest.mark.parametrize("seed", range(5))
+def test_component_sizes_generated_maps(seed):
+    grid = generate_map_np(120, 90, seed=seed)
+    for t in (T_LAKE, T_FOREST):
+        assert sorted(component_sizes(grid == t)) == reference_sizes(grid == t)
+
+def test_big_map_time():
+    t0 = time.perf_counter()
+    grid = generate_map_np(BIG, BIG, seed=0)
+    elapsed = time.perf_counter() - t0
+    assert grid.shape == (BIG, BIG)
+    assert elapsed < BIG_MAX_S, "%dx%d en %.2f s" % (BIG, BIG, elapsed)
@@ -0,0 +1,119 @@
+# tests/test_jps.py
+#
+# Jump Point Search (Engineering.pathfinding.jps_search) contre les
+# références: même accessibilité que bfs8_search, chemin contigu sans
+# obstacle, et longueur octile égale à celle d'un Dijkstra 8 directions
+# (mêmes règles de passage: diagonale permise dès que la case visée est libre).
+#
+#   python -m pytest tests
+
+import heapq
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engineering.consts import NX, NY
+from Engineering.generation import generate_map
+from Engineering.pathfinding import (
+    build_blocked_map, bfs8_search, jps_search, DIRECTIONS_8, SQRT2
+)
+
+RANDOM_SEEDS = range(400)
+MAP_SEEDS = range(12)
+QUERIES = 8
+
+def random_grid(seed):
+    """Grille aléatoire de 8 à 48 tuiles de côté, 5% à 45% d'obstacles."""
+    rng = random.Random(seed)
+    nx = rng.randint(8, 48)
+    ny = rng.randint(8, 48)
+    density = rng.uniform(0.05, 0.45)
+    blocked = [[rng.random() < density for _ in range(nx)] for _ in range(ny)]
+    # Quelques murs pour créer couloirs et culs-de-sac
+    for _ in range(rng.randint(0, 4)):
+        if rng.random() < 0.5:
+            y = rng.randrange(ny)
+            for x in range(rng.randrange(nx), nx):
+                blocked[y][x] = True
+        else:
+            x = rng.randrange(nx)
+            for y in range(rng.randrange(ny), ny):
+                blocked[y][x] = True
+    return blocked
+
+def free_tiles(blocked):
+    return [(x, y) for y, row in enumerate(blocked) for x, b in enumerate(row) if not b]
+
+def dijkstra_length(blocked, start, goal):
+    """Longueur octile du plus court chemin, None si inaccessible."""
+    ny = len(blocked)
+    nx = len(blocked[0])
+    dist = {start: 0.0}
+    heap = [(0.0, start)]
+    while heap:
+        d, (x, y) = heapq.heappop(heap)
+        if (x, y) == goal:
+            return d
+        if d > dist[(x, y)]:
+            continue
+        for (dx, dy) in DIRECTIONS_8:
+            xx = x + dx
+            yy = y + dy
+            if 0 <= xx < nx and 0 <= yy < ny and not blocked[yy][xx]:
+                nd = d + (SQRT2 if dx and dy else 1.0)
+                if nd < dist.get((xx, yy), float("inf")) - 1e-12:
+                    dist[(xx, yy)] = nd
+                    heapq.heappush(heap, (nd, (xx, yy)))
+    return None
+
+def path_length(blocked, start, goal, path):
+    """Vérifie le chemin (contigu, libre, finit au but) et renvoie sa longueur."""
+    length = 0.0
+    (px, py) = start
+    for (x, y) in path:
+        assert max(abs(x - px), abs(y - py)) == 1, "chemin non contigu"
+        assert not blocked[y][x], "chemin à travers un obstacle"
+        length += SQRT2 if (x != px and y != py) else 1.0
+        (px, py) = (x, y)
+    assert (px, py) == goal, "le chemin ne finit pas au but"
+    return length
+
+def check_queries(blocked, rng, queries=QUERIES):
+    tiles = free_tiles(blocked)
+    if len(tiles) < 2:
+        return
+    for _ in range(queries):
+        start, goal = rng.sample(tiles, 2)
+        jps = jps_search(blocked, start, goal)
+        bfs = bfs8_search(blocked, start, goal)
+        best = dijkstra_length(blocked, start, goal)
+
+        assert bool(jps) == bool(bfs) == (best is not None)
+        if best is None:
+            continue
+        length = path_length(blocked, start, goal, jps)
+        assert length == pytest.approx(best, abs=1e-9)
+        assert length <= path_length(blocked, start, goal, bfs) + 1e-9
+
+@pytest.mark.parametrize("seed", RANDOM_SEEDS)
+def test_jps_random_grids(seed):
+    check_queries(random_grid(seed), random.Random(seed))
+
+@pytest.mark.parametrize("seed", MAP_SEEDS)
+def test_jps_generated_maps(seed):
+    grid = generate_map(NX, NY, seed=seed)
+    check_queries(build_blocked_map(grid, []), random.Random(seed), queries=20)
+
+def test_jps_start_is_goal():
+    blocked = [[False]*5 for _ in range(5)]
+    assert jps_search(blocked, (2, 2), (2, 2)) == bfs8_search(blocked, (2, 2), (2, 2))
+
+def test_jps_walled_off_goal():
+    blocked = [[False]*7 for _ in range(7)]
+    for i in range(7):
+        blocked[i][3] = True
+    assert jps_search(blocked, (0, 0), (6, 6)) == []
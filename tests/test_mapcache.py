@@ -0,0 +1,27 @@
+# tests/test_mapcache.py
+#
+# Cache disque des maps: opt-in dans Simulation (cache_dir), même map avec
+# ou sans cache, et aucune écriture dans le dossier par défaut sinon.
+#
+#   python -m pytest tests
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engineering import mapcache
+from Engineering.simulation import Simulation
+
+def test_simulation_does_not_write_cache_by_default(tmp_path, monkeypatch):
+    default = tmp_path / "default"
+    monkeypatch.setattr(mapcache, "MAP_CACHE_DIR", str(default))
+    Simulation(seed=5, units_per_team=1)
+    assert not default.exists()
+
+def test_simulation_cache_dir_is_opt_in(tmp_path):
+    plain = Simulation(seed=5, units_per_team=1)
+    cached = Simulation(seed=5, units_per_team=1, cache_dir=str(tmp_path))
+    assert len(os.listdir(str(tmp_path))) == 1
+    again = Simulation(seed=5, units_per_team=1, cache_dir=str(tmp_path))
+    assert plain.grid == cached.grid == again.grid
@@ -0,0 +1,150 @@
+# tests/test_pathservice.py
+#
+# PathService.process(units_map): les requêtes sont résolues sur la
+# BlockedMap du tick (empreintes d'unités), sans que l'unité servie ne se
+# bloque elle-même, avec repli sur la map de mouvement si les unités
+# ferment tous les passages. Avec un pool (use_parallel), les lots partent
+# sans bloquer le tick et sont livrés aux ticks suivants, résolus sur la map
+# de mouvement statique (empreintes d'unités ignorées).
+#
+#   python -m pytest tests
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engineering.consts import TILE_SIZE, T_PLAIN, T_LAKE
+from Engineering.pathfinding import BlockedMap, find_path_any_angle
+from Engineering.pathservice import PathService
+
+WALL_Y = 10
+GAP_A = range(8, 11)
+GAP_B = range(28, 31)
+
+class Dummy:
+    def __init__(self, tx, ty):
+        self.x = (tx + 0.5) * TILE_SIZE
+        self.y = (ty + 0.5) * TILE_SIZE
+        self.path = None
+        self.path_request = None
+
+    def get_tile_pos(self):
+        return (int(self.x // TILE_SIZE), int(self.y // TILE_SIZE))
+
+def two_gap_grid():
+    """Plaine 40x20 coupée par un mur de lac, percé de deux passages."""
+    grid = [[T_PLAIN]*40 for _ in range(20)]
+    for x in range(40):
+        if x not in GAP_A and x not in GAP_B:
+            grid[WALL_Y][x] = T_LAKE
+    return grid
+
+def crossing_x(path, start):
+    """Abscisse où le chemin (waypoints tuiles) franchit la ligne du mur."""
+    (px, py) = start
+    for (x, y) in path:
+        if (py - WALL_Y) * (y - WALL_Y) <= 0 and y != py:
+            return px + (x - px) * (WALL_Y - py) / float(y - py)
+        (px, py) = (x, y)
+    return None
+
+def solve(grid, walker, goal, others):
+    service = PathService(grid, budget_ms=None)
+    units_map = BlockedMap(grid, static=service.blocked_map(16))
+    units_map.update_units([walker] + others)
+    service.request(walker, walker.get_tile_pos(), goal)
+    service.process(units_map)
+    return walker.path
+
+def test_path_avoids_unit_footprints():
+    grid = two_gap_grid()
+    walker = Dummy(9, 2)
+    goal = (9, 18)
+
+    free = solve(grid, walker, goal, [])
+    assert free and free[-1] == goal
+    assert round(crossing_x(free, (9, 2))) in GAP_A
+
+    # Une unité immobile dans le passage A: détour par B
+    walker = Dummy(9, 2)
+    around = solve(grid, walker, goal, [Dummy(9, WALL_Y)])
+    assert around and around[-1] == goal
+    assert round(crossing_x(around, (9, 2))) in GAP_B
+
+def test_falls_back_to_movement_map_when_units_close_every_gap():
+    grid = two_gap_grid()
+    walker = Dummy(9, 2)
+    goal = (9, 18)
+    path = solve(grid, walker, goal, [Dummy(9, WALL_Y), Dummy(29, WALL_Y)])
+    assert path and path[-1] == goal
+
+def run_ticks(service, units_map=None, limit_s=30.0):
+    """Appelle process() jusqu'à vider la file; retourne le nombre de ticks."""
+    ticks = 0
+    t0 = time.perf_counter()
+    while service:
+        service.process(units_map)
+        ticks += 1
+        assert time.perf_counter() - t0 < limit_s
+        time.sleep(0.001)
+    return ticks
+
+def test_parallel_batches_do_not_block_the_tick():
+    grid = two_gap_grid()
+    service = PathService(grid, budget_ms=2)
+    service.use_parallel(workers=2, max_batch=64)
+    try:
+        walkers = [Dummy(x, y) for x in range(0, 40, 2) for y in range(0, 4)]
+        goals = [((x*7) % 40, 18) for x in range(len(walkers))]
+        for (w, g) in zip(walkers, goals):
+            service.request(w, w.get_tile_pos(), g)
+        keys = [w.path_request for w in walkers]
+        # Le tick envoie le lot et rend la main avant que tout soit résolu
+        service.process()
+        assert len(service) > 0
+        assert keys[0] in service.in_flight and len(service.in_flight) <= 64
+        # Une requête identique à une requête en cours y est fusionnée
+        twin = Dummy(0, 0)
+        service.request(twin, twin.get_tile_pos(), goals[0])
+        assert service.merged == 1 and keys[0] not in service.pending
+        run_ticks(service)
+        static = service.blocked_map(16)
+        for (w, key) in zip(walkers + [twin], keys + [keys[0]]):
+            assert w.path_request is None
+            assert w.path == find_path_any_angle(grid, key[0], key[1],
+                                                 blocked_map=static, exact_los=True)
+    finally:
+        service.close()
+
+def test_parallel_ignores_unit_footprints():
+    # Différence assumée avec le chemin en série: le pool ne voit que la
+    # map de mouvement, l'unité garée dans le passage A n'est pas évitée
+    grid = two_gap_grid()
+    walker = Dummy(9, 2)
+    goal = (9, 18)
+    service = PathService(grid, budget_ms=None)
+    units_map = BlockedMap(grid, static=service.blocked_map(16))
+    units_map.update_units([walker, Dummy(9, WALL_Y)])
+    service.use_parallel(workers=1)
+    try:
+        service.request(walker, walker.get_tile_pos(), goal)
+        assert service.process(units_map) == 1
+        assert walker.path and walker.path[-1] == goal
+        assert round(crossing_x(walker.path, (9, 2))) in GAP_A
+    finally:
+        service.close()
+
+def test_close_requeues_in_flight_requests():
+    grid = two_gap_grid()
+    service = PathService(grid, budget_ms=0)
+    service.use_parallel(workers=1)
+    walker = Dummy(9, 2)
+    service.request(walker, walker.get_tile_pos(), (9, 18))
+    service._submit()
+    assert not service.pending and len(service) == 1
+    service.close()
+    assert list(service.pending) == [walker.path_request] and not service.in_flight
+    service.process()
+    assert walker.path and walker.path[-1] == (9, 18)
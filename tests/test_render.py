@@ -0,0 +1,77 @@
+# tests/test_render.py
+#
+# terrain_ppm (en-tête et taille du PPM pour 'tile_px') et CanvasRenderer
+# avec un zoom 'tile_px' différent de TILE_SIZE, sur un canvas factice
+# (aucun affichage requis).
+#
+#   python -m pytest tests
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engineering.consts import NX, NY, TILE_SIZE, UNIT_RADIUS, T_PLAIN, T_LAKE
+from Engineering.render import CanvasRenderer, terrain_ppm, TERRAIN_RGB
+from Engineering.simulation import Simulation
+
+class RecordingCanvas:
+    """Canvas factice: garde les dernières coordonnées de chaque objet."""
+    def __init__(self):
+        self.items = {}
+
+    def _create(self, *args, **kw):
+        self.items[len(self.items) + 1] = (list(args), kw)
+        return len(self.items)
+
+    create_rectangle = create_oval = create_line = _create
+    create_polygon = create_text = create_image = _create
+
+    def coords(self, item, *args):
+        if len(args) == 1:
+            args = tuple(args[0])
+        self.items[item] = (list(args), self.items[item][1])
+
+    def itemconfig(self, *args, **kw):
+        pass
+
+    delete = tag_raise = itemconfig
+
+def parse_ppm(data):
+    (magic, w, h, maxval, pixels) = data.split(maxsplit=4)
+    return magic, int(w), int(h), int(maxval), pixels
+
+@pytest.mark.parametrize("tile_px", [1, 3, TILE_SIZE, 17])
+def test_terrain_ppm_header_and_size(tile_px):
+    grid = [[T_PLAIN, T_LAKE, T_PLAIN], [T_LAKE, T_LAKE, T_PLAIN]]
+    (magic, w, h, maxval, pixels) = parse_ppm(terrain_ppm(grid, tile_px))
+    assert (magic, w, h, maxval) == (b"P6", 3*tile_px, 2*tile_px, 255)
+    assert len(pixels) == 3*w*h
+    # Pixel (tx=1, ty=0) => lac, dernier pixel => plaine
+    assert pixels[3*tile_px:3*tile_px+3] == TERRAIN_RGB[T_LAKE]
+    assert pixels[-3:] == TERRAIN_RGB[T_PLAIN]
+
+def test_renderer_uses_tile_px():
+    random.seed(0)
+    sim = Simulation(seed=2, units_per_team=3)
+    tile_px = 4
+    canvas = RecordingCanvas()
+    images = []
+    renderer = CanvasRenderer(canvas, sim, tile_px=tile_px,
+                              photo_image=lambda c, data: images.append(data) or data)
+    (magic, w, h, _, pixels) = parse_ppm(images[0])
+    assert (magic, w, h) == (b"P6", NX*tile_px, NY*tile_px)
+    assert len(pixels) == 3*w*h
+
+    renderer.draw("")
+    scale = tile_px / TILE_SIZE
+    for u in sim.all_units:
+        oval = renderer.unit_items[u][0]
+        (x0, y0, x1, y1) = canvas.items[oval][0]
+        assert ((x0 + x1)/2, (y0 + y1)/2) == pytest.approx((u.x*scale, u.y*scale))
+        assert x1 - x0 == pytest.approx(2*UNIT_RADIUS)
+    front = canvas.items[renderer.front_item][0]
+    assert front[:2] == pytest.approx([c*scale for c in sim.front_points[0]])
@@ -0,0 +1,87 @@
+# tests/test_spatial.py
+#
+# SpatialHash.nearest contre un parcours linéaire (mêmes unités, même ordre
+# par distance), après déplacements et retraits, et sa vitesse sur deux
+# armées éloignées (cas de la recherche d'ennemi de l'IA).
+#
+#   python -m pytest tests
+
+import os
+import random
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engineering.spatial import SpatialHash
+
+class Dummy:
+    def __init__(self, x, y, team):
+        self.x = x
+        self.y = y
+        self.team = team
+
+def linear_nearest(units, x, y, k=1, team=None, exclude=None):
+    cands = [u for u in units if u is not exclude and (team is None or u.team == team)]
+    cands.sort(key=lambda u: (u.x - x)**2 + (u.y - y)**2)
+    return cands[:k]
+
+@pytest.mark.parametrize("seed", range(40))
+def test_nearest_matches_linear_scan(seed):
+    rng = random.Random(seed)
+    units = [Dummy(rng.uniform(-50, 900), rng.uniform(-50, 700), rng.choice(("blue", "red")))
+             for _ in range(rng.randint(0, 120))]
+    index = SpatialHash()
+    index.rebuild(units)
+    for u in rng.sample(units, len(units)//3):
+        u.x = rng.uniform(-50, 900)
+        u.y = rng.uniform(-50, 700)
+        index.move(u)
+    for u in rng.sample(units, len(units)//5):
+        index.remove(u)
+        units.remove(u)
+    for _ in range(20):
+        x = rng.uniform(-200, 1100)
+        y = rng.uniform(-200, 900)
+        k = rng.randint(1, 6)
+        team = rng.choice((None, "blue", "red"))
+        exclude = rng.choice(units) if units and rng.random() < 0.5 else None
+        assert (index.nearest(x, y, k=k, team=team, exclude=exclude)
+                == linear_nearest(units, x, y, k, team, exclude))
+
+def test_nearest_unknown_team_is_empty():
+    index = SpatialHash()
+    index.rebuild([Dummy(10, 10, "blue")])
+    assert index.nearest(0, 0, team="red") == []
+    assert index.nearest(0, 0, k=0) == []
+
+def test_nearest_foe_faster_than_linear_scan():
+    # 1000 unités par camp, chaque camp sur son bord: l'index ne doit lire
+    # que les seaux ennemis proches, pas tout le camp adverse
+    rng = random.Random(0)
+    blue = [Dummy(rng.uniform(0, 200), rng.uniform(0, 600), "blue") for _ in range(1000)]
+    red = [Dummy(rng.uniform(600, 800), rng.uniform(0, 600), "red") for _ in range(1000)]
+    index = SpatialHash()
+    index.rebuild(blue + red)
+
+    t0 = time.perf_counter()
+    for (mine, foes, foe_team) in ((blue, red, "red"), (red, blue, "blue")):
+        for u in mine:
+            index.nearest(u.x, u.y, k=1, team=foe_team)
+    t_index = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for (mine, foes) in ((blue, red), (red, blue)):
+        for u in mine:
+            bestd = float("inf")
+            for f in foes:
+                dx = u.x - f.x
+                dy = u.y - f.y
+                d2 = dx*dx + dy*dy
+                if d2 < bestd:
+                    bestd = d2
+    t_linear = time.perf_counter() - t0
+
+    assert t_index < t_linear / 2, "index %.3f s, linéaire %.3f s" % (t_index, t_linear)
@@ -0,0 +1,79 @@
+# tests/test_territory.py
+#
+# FrontOwnership: le raster mis à jour par bandes donne le côté du front
+# (FrontIndex.side) au centre de chaque tuile, ses compteurs de surface
+# restent exacts, et la simulation ne le met à jour que si le front bouge,
+# à la lecture suivante (mark).
+#
+#   python -m pytest tests
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engineering.consts import NX, NY, TILE_SIZE, WIDTH, HEIGHT
+from Engineering.front import FrontIndex, generate_initial_front
+from Engineering.simulation import Simulation
+from Engineering.territory import FrontOwnership, OWNER_LEFT, OWNER_RIGHT
+
+def wobbly_front(rng, n=25):
+    return [(WIDTH/2 + rng.uniform(-WIDTH/3, WIDTH/3), HEIGHT*i/(n-1)) for i in range(n)]
+
+def check_raster(own, index):
+    for ty in range(NY):
+        for tx in range(NX):
+            side = index.side(tx*TILE_SIZE + TILE_SIZE/2, ty*TILE_SIZE + TILE_SIZE/2)
+            assert own.owner[ty*NX + tx] == (OWNER_LEFT if side == "left" else OWNER_RIGHT)
+    assert own.sizes[OWNER_LEFT] == own.owner.count(OWNER_LEFT)
+    assert own.sizes[OWNER_RIGHT] == own.owner.count(OWNER_RIGHT)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_raster_follows_front(seed):
+    rng = random.Random(seed)
+    own = FrontOwnership(NX, NY, FrontIndex(generate_initial_front()))
+    for _ in range(5):
+        index = FrontIndex(wobbly_front(rng))
+        own.update(index)
+        check_raster(own, index)
+
+def test_mark_updates_on_next_read():
+    own = FrontOwnership(NX, NY, FrontIndex(generate_initial_front()), teams=("blue", "red"))
+    before = bytes(own.owner)
+    index = FrontIndex([(10.0, 0.0), (10.0, float(HEIGHT))])
+    own.mark(index)
+    assert bytes(own.owner) == before
+    assert own.size("blue") == NY
+    assert own.changed > 0
+    # Lu une fois: pas de nouvelle mise à jour
+    own.side_at(0, 0)
+    assert own._stale is None
+    assert own.side_at(-50, 5) == OWNER_LEFT
+    assert own.side_at(WIDTH + 50, 5) == OWNER_RIGHT
+    check_raster(own, index)
+
+def test_sides_at_matches_side_at():
+    np = pytest.importorskip("numpy")
+    rng = random.Random(0)
+    own = FrontOwnership(NX, NY, FrontIndex(wobbly_front(rng)))
+    xs = np.array([rng.uniform(-20, WIDTH + 20) for _ in range(500)])
+    ys = np.array([rng.uniform(-20, HEIGHT + 20) for _ in range(500)])
+    assert own.sides_at(xs, ys).tolist() == [own.side_at(x, y) for (x, y) in zip(xs, ys)]
+
+def test_simulation_updates_raster_only_when_front_moves():
+    random.seed(3)
+    sim = Simulation(seed=3, units_per_team=5, placement_ticks=5)
+    index = sim.front_index
+    sim.step()
+    # Placement: unités loin du front, il ne bouge pas
+    assert sim.front_index is index
+    sim.front.points = lambda: wobbly_front(random.Random(1))
+    sim.step()
+    assert sim.front_index is not index
+    assert sim.front_ownership._stale is sim.front_index
+    sim.is_unit_in_enemy_zone(sim.all_units[0])
+    assert sim.front_ownership._stale is None
+    check_raster(sim.front_ownership, sim.front_index)
@@ -0,0 +1,225 @@
+# tests/test_unitstore.py
+#
+# UnitStore (use_unit_store=True): noyaux vectorisés contre les règles par
+# objet de Unit, et tick complet contre une référence par objets qui suit
+# le même ordre de phases que UnitStore.update (collisions symétriques,
+# puis pilotage, mouvement, encerclement/capture, morale/fatigue).
+#
+#   python -m pytest tests
+
+import math
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from Engineering.consts import NX, NY, TILE_SIZE, UNIT_RADIUS
+from Engineering.generation import generate_map
+from Engineering.simulation import Simulation, ATTACK_RANGE
+from Engineering.spatial import SpatialHash
+from Engineering.units import Unit
+from Engineering.unitstore import UnitStore, GOLDEN_ANGLE
+
+def twin_units(seed, count, spread=None):
+    """Même état aléatoire dans un UnitStore et dans des Unit simples."""
+    rng = random.Random(seed)
+    store = UnitStore(capacity=4)
+    views = []
+    plain = []
+    for _ in range(count):
+        if spread is None:
+            x = rng.uniform(0, NX*TILE_SIZE)
+            y = rng.uniform(0, NY*TILE_SIZE)
+        else:
+            x = rng.uniform(spread[0], spread[1])
+            y = rng.uniform(spread[0], spread[1])
+        team = rng.choice(("blue", "red"))
+        pair = (store.add(x, y, team), Unit(x, y, team))
+        state = (rng.uniform(0, 100), rng.uniform(0, 100), rng.randint(0, 2))
+        dest = None
+        if rng.random() < 0.8:
+            dest = (x + rng.uniform(-60, 60), y + rng.uniform(-60, 60))
+            if rng.random() < 0.1:
+                dest = (x + rng.uniform(-0.5, 0.5), y)
+        for u in pair:
+            (u.morale, u.fatigue, u.encircled_ticks) = state
+            if dest is not None:
+                (u.dest_px, u.dest_py) = dest
+        views.append(pair[0])
+        plain.append(pair[1])
+    return store, views, plain
+
+def same_state(views, plain, abs_tol=1e-9):
+    for (v, u) in zip(views, plain):
+        assert v.team == u.team
+        assert (v.x, v.y, v.hp, v.attack_tick, v.morale, v.fatigue) == pytest.approx(
+            (u.x, u.y, u.hp, u.attack_tick, u.morale, u.fatigue), abs=abs_tol)
+        assert v.encircled_ticks == u.encircled_ticks
+        assert (v.dest_px is None) == (u.dest_px is None)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_move_kernel_matches_unit(seed):
+    grid = generate_map(NX, NY, seed=seed)
+    store, views, plain = twin_units(seed, 300)
+    active = np.array([random.Random(seed + k).random() < 0.8 for k in range(300)])
+    for _ in range(5):
+        store.move_direct_line(np.asarray(grid, dtype=np.int8), active)
+        for (u, on) in zip(plain, active.tolist()):
+            if on:
+                u.move_direct_line(grid)
+        same_state(views, plain)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_combat_matches_object_path(seed):
+    store, views, plain = twin_units(seed, 250, spread=(0, 300))
+    game = type("Game", (), {})()
+    game.unit_store = None
+    game.all_units = plain
+    game.spatial = SpatialHash()
+    game.spatial.rebuild(plain)
+    Simulation.resolve_combat(game)
+    store.resolve_combat(ATTACK_RANGE)
+    same_state(views, plain)
+
+def symmetric_collisions(units):
+    """
+    Référence par objets de UnitStore.resolve_collisions ('units' dans
+    l'ordre des lignes du store).
+    """
+    r = 2*UNIT_RADIUS
+    pushes = [[0.0, 0.0] for _ in units]
+    limit = [0.0 for _ in units]
+    for a in range(len(units)):
+        for b in range(a+1, len(units)):
+            dx = units[a].x - units[b].x
+            dy = units[a].y - units[b].y
+            d2 = dx*dx + dy*dy
+            if d2 < r*r:
+                d = math.sqrt(d2)
+                half = (r - d) / 2
+                if d2 <= 1e-9:
+                    theta = GOLDEN_ANGLE*(2*a + b)
+                    (ux, uy) = (math.cos(theta), math.sin(theta))
+                else:
+                    (ux, uy) = (dx/d, dy/d)
+                pushes[a][0] += ux*half
+                pushes[a][1] += uy*half
+                pushes[b][0] -= ux*half
+                pushes[b][1] -= uy*half
+                limit[a] = max(limit[a], half)
+                limit[b] = max(limit[b], half)
+    for (u, (px, py), top) in zip(units, pushes, limit):
+        norm = math.hypot(px, py)
+        if norm > top:
+            px *= top / norm
+            py *= top / norm
+        u.x += px
+        u.y += py
+
+@pytest.mark.parametrize("seed", range(5))
+def test_collisions_match_symmetric_reference(seed):
+    store, views, plain = twin_units(seed, 200, spread=(0, 120))
+    # Pile d'unités exactement superposées
+    for (u, v) in zip(plain[:3], views[:3]):
+        u.x = u.y = v.x = v.y = 50.0
+    store.resolve_collisions()
+    symmetric_collisions(plain)
+    same_state(views, plain)
+
+class PhasedSimulation(Simulation):
+    """
+    Chemin par objets, dans l'ordre des phases de UnitStore.update.
+    'rows' suit l'ordre des lignes qu'aurait le store (retrait: la
+    dernière ligne prend la place de la ligne retirée).
+    """
+    def __init__(self, *args, **kwargs):
+        Simulation.__init__(self, *args, **kwargs)
+        self.rows = list(self.all_units)
+
+    def remove_dead_units(self):
+        before = list(self.all_units)
+        Simulation.remove_dead_units(self)
+        alive = set(self.all_units)
+        for du in [u for u in before if u not in alive]:
+            i = self.rows.index(du)
+            self.rows[i] = self.rows[-1]
+            self.rows.pop()
+
+    def update_units(self, movement_allowed):
+        units = self.all_units
+        for u in units:
+            if u.attack_tick > 0:
+                u.hp -= u.attack_tick
+                u.attack_tick = 0
+                if u.hp <= 0:
+                    u.encircled_ticks = 999999
+        symmetric_collisions(self.rows)
+        if not movement_allowed:
+            for u in units:
+                u.update_morale_and_fatigue(moving=False)
+            return
+        for u in units:
+            u.ia_chase_logic(units)
+            u.follow_flow_field()
+            u.follow_path()
+        for u in units:
+            u.move_direct_line(self.grid)
+        for u in units:
+            if self.is_unit_in_enemy_zone(u):
+                u.encircled_ticks += 1
+            else:
+                u.encircled_ticks = 0
+            self.update_capital_capture(u)
+        for u in units:
+            u.update_morale_and_fatigue(moving=(u.dest_px is not None))
+
+def make(cls, use_unit_store, seed):
+    random.seed(seed)
+    return cls(seed=seed, units_per_team=30, placement_ticks=10,
+               use_unit_store=use_unit_store)
+
+@pytest.mark.parametrize("seed", [11, 23])
+def test_store_tick_matches_phased_object_path(seed):
+    # Les poussées de collision ne sont pas additionnées dans le même ordre
+    # (écart ~1e-12): comparaison tick par tick, à 1e-6 près
+    a = make(PhasedSimulation, False, seed)
+    b = make(Simulation, True, seed)
+    for tick in range(150):
+        if tick == 12:
+            a.order_move(a.blue_units[:15], a.red_cap)
+            b.order_move(b.blue_units[:15], b.red_cap)
+        if tick == 40:
+            # Retraits (lignes du store déplacées) en cours de partie
+            for k in (2, 33, 17, 59):
+                a.all_units[k].hp = 0
+                b.all_units[k].hp = 0
+        a.step()
+        b.step()
+        assert len(a.all_units) == len(b.all_units)
+        for (ua, ub) in zip(a.all_units, b.all_units):
+            assert ua.team == ub.team
+            assert (ua.x, ua.y, ua.hp, ua.morale, ua.fatigue, ua.cap_capture_time) == pytest.approx(
+                (ub.x, ub.y, ub.hp, ub.morale, ub.fatigue, ub.cap_capture_time), abs=1e-6)
+            assert ua.encircled_ticks == ub.encircled_ticks
+            assert (ua.dest_px is None) == (ub.dest_px is None)
+
+def test_removed_views_get_their_own_rows():
+    store = UnitStore(capacity=4)
+    a = store.add(1.0, 2.0, "blue")
+    b = store.add(3.0, 4.0, "red")
+    c = store.add(5.0, 6.0, "red")
+    store.remove(a)
+    assert store.n == 2 and set(store.views) == {b, c}
+    assert [v._i for v in store.views] == [0, 1]
+    assert (a.x, a.y, a.team) == (1.0, 2.0, "blue")
+    store.remove(b)
+    assert a._store is b._store is store._scratch and a._i != b._i
+    # Écrire dans une vue retirée ne touche pas les autres
+    a.x = 100.0
+    assert (b.x, b.y) == (3.0, 4.0)
+    assert (c.x, c.y) == (5.0, 6.0)